@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+generator.py
+Author: Gilson, K.
+
+Seeded generator of synthetic JSON resumes of configurable size: the same seed
+and sizes always give the same resume.
+
+Usage:
+    python -m benchmarks.generator OUTPUT [--seed N] [--works N] [--projects N]
+        [--bullets N] [--languages N] [--count N]
+"""
+
+import argparse
+import json
+import random
+from typing import List, Optional
+
+from cv import validation
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit nam imperdiet "
+    "eleifend posuere proin aliquet nisi fringilla condimentum erat diam "
+    "molestie sed pretium nibh vestibulum egestas neque finibus phasellus "
+    "dignissim orci aenean integer luctus massa malesuada mollis porttitor"
+).split()
+
+LANGUAGES = ["French", "English", "Dutch", "German", "Spanish", "Italian"]
+
+LASTNAMES = ["Doe", "Martin", "Peeters", "Muller", "Garcia", "Rossi", "Smith"]
+
+FIRSTNAMES = ["John", "Jane", "Lucas", "Emma", "Noah", "Olivia", "Louis"]
+
+POSITIONS = [
+    "Consultant",
+    "Business Analyst",
+    "Project Manager",
+    "Data Analyst",
+    "Developer",
+    "Architect",
+]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Return a sentence of random words.
+
+    Args:
+        rng (random.Random): the random generator.
+        words (int): the number of words.
+
+    Returns:
+        str: the sentence.
+    """
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return f"{text.capitalize()}."
+
+
+def bullets(rng: random.Random, count: int) -> List[str]:
+    """Return bullet points of 8 to 24 random words.
+
+    Args:
+        rng (random.Random): the random generator.
+        count (int): the number of bullet points.
+
+    Returns:
+        List[str]: the bullet points.
+    """
+    return [sentence(rng, rng.randint(8, 24)) for _ in range(count)]
+
+
+def generate_resume(
+    seed: int = 0,
+    works: int = 5,
+    projects: int = 3,
+    bullets_count: int = 4,
+    languages: int = 2,
+) -> dict:
+    """Generate a synthetic JSON resume, valid against the data model.
+
+    The works follow each other from January 2000, the projects of a work
+    follow each other within it, and the last work and its last project are
+    ongoing. Every start date is distinct.
+
+    Args:
+        seed (int, optional): the seed of the random generator. Defaults to 0.
+        works (int, optional): the number of works. Defaults to 5.
+        projects (int, optional): the number of projects per work. Defaults to 3.
+        bullets_count (int, optional): the number of bullet points per list. Defaults to 4.
+        languages (int, optional): the number of languages, at most 6. Defaults to 2.
+
+    Raises:
+        ValueError: if languages is greater than the number of known languages.
+
+    Returns:
+        dict: the JSON resume.
+    """
+    if languages > len(LANGUAGES):
+        raise ValueError(f"'languages' should be at most {len(LANGUAGES)}.")
+
+    rng = random.Random(seed)
+
+    resume = {
+        "lastname": rng.choice(LASTNAMES),
+        "firstname": rng.choice(FIRSTNAMES),
+        "position": rng.choice(POSITIONS),
+        "languages": [
+            {
+                "name": name,
+                "irl_scale": rng.choice(validation.IRL_SCALES),
+                "cefr_level": rng.choice(validation.CEFR_LEVELS),
+            }
+            for name in rng.sample(LANGUAGES, languages)
+        ],
+        "summary": bullets(rng, bullets_count),
+        "works": [],
+        "trainings": bullets(rng, bullets_count),
+        "itskills": bullets(rng, bullets_count),
+        "educations": [
+            {
+                "school": f"School of {rng.choice(WORDS).capitalize()}",
+                "degree": f"Master in {rng.choice(WORDS).capitalize()}",
+                "start": 1995,
+                "end": 1999,
+            }
+        ],
+    }
+
+    # Dates are counted in months since January 2000
+    month = 0
+    for work_index in range(works):
+        last_work = work_index == works - 1
+        work_start = month
+
+        work_projects = []
+        for project_index in range(projects):
+            last_project = last_work and project_index == projects - 1
+            start = month
+            month += rng.randint(2, 18)
+            client = rng.choice(WORDS).capitalize()
+            work_projects.append(
+                {
+                    "name": f"Client {client}",
+                    "redacted": f"a Client in {rng.choice(WORDS).capitalize()}",
+                    "position": rng.choice(POSITIONS),
+                    "start": _yyyymm(start),
+                    "end": None if last_project else _yyyymm(month - 1),
+                    "description": bullets(rng, 1),
+                    "activities": bullets(rng, bullets_count),
+                }
+            )
+        month = max(month, work_start + 1)
+
+        resume["works"].append(
+            {
+                "employer": f"Company {rng.choice(WORDS).capitalize()}",
+                "start": _yyyymm(work_start),
+                "end": None if last_work else _yyyymm(month - 1),
+                "position": rng.choice(POSITIONS),
+                "description": bullets(rng, bullets_count),
+                "projects": work_projects,
+            }
+        )
+
+    return resume
+
+
+def _yyyymm(month: int) -> int:
+    """Return a date under YYYYMM format, from a number of months since January 2000.
+
+    Args:
+        month (int): the number of months since January 2000.
+
+    Returns:
+        int: the date.
+    """
+    return (2000 + month // 12) * 100 + month % 12 + 1
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Write synthetic resumes, as a JSON file, or as JSON Lines for a roster.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("output", help="the file to write")
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument("--works", type=int, default=5, help="works (default: 5)")
+    parser.add_argument(
+        "--projects", type=int, default=3, help="projects per work (default: 3)"
+    )
+    parser.add_argument(
+        "--bullets", type=int, default=4, help="bullet points per list (default: 4)"
+    )
+    parser.add_argument(
+        "--languages", type=int, default=2, help="languages (default: 2)"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=1,
+        help="resumes, written as JSON Lines if more than 1 (default: 1)",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = {
+        "works": args.works,
+        "projects": args.projects,
+        "bullets_count": args.bullets,
+        "languages": args.languages,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as json_file:
+        if args.count == 1:
+            json.dump(generate_resume(args.seed, **sizes), json_file, indent=4)
+        else:
+            for index in range(args.count):
+                resume = generate_resume(args.seed + index, **sizes)
+                json_file.write(json.dumps(resume) + "\n")
+
+
+if __name__ == "__main__":
+    main()
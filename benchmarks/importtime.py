@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+importtime.py
+Author: Gilson, K.
+
+Measure the time spent importing modules on the start of the GUI and of the
+headless commands, from the '-X importtime' report of the interpreter.
+
+Usage:
+    python -m benchmarks.importtime [--repeat N] [--top N] [--json PATH]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, NamedTuple, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportTime(NamedTuple):
+    """ImportTime: a line of the '-X importtime' report."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(report: str) -> List[ImportTime]:
+    """Parse the '-X importtime' report written by the interpreter on stderr.
+
+    Args:
+        report (str): the content of stderr.
+
+    Returns:
+        List[ImportTime]: the imports, in the order of the report.
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header
+
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        imports.append(ImportTime(module, int(fields[0]), int(fields[1]), depth))
+
+    return imports
+
+
+def scenarios(output_dir: str) -> Dict[str, List[str]]:
+    """Return the command line arguments of each start path to measure.
+
+    Args:
+        output_dir (str): the folder to render to.
+
+    Returns:
+        Dict[str, List[str]]: the arguments passed to the interpreter, by scenario.
+    """
+    return {
+        # Everything imported before the window opens
+        "gui": ["-c", "import cv_builder, gui"],
+        "render": [
+            "cv_builder.py",
+            "render",
+            "examples/example.json",
+            "-t",
+            "templates/example.docx",
+            "-o",
+            output_dir,
+            "-w",
+            "1",
+        ],
+        "validate": ["cv_builder.py", "validate", "examples/example.json", "-w", "1"],
+    }
+
+
+def measure(arguments: List[str]) -> List[ImportTime]:
+    """Run the interpreter with '-X importtime' and return its report.
+
+    Args:
+        arguments (List[str]): the arguments passed to the interpreter.
+
+    Raises:
+        RuntimeError: if the command fails.
+
+    Returns:
+        List[ImportTime]: the imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *arguments],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"'{' '.join(arguments)}' failed:\n{process.stderr}")
+
+    return parse_importtime(process.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs, fastest kept (default: 5)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="heaviest imports listed (default: 5)"
+    )
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, arguments in scenarios(output_dir).items():
+            runs = [measure(arguments) for _ in range(args.repeat)]
+            totals = [sum(i.cumulative_us for i in run if i.depth == 0) for run in runs]
+            best = runs[totals.index(min(totals))]
+
+            top_level = [i for i in best if i.depth == 0]
+            heaviest = sorted(top_level, key=lambda i: i.cumulative_us, reverse=True)
+            results[name] = {
+                "total_ms": min(totals) / 1000,
+                "modules": len(best),
+                "heaviest": {
+                    i.module: i.cumulative_us / 1000 for i in heaviest[: args.top]
+                },
+            }
+
+    print(f"{'Scenario':<10}{'Imports (ms)':>14}{'Modules':>9}  Heaviest")
+    for name, result in results.items():
+        heaviest = ", ".join(
+            f"{module} {time_ms:.1f}" for module, time_ms in result["heaviest"].items()
+        )
+        print(
+            f"{name:<10}{result['total_ms']:>14.1f}{result['modules']:>9}  {heaviest}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump(results, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
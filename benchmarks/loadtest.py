@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+loadtest.py
+Author: Gilson, K.
+
+Load test the HTTP render service: post synthetic resumes from concurrent
+clients, then report the latency percentiles and the throughput.
+
+Without --url, a service is started in-process on a free port, serving the
+templates folder of the repository.
+
+Usage:
+    python -m benchmarks.loadtest [--url URL] [--template ID] [--locale LOCALE]
+        [--requests N] [--concurrency N] [--warmup N] [--workers N]
+        [--output PATH] [--seed N] [--works N] [--projects N]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from .generator import generate_resume
+from .pipeline import git_revision
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Client(object):
+    """Client: a keep-alive connection to the service per thread."""
+
+    def __init__(self, url: str, path: str) -> None:
+        """Initialize the Client class instance.
+
+        Args:
+            url (str): the base URL of the service, e.g. "http://127.0.0.1:8080".
+            path (str): the path and query to post to.
+        """
+        self.netloc = urlsplit(url).netloc
+        self.path = path
+        self.__local = threading.local()
+
+    def post(self, body: bytes) -> Tuple[int, float]:
+        """Post a resume.
+
+        Args:
+            body (bytes): the JSON resume.
+
+        Returns:
+            Tuple[int, float]: the status of the response, 0 on a connection error,
+                and the latency, in seconds.
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = http.client.HTTPConnection(self.netloc, timeout=120)
+            self.__local.connection = connection
+
+        start = time.perf_counter()
+        try:
+            connection.request(
+                "POST",
+                self.path,
+                body,
+                {"Content-Type": "application/json"},
+            )
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                self.__local.connection = None
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self.__local.connection = None
+            status = 0
+        return status, time.perf_counter() - start
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Return a percentile of sorted values, by the nearest-rank method.
+
+    Args:
+        sorted_values (List[float]): the values, sorted.
+        q (float): the percentile, between 0 and 100.
+
+    Returns:
+        float: the value.
+    """
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def run(client: Client, bodies: List[bytes], concurrency: int) -> Dict:
+    """Post every body, from concurrent clients.
+
+    Args:
+        client (Client): the client.
+        bodies (List[bytes]): the JSON resumes to post.
+        concurrency (int): the number of concurrent clients.
+
+    Returns:
+        Dict: the latency of each successful request, the count of each status,
+            and the duration of the run.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(client.post, bodies))
+    duration = time.perf_counter() - start
+
+    statuses: Dict[str, int] = {}
+    for status, _ in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    latencies = sorted(latency for status, latency in outcomes if status == 200)
+    return {"latencies": latencies, "statuses": statuses, "duration": duration}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the load test, print the results and write them to a file.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="the URL of a running service (default: start one in-process)",
+    )
+    parser.add_argument(
+        "--template", default="example", help="the template id (default: example)"
+    )
+    parser.add_argument("--locale", default=None, help="the locale (default: en)")
+    parser.add_argument(
+        "--requests", type=int, default=200, help="requests measured (default: 200)"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="concurrent clients (default: 8)"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="requests before measuring (default: 10)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="worker processes of the in-process service (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--output",
+        default="loadtest.json",
+        help="the JSON file to write the results to (default: loadtest.json)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument("--works", type=int, default=5, help="works (default: 5)")
+    parser.add_argument(
+        "--projects", type=int, default=3, help="projects per work (default: 3)"
+    )
+    args = parser.parse_args(argv)
+
+    # Distinct resumes, so that no layer can serve a response from a cache
+    bodies = [
+        json.dumps(generate_resume(args.seed + i, args.works, args.projects)).encode(
+            "utf-8"
+        )
+        for i in range(args.warmup + args.requests)
+    ]
+    query = urlencode({"locale": args.locale}) if args.locale else ""
+    path = f"/render/{args.template}" + (f"?{query}" if query else "")
+
+    service = server = None
+    url = args.url
+    if url is None:
+        # Deferred, as only needed without a running service
+        from builder.server import RenderService, make_server
+
+        service = RenderService(
+            os.path.join(ROOT, "templates"),
+            args.workers,
+            queue_size=args.concurrency,
+        )
+        server = make_server(service, port=0, quiet=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = "http://{}:{}".format(*server.server_address[:2])
+
+    try:
+        client = Client(url, path)
+        run(client, bodies[: args.warmup], args.concurrency)
+        outcome = run(client, bodies[args.warmup :], args.concurrency)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    latencies_ms = [latency * 1000 for latency in outcome["latencies"]]
+    latency = {}
+    if latencies_ms:
+        latency = {
+            "min_ms": latencies_ms[0],
+            "p50_ms": percentile(latencies_ms, 50),
+            "p90_ms": percentile(latencies_ms, 90),
+            "p99_ms": percentile(latencies_ms, 99),
+            "max_ms": latencies_ms[-1],
+            "mean_ms": statistics.mean(latencies_ms),
+        }
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "url": args.url,
+            "template": args.template,
+            "locale": args.locale,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "workers": service.workers if service is not None else None,
+            "seed": args.seed,
+            "works": args.works,
+            "projects": args.projects,
+        },
+        "statuses": outcome["statuses"],
+        "throughput_rps": len(latencies_ms) / outcome["duration"],
+        "latency": latency,
+    }
+
+    print(
+        f"{args.requests} requests, {args.concurrency} concurrent clients, "
+        f"{outcome['duration']:.2f} s"
+    )
+    print(
+        "Statuses: "
+        + ", ".join(
+            f"{status}: {count}" for status, count in outcome["statuses"].items()
+        )
+    )
+    print(f"Throughput: {results['throughput_rps']:.1f} renders/s")
+    for name, value in latency.items():
+        print(f"{name[:-3]:<6}{value:>10.2f} ms")
+
+    with open(args.output, "w", encoding="utf-8") as json_file:
+        json.dump(results, json_file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
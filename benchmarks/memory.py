@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+memory.py
+Author: Gilson, K.
+
+Compare the memory used by the slot-backed cv classes with the one of
+equivalent objects storing their attributes in a per-instance '__dict__'.
+
+Usage:
+    python -m benchmarks.memory [--count N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+import cv
+
+
+def sample_objects() -> dict:
+    """Return one representative instance of each cv class.
+
+    Returns:
+        dict: the instances, by class.
+    """
+    project = cv.Project(
+        name="Client A",
+        redacted="a Client in Europe",
+        position="Business Analyst",
+        start=201701,
+        end=201712,
+        description=["Lorem ipsum dolor sit amet."],
+        activities=["Lorem ipsum dolor sit amet.", "Nam imperdiet eleifend posuere."],
+    )
+    work = cv.WorkExperience(
+        employer="Company B", start=201701, position="Consultant", projects=[]
+    )
+    return {
+        cv.Employee: cv.Employee(
+            lastname="Doe", firstname="John", position="Consultant"
+        ),
+        cv.WorkExperience: work,
+        cv.Project: project,
+        cv.Education: cv.Education(school="University", degree="Master", start=2010),
+        cv.Language: cv.Language(name="French", irl_scale="Native", cefr_level="C2"),
+    }
+
+
+def factories(obj: cv.mixin.JSONableMixin) -> Tuple[Callable, Callable]:
+    """Return factories of slot-backed and '__dict__'-backed copies of obj.
+
+    Both copies share the same attribute values, so that only the storage of the
+    attributes is measured.
+
+    Args:
+        obj (JSONableMixin): the instance to copy.
+
+    Returns:
+        Tuple[Callable, Callable]: the functions creating a slot-backed and a
+            '__dict__'-backed copy.
+    """
+    slots_cls = type(obj)
+    dict_cls = type(f"Dict{slots_cls.__name__}", (object,), {})
+    attributes = [(key, getattr(obj, key)) for key in obj.__slots__]
+
+    def slots_factory() -> object:
+        instance = slots_cls.__new__(slots_cls)
+        for key, value in attributes:
+            object.__setattr__(instance, key, value)
+        return instance
+
+    def dict_factory() -> object:
+        instance = dict_cls()
+        for key, value in attributes:
+            setattr(instance, key, value)
+        return instance
+
+    return slots_factory, dict_factory
+
+
+def measure(factory: Callable[[], object], count: int) -> int:
+    """Measure the memory allocated by count objects.
+
+    Args:
+        factory (Callable[[], object]): the function creating an object.
+        count (int): the number of objects to create.
+
+    Returns:
+        int: the number of bytes allocated per object.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects: List[object] = [factory() for _ in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return size // count
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--count", type=int, default=100_000, help="objects per class (default: 100000)"
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{'Class':<16}{'__dict__ (B)':>14}{'__slots__ (B)':>15}{'Saving':>9}")
+    for cls, obj in sample_objects().items():
+        slots_factory, dict_factory = factories(obj)
+        dict_size = measure(dict_factory, args.count)
+        slots_size = measure(slots_factory, args.count)
+        saving = 1 - slots_size / dict_size
+        print(f"{cls.__name__:<16}{dict_size:>14}{slots_size:>15}{saving:>9.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+pipeline.py
+Author: Gilson, K.
+
+Time each stage of the build of a synthetic resume, from the JSON file to the
+saved DOCX, and write the results to a JSON file to compare versions.
+
+Usage:
+    python -m benchmarks.pipeline [--output PATH] [--baseline PATH] [--repeat N]
+        [--template PATH] [--seed N] [--works N] [--projects N] [--bullets N]
+        [--languages N]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import builder
+import cv
+from .generator import generate_resume
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The stages of the build, in order
+STAGES = ("load_from_json", "sort", "to_dict", "render", "save")
+
+
+def run_once(json_path: str, template_path: str, save_path: str) -> Dict[str, float]:
+    """Build a resume once, timing each stage.
+
+    Args:
+        json_path (str): the JSON resume file path.
+        template_path (str): the DOCX template file path.
+        save_path (str): the file path to save the rendered resume to.
+
+    Returns:
+        Dict[str, float]: the time of each stage, in seconds.
+    """
+    times = {}
+
+    start = time.perf_counter()
+    employee = cv.Employee().load_from_json(json_path, "utf-8")
+    times["load_from_json"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    employee.sort_works("desc")
+    employee.sort_projects("desc")
+    employee.sort_educations("desc")
+    times["sort"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = employee.to_dict(keep_none=False)
+    times["to_dict"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    docx_tpl = builder.template_cache.new_document(template_path)
+    docx_tpl.render(context)
+    times["render"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    docx_tpl.save(save_path)
+    times["save"] = time.perf_counter() - start
+
+    return times
+
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit of the repository, if any.
+
+    Returns:
+        Optional[str]: the commit hash, None outside of a git repository.
+    """
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def compare(results: dict, baseline_path: str) -> None:
+    """Print the median time of each stage against the one of a previous run.
+
+    Args:
+        results (dict): the results of the current run.
+        baseline_path (str): the JSON file of the previous run.
+    """
+    with open(baseline_path, encoding="utf-8") as json_file:
+        baseline = json.load(json_file)
+
+    if baseline["parameters"] != results["parameters"]:
+        print("Warning: the baseline was run with other parameters.", file=sys.stderr)
+
+    print(f"\n{'Stage':<16}{'Baseline (ms)':>15}{'Current (ms)':>14}{'Ratio':>8}")
+    for stage, current in results["stages"].items():
+        previous = baseline["stages"].get(stage)
+        if previous is None:
+            continue
+        ratio = current["median_ms"] / previous["median_ms"]
+        print(
+            f"{stage:<16}{previous['median_ms']:>15.3f}{current['median_ms']:>14.3f}"
+            f"{ratio:>7.2f}x"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark, print a table of the results and write them to a file.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--output",
+        default="pipeline.json",
+        help="the JSON file to write the results to (default: pipeline.json)",
+    )
+    parser.add_argument("--baseline", help="a previous results file to compare with")
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="builds measured (default: 20)"
+    )
+    parser.add_argument(
+        "--template",
+        default=os.path.join(ROOT, "templates", "example.docx"),
+        help="the DOCX template (default: templates/example.docx)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument("--works", type=int, default=5, help="works (default: 5)")
+    parser.add_argument(
+        "--projects", type=int, default=3, help="projects per work (default: 3)"
+    )
+    parser.add_argument(
+        "--bullets", type=int, default=4, help="bullet points per list (default: 4)"
+    )
+    parser.add_argument(
+        "--languages", type=int, default=2, help="languages (default: 2)"
+    )
+    args = parser.parse_args(argv)
+
+    parameters = {
+        "seed": args.seed,
+        "works": args.works,
+        "projects": args.projects,
+        "bullets": args.bullets,
+        "languages": args.languages,
+        "template": os.path.basename(args.template),
+        "repeat": args.repeat,
+    }
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = os.path.join(temp_dir, "resume.json")
+        with open(json_path, "w", encoding="utf-8") as json_file:
+            resume = generate_resume(
+                args.seed, args.works, args.projects, args.bullets, args.languages
+            )
+            json.dump(resume, json_file)
+
+        # Parse the template and compile the serializers beforehand
+        run_once(json_path, args.template, os.path.join(temp_dir, "warmup.docx"))
+
+        runs = [
+            run_once(json_path, args.template, os.path.join(temp_dir, f"{i}.docx"))
+            for i in range(args.repeat)
+        ]
+
+    stages = {}
+    for stage in STAGES:
+        times_ms = [run[stage] * 1000 for run in runs]
+        stages[stage] = {
+            "min_ms": min(times_ms),
+            "median_ms": statistics.median(times_ms),
+            "mean_ms": statistics.mean(times_ms),
+        }
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "stages": stages,
+    }
+
+    print(f"{'Stage':<16}{'Min (ms)':>10}{'Median (ms)':>13}{'Mean (ms)':>11}")
+    for stage, result in stages.items():
+        print(
+            f"{stage:<16}{result['min_ms']:>10.3f}{result['median_ms']:>13.3f}"
+            f"{result['mean_ms']:>11.3f}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as json_file:
+        json.dump(results, json_file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+ranking.py
+Author: Gilson, K.
+
+Time the ranking of a roster of synthetic resumes against a job profile, the
+whole roster being scored in NumPy array operations, against scoring each
+employee in turn in pure Python. Requires NumPy.
+
+Usage:
+    python -m benchmarks.ranking [--count N] [--repeat N] [--seed N] [--limit N]
+"""
+
+import argparse
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import cv
+from cv.ranking import CandidateRanker, JobProfile, month_number
+from cv.roster import normalize
+from cv.search import tokenize, vocabulary
+from cv.validation import CEFR_LEVELS
+from .generator import generate_resume
+from .roster import best_time
+
+
+def scalar_features(
+    employee: cv.Employee,
+) -> Tuple[Set[str], Dict[str, int], List[Tuple[int, Optional[int], Set[str]]]]:
+    """Return the features of an employee, for scoring in pure Python.
+
+    Args:
+        employee (cv.Employee): the employee.
+
+    Returns:
+        Tuple[Set[str], Dict[str, int], List[Tuple[int, Optional[int], Set[str]]]]: the IT skills,
+            the CEFR level ordinal of each language, and the dated works and projects with
+            the words describing them.
+    """
+    skills = {normalize(skill) for skill in employee.itskills or []}
+
+    levels: Dict[str, int] = {}
+    for language in employee.languages or []:
+        level = (
+            0
+            if language.cefr_level is None
+            else CEFR_LEVELS.index(language.cefr_level) + 1
+        )
+        name = normalize(language.name)
+        levels[name] = max(levels.get(name, 0), level)
+
+    periods = []
+    for work in employee.works or []:
+        texts = [work.employer, work.position, *(work.description or [])]
+        periods.append((work, texts))
+        for project in work.projects or []:
+            texts = [
+                project.redacted if project.confidential else project.name,
+                project.position,
+                *(project.description or []),
+                *(project.activities or []),
+            ]
+            periods.append((project, texts))
+    return (
+        skills,
+        levels,
+        [
+            (period.start, period.end, vocabulary(" ".join(filter(None, texts))))
+            for period, texts in periods
+            if period.start is not None
+        ],
+    )
+
+
+def scalar_score(
+    features: Tuple[
+        Set[str], Dict[str, int], List[Tuple[int, Optional[int], Set[str]]]
+    ],
+    profile: JobProfile,
+) -> Tuple[float, Dict[str, float]]:
+    """Return the score of an employee against a job profile, computed in pure Python.
+
+    Args:
+        features (Tuple): the features of the employee, as returned by scalar_features.
+        profile (JobProfile): the job profile.
+
+    Returns:
+        Tuple[float, Dict[str, float]]: the score, and its breakdown.
+    """
+    skills, levels, periods = features
+    breakdown = {}
+    for skill, weight in profile.skills.items():
+        breakdown[f"skill:{skill}"] = weight if normalize(skill) in skills else 0.0
+
+    for language, level in profile.languages.items():
+        met = levels.get(normalize(language), 0) > CEFR_LEVELS.index(level)
+        breakdown[f"language:{language}"] = profile.language_weight if met else 0.0
+
+    last = month_number(profile.until)
+    first = last - profile.recent_months + 1
+    expressions = [set(tokenize(expression)) for expression in profile.domain]
+    months = set()
+    for start, end, words in periods:
+        if any(expression and expression <= words for expression in expressions):
+            end = last if end is None else min(month_number(end), last)
+            months.update(range(max(month_number(start), first), end + 1))
+    breakdown["domain"] = (
+        min(len(months) / profile.domain_months, 1.0) * profile.domain_weight
+    )
+    return sum(breakdown.values()), breakdown
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--count", type=int, default=5000, help="employees (default: 5000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="measures, best kept (default: 20)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument(
+        "--limit", type=int, default=10, help="candidates (default: 10)"
+    )
+    args = parser.parse_args(argv)
+
+    employees = [
+        cv.Employee().load_from_dict(
+            generate_resume(args.seed + i, works=6, projects=3, languages=3)
+        )
+        for i in range(args.count)
+    ]
+    profile = JobProfile(
+        skills={
+            employees[0].itskills[0]: 3,
+            employees[1].itskills[0]: 2,
+            "Unknown skill": 1,
+        },
+        languages={"French": "B2", "Dutch": "C1"},
+        domain=["architect", "data analyst"],
+        domain_months=36,
+        recent_months=60,
+        until=201312,
+    )
+
+    start = time.perf_counter()
+    ranker = CandidateRanker(employees)
+    encode = time.perf_counter() - start
+    print(f"Encoded {args.count} employees in {encode * 1000:.1f} ms")
+
+    candidates = ranker.rank(profile, args.limit)
+    features = [scalar_features(employee) for employee in employees]
+    scores = [scalar_score(employee, profile) for employee in features]
+    expected = sorted(range(len(employees)), key=lambda row: (-scores[row][0], row))
+    for candidate, row in zip(candidates, expected):
+        score, breakdown = scores[row]
+        if not math.isclose(candidate.score, score) or any(
+            not math.isclose(candidate.breakdown[name], value)
+            for name, value in breakdown.items()
+        ):
+            raise AssertionError(f"Scores differ for the employee {row}.")
+
+    scalar = best_time(
+        lambda: sorted(scalar_score(employee, profile)[0] for employee in features),
+        max(1, args.repeat // 10),
+    )
+    vectorized = best_time(lambda: ranker.rank(profile, args.limit), args.repeat)
+    print(f"Scalar scoring, from pre-tokenized features: {scalar * 1000:.1f} ms")
+    print(
+        f"Vectorized ranking: {vectorized * 1000:.2f} ms ({scalar / vectorized:.0f}x)"
+    )
+
+    print(f"\nTop {len(candidates)}:")
+    for candidate in candidates:
+        parts = ", ".join(
+            f"{name} {value:g}" for name, value in candidate.breakdown.items() if value
+        )
+        print(
+            f"{candidate.score:6.2f}  {candidate.employee.lastname} "
+            f"{candidate.employee.firstname}  ({parts}; {candidate.months} months)"
+        )
+
+
+if __name__ == "__main__":
+    main()
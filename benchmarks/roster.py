@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+roster.py
+Author: Gilson, K.
+
+Time the queries of an indexed roster of synthetic resumes, against a scan of
+every employee, and the update of its indexes.
+
+Usage:
+    python -m benchmarks.roster [--count N] [--repeat N] [--seed N]
+"""
+
+import argparse
+import time
+from typing import Callable, List, Optional
+
+import cv
+from cv import validation
+from .generator import generate_resume
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    """Return the best time of several calls of a function.
+
+    Args:
+        function (Callable[[], object]): the function.
+        repeat (int): the number of calls.
+
+    Returns:
+        float: the best time, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def speaks(employee: cv.Employee, language: str, min_level: str) -> bool:
+    """Return whether an employee speaks a language at least at a CEFR level, by a scan."""
+    levels = validation.CEFR_LEVELS
+    return any(
+        known.name == language
+        and known.cefr_level is not None
+        and levels.index(known.cefr_level) >= levels.index(min_level)
+        for known in employee.languages or []
+    )
+
+
+def on_project_since(employee: cv.Employee, start: int) -> bool:
+    """Return whether an employee was on a project since a date, by a scan."""
+    return any(
+        project.start is not None and (project.end is None or project.end >= start)
+        for work in employee.works or []
+        for project in work.projects or []
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--count", type=int, default=5000, help="employees (default: 5000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=50, help="measures, best kept (default: 50)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    employees = [
+        cv.Employee().load_from_dict(
+            generate_resume(args.seed + i, works=6, projects=3, languages=3)
+        )
+        for i in range(args.count)
+    ]
+    skill = employees[0].itskills[0]
+
+    start = time.perf_counter()
+    roster = cv.Roster(employees)
+    build = time.perf_counter() - start
+    print(f"Indexed {args.count} employees in {build * 1000:.1f} ms")
+
+    queries = [
+        ("skill", cv.HasSkill(skill), lambda e: skill in (e.itskills or [])),
+        (
+            "language >= C1",
+            cv.Speaks("French", "C1"),
+            lambda e: speaks(e, "French", "C1"),
+        ),
+        (
+            "project since",
+            cv.ProjectBetween(start=200801),
+            lambda e: on_project_since(e, 200801),
+        ),
+        (
+            "all three",
+            cv.Speaks("French", "C1")
+            & cv.Speaks("Dutch", "B2")
+            & cv.ProjectBetween(start=200801),
+            lambda e: speaks(e, "French", "C1")
+            and speaks(e, "Dutch", "B2")
+            and on_project_since(e, 200801),
+        ),
+    ]
+
+    print(
+        f"\n{'Query':<16}{'Matches':>9}{'scan (ms)':>11}{'index (ms)':>12}{'Speedup':>9}"
+    )
+    for name, query, predicate in queries:
+        expected = [employee for employee in employees if predicate(employee)]
+        if roster.find(query) != expected:
+            raise AssertionError(f"Results differ for '{name}'.")
+
+        scan = best_time(
+            lambda: [employee for employee in employees if predicate(employee)],
+            max(1, args.repeat // 10),
+        )
+        index = best_time(lambda: roster.find(query), args.repeat)
+        print(
+            f"{name:<16}{len(expected):>9}{scan * 1000:>11.3f}{index * 1000:>12.3f}"
+            f"{scan / index:>8.0f}x"
+        )
+
+    employee = employees[len(employees) // 2]
+    update = best_time(lambda: roster.remove(employee).add(employee), args.repeat)
+    print(f"\nRemove and add an employee: {update * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+search.py
+Author: Gilson, K.
+
+Time the full-text search index over synthetic resumes: building it, saving
+and loading it, adding the unchanged employees again after loading, and its
+queries against a scan of every paragraph.
+
+Usage:
+    python -m benchmarks.search [--count N] [--repeat N] [--seed N] [--path PATH]
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from typing import List, Optional
+
+import cv
+from cv.search import SearchIndex, paragraphs_of
+from .generator import generate_resume
+from .roster import best_time
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--count", type=int, default=2000, help="employees (default: 2000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="measures, best kept (default: 20)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed (default: 0)")
+    parser.add_argument(
+        "--path",
+        default=None,
+        help="the index file to write (default: a temporary file)",
+    )
+    args = parser.parse_args(argv)
+
+    employees = {
+        f"resume_{args.seed + i}.json": cv.Employee().load_from_dict(
+            generate_resume(args.seed + i, works=6, projects=3)
+        )
+        for i in range(args.count)
+    }
+
+    path = args.path or os.path.join(tempfile.mkdtemp(), "search.json")
+    start = time.perf_counter()
+    index = SearchIndex()
+    for key, employee in employees.items():
+        index.add(key, employee)
+    build = time.perf_counter() - start
+
+    save = best_time(lambda: index.save(path), 1)
+    load = best_time(lambda: SearchIndex.load(path), 1)
+    loaded = SearchIndex.load(path)
+    start = time.perf_counter()
+    added = sum(loaded.add(key, employee) for key, employee in employees.items())
+    resync = time.perf_counter() - start
+    if added:
+        raise AssertionError(f"{added} unchanged employees indexed again.")
+
+    print(f"Indexed {args.count} employees in {build * 1000:.0f} ms")
+    print(f"Saved in {save * 1000:.0f} ms, {os.path.getsize(path) / 1e6:.1f} MB")
+    print(
+        f"Loaded in {load * 1000:.0f} ms, then checked every employee unchanged "
+        f"in {resync * 1000:.0f} ms"
+    )
+
+    # Two words following each other in a paragraph, as a phrase and as words
+    _, text = next(paragraphs_of(next(iter(employees.values()))))
+    first, second = re.findall(r"\w+", text)[:2]
+    queries = [
+        ("word", first, rf"\b{first}\b"),
+        ("phrase", f'"{first} {second}"', rf"\b{first}\W+{second}\b"),
+        ("words", f"{first} {second}", rf"\b(?:{first}|{second})\b"),
+    ]
+
+    print(
+        f"\n{'Query':<10}{'Matches':>9}{'scan (ms)':>11}{'index (ms)':>12}{'Speedup':>9}"
+    )
+    for name, query, pattern in queries:
+        regex = re.compile(pattern, re.IGNORECASE)
+
+        def scan() -> List[str]:
+            return [
+                key
+                for key, employee in employees.items()
+                if any(regex.search(text) for _, text in paragraphs_of(employee))
+            ]
+
+        expected = scan()
+        if sorted(hit.key for hit in loaded.search(query, limit=None)) != sorted(
+            expected
+        ):
+            raise AssertionError(f"Results differ for '{name}'.")
+
+        scanned = best_time(scan, max(1, args.repeat // 10))
+        searched = best_time(lambda: loaded.search(query), args.repeat)
+        print(
+            f"{name:<10}{len(expected):>9}{scanned * 1000:>11.3f}{searched * 1000:>12.3f}"
+            f"{scanned / searched:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+serialization.py
+Author: Gilson, K.
+
+Compare the generated serializers behind JSONableMixin.to_dict with the former
+reflective walk of the attributes, on a roster with cold caches.
+
+Usage:
+    python -m benchmarks.serialization [--count N] [--repeat N]
+"""
+
+import argparse
+import time
+from typing import Callable, List, Optional
+
+import cv
+from cv.mixin import JSONableMixin
+
+EXAMPLE_PATH = "examples/example.json"
+
+
+def reflective_to_dict(obj: JSONableMixin, keep_none: bool = True) -> dict:
+    """Return a nested dictionary of the attributes of obj, inspecting each value.
+
+    Reference implementation: JSONableMixin.to_dict before the generated
+    serializers, caching the dictionaries the same way.
+
+    Args:
+        obj (JSONableMixin): the instance to serialize.
+        keep_none (bool, optional): whether to keep None values in the dictionary or not. Defaults to True.
+
+    Returns:
+        dict: the nested dictionary of the instance attributes.
+    """
+    if not isinstance(keep_none, bool):
+        raise TypeError("'keep_none' expect a bool.")
+
+    cache = obj._cache
+    if cache is None:
+        cache = {}
+        object.__setattr__(obj, "_cache", cache)
+    elif keep_none in cache:
+        return cache[keep_none]
+
+    dic = {}
+    for key in obj.__slots__:
+        value = getattr(obj, key)
+        if isinstance(value, JSONableMixin):
+            dic[key] = reflective_to_dict(value, keep_none)
+        elif isinstance(value, list):
+            lst = []
+            for item in value:
+                if isinstance(item, JSONableMixin):
+                    lst.append(reflective_to_dict(item, keep_none))
+                else:
+                    if item is not None or keep_none == True:
+                        lst.append(item)
+
+            if lst or keep_none == True:
+                dic[key] = lst
+        else:
+            if value is not None or keep_none == True:
+                dic[key] = value
+
+    cache[keep_none] = dic
+    return dic
+
+
+def load_roster(count: int) -> List[cv.Employee]:
+    """Load the example resume count times.
+
+    Args:
+        count (int): the number of employees.
+
+    Returns:
+        List[cv.Employee]: the employees, with cold caches.
+    """
+    return [cv.Employee().load_from_json(EXAMPLE_PATH, "utf-8") for _ in range(count)]
+
+
+def best_time(
+    serialize: Callable[[cv.Employee, bool], dict],
+    keep_none: bool,
+    count: int,
+    repeat: int,
+) -> float:
+    """Return the best time to serialize a freshly loaded roster.
+
+    Args:
+        serialize (Callable[[cv.Employee, bool], dict]): the serialization function.
+        keep_none (bool): whether to keep None values in the dictionary or not.
+        count (int): the number of employees.
+        repeat (int): the number of measures.
+
+    Returns:
+        float: the best time, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        roster = load_roster(count)
+        start = time.perf_counter()
+        for employee in roster:
+            serialize(employee, keep_none)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a table of the results.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument(
+        "--count", type=int, default=1000, help="employees (default: 1000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="measures, best kept (default: 5)"
+    )
+    args = parser.parse_args(argv)
+
+    # Same output, whatever the path
+    for keep_none in (True, False):
+        reference, employee = load_roster(2)
+        if employee.to_dict(keep_none) != reflective_to_dict(reference, keep_none):
+            raise AssertionError(f"Outputs differ with keep_none={keep_none}.")
+
+    print(
+        f"{'keep_none':<12}{'reflective (ms)':>17}{'generated (ms)':>16}{'Speedup':>9}"
+    )
+    for keep_none in (True, False):
+        reflective = best_time(reflective_to_dict, keep_none, args.count, args.repeat)
+        generated = best_time(cv.Employee.to_dict, keep_none, args.count, args.repeat)
+        print(
+            f"{str(keep_none):<12}{reflective * 1000:>17.1f}{generated * 1000:>16.1f}"
+            f"{reflective / generated:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
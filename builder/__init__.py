@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+__init__.py (builder)
+Author: Gilson, K.
+
+The public names are imported on first use, so that importing the package does
+not import docxtpl and jinja2 before a template is actually rendered.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names, by the submodule defining them
+_EXPORTS = {
+    "RenderResult": "batch",
+    "collect_json_paths": "batch",
+    "render_batch": "batch",
+    "render_employee": "batch",
+    "render_json": "batch",
+    "render_roster": "batch",
+    "render_template": "batch",
+    "RENDER_STEPS": "docx",
+    "Progress": "docx",
+    "build_context": "docx",
+    "render_context": "docx",
+    "render_docx": "docx",
+    "cache_dir": "environment",
+    "calling_digest": "environment",
+    "compile_template": "environment",
+    "get_environment": "environment",
+    "register_filter": "environment",
+    "FILTERS": "filters",
+    "render_bytes": "inmemory",
+    "LOCALES": "locales",
+    "format_date": "locales",
+    "format_duration": "locales",
+    "format_range": "locales",
+    "get_locale": "locales",
+    "OfficePool": "pdf",
+    "convert_results": "pdf",
+    "find_soffice": "pdf",
+    "ParsedPptxTemplate": "pptx",
+    "pptx_template_cache": "pptx",
+    "render_deck": "pptx",
+    "render_pptx": "pptx",
+    "render_slides": "pptx",
+    "RenderCache": "render_cache",
+    "render_key": "render_cache",
+    "RenderService": "server",
+    "ServiceBusy": "server",
+    "make_server": "server",
+    "CachedDocxTemplate": "templates",
+    "ParsedDocxTemplate": "templates",
+    "TemplateCache": "templates",
+    "template_cache": "templates",
+    "VARIANT_PATTERN": "variants",
+    "render_variants": "variants",
+    "variant_output_path_for": "variants",
+    "WATCH_PATTERN": "watch",
+    "Watcher": "watch",
+}
+
+__all__ = sorted(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .batch import (
+        RenderResult,
+        collect_json_paths,
+        render_batch,
+        render_employee,
+        render_json,
+        render_roster,
+        render_template,
+    )
+    from .docx import (
+        RENDER_STEPS,
+        Progress,
+        build_context,
+        render_context,
+        render_docx,
+    )
+    from .environment import (
+        cache_dir,
+        calling_digest,
+        compile_template,
+        get_environment,
+        register_filter,
+    )
+    from .filters import FILTERS
+    from .inmemory import render_bytes
+    from .locales import (
+        LOCALES,
+        format_date,
+        format_duration,
+        format_range,
+        get_locale,
+    )
+    from .pdf import OfficePool, convert_results, find_soffice
+    from .pptx import (
+        ParsedPptxTemplate,
+        pptx_template_cache,
+        render_deck,
+        render_pptx,
+        render_slides,
+    )
+    from .render_cache import RenderCache, render_key
+    from .server import RenderService, ServiceBusy, make_server
+    from .templates import (
+        CachedDocxTemplate,
+        ParsedDocxTemplate,
+        TemplateCache,
+        template_cache,
+    )
+    from .variants import VARIANT_PATTERN, render_variants, variant_output_path_for
+    from .watch import WATCH_PATTERN, Watcher
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its submodule, on first access.
+
+    Args:
+        name (str): the name.
+
+    Raises:
+        AttributeError: if name is not a public name of the package.
+
+    Returns:
+        Any: the object.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Return the names of the package, including the ones not imported yet."""
+    return sorted(set(globals()) | set(_EXPORTS))
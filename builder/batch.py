@@ -0,0 +1,422 @@
+# -*- coding: utf-8 -*-
+"""
+batch.py
+Author: Gilson, K.
+
+As every command of the CLI imports this module, the renderers (docxtpl with
+them), the render cache and the process pool are imported on first use.
+"""
+
+import functools
+import glob
+import os
+import time
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+import cv
+from . import timing
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+
+
+class RenderResult(NamedTuple):
+    """RenderResult: outcome of the rendering of a single JSON resume.
+
+    Attributes:
+        json_path (str): the JSON resume file path.
+        output_path (str, optional): the rendered file path. None if the rendering failed.
+        error (str, optional): the error message. None if the rendering succeeded.
+        timings (Dict[str, float], optional): the duration of each stage, in seconds.
+            None if the rendering was not timed.
+        cache (str, optional): "unchanged" if the output file was already up to date,
+            "copied" if it was copied from the render cache. None if rendered.
+    """
+
+    json_path: str
+    output_path: Optional[str] = None
+    error: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None
+    cache: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """bool: whether the rendering succeeded or not."""
+        return self.error is None
+
+
+def collect_json_paths(inputs: Iterable[str]) -> List[str]:
+    """Expand folders and glob patterns into a sorted list of JSON file paths.
+
+    Args:
+        inputs (Iterable[str]): folders, glob patterns or file paths.
+
+    Returns:
+        List[str]: the unique JSON file paths found.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.json")))
+        elif glob.has_magic(item):
+            paths.update(glob.glob(item))
+        else:
+            paths.add(item)
+
+    return sorted(paths)
+
+
+def template_extension(template_path: str) -> str:
+    """Return the extension of the files rendered from a template.
+
+    Args:
+        template_path (str): the DOCX or PPTX template file path.
+
+    Returns:
+        str: "pptx" for a PPTX template, "docx" otherwise.
+    """
+    return "pptx" if template_path.lower().endswith(".pptx") else "docx"
+
+
+def output_path_for(json_path: str, output_dir: str, extension: str = "docx") -> str:
+    """Return the output file path for a JSON resume.
+
+    Args:
+        json_path (str): the JSON resume file path.
+        output_dir (str): the folder to render into.
+        extension (str, optional): the extension of the output file. Defaults to "docx".
+
+    Returns:
+        str: the output file path, named after the JSON file.
+    """
+    stem = os.path.splitext(os.path.basename(json_path))[0]
+    return os.path.join(output_dir, f"{stem}.{extension}")
+
+
+def roster_output_path_for(
+    employee: cv.Employee,
+    roster_path: str,
+    index: int,
+    output_dir: str,
+    extension: str = "docx",
+) -> str:
+    """Return the output file path for an employee of a roster.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+        roster_path (str): the roster file path.
+        index (int): the position of the employee within the roster.
+        output_dir (str): the folder to render into.
+        extension (str, optional): the extension of the output file. Defaults to "docx".
+
+    Returns:
+        str: the output file path, named after the roster, the position and the employee name.
+    """
+    stem = os.path.splitext(os.path.basename(roster_path))[0]
+    name = f"{stem}_{index:05d}_{employee.lastname}_{employee.firstname}"
+    name = "".join(char if char.isalnum() or char in "-_" else "_" for char in name)
+    return os.path.join(output_dir, f"{name}.{extension}")
+
+
+def render_template(
+    context: dict,
+    template_path: str,
+    save_path: str,
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> Optional[str]:
+    """Render a context against a DOCX or PPTX template, unless found in the render cache.
+
+    Args:
+        context (dict): the context to pass to the template.
+        template_path (str): the DOCX or PPTX template file path.
+        save_path (str): the file path to save the rendered resume to.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache. Defaults to None (always render).
+
+    Returns:
+        Optional[str]: "unchanged" or "copied" if served from the cache, None if rendered.
+    """
+    extension = template_extension(template_path)
+
+    key = None
+    if cache is not None:
+        from .render_cache import render_key
+
+        with timing.span("cache"):
+            key = render_key(template_path, context, locale, extension)
+            status = cache.fetch(key, save_path, extension)
+        if status is not None:
+            return status
+
+    if extension == "pptx":
+        from .pptx import render_slides
+
+        render_slides([context], template_path, save_path, locale=locale)
+    else:
+        from .docx import render_context
+
+        render_context(context, template_path, save_path, locale=locale)
+
+    if key is not None:
+        with timing.span("cache"):
+            cache.store(key, save_path, extension)
+    return None
+
+
+def render_employee(
+    employee: cv.Employee,
+    source: str,
+    template_path: str,
+    save_path: str,
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> RenderResult:
+    """Render a loaded employee against a DOCX or PPTX template.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+        source (str): where the employee comes from, reported in the result.
+        template_path (str): the DOCX or PPTX template file path.
+        save_path (str): the file path to save the rendered resume to.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache. Defaults to None (always render).
+
+    Returns:
+        RenderResult: the outcome of the rendering.
+    """
+    from .docx import build_context
+
+    try:
+        context = build_context(employee)
+        status = render_template(context, template_path, save_path, locale, cache)
+    except Exception as err:
+        return RenderResult(source, error=f"{type(err).__name__}: {err}")
+
+    return RenderResult(source, output_path=save_path, cache=status)
+
+
+def render_json(
+    json_path: str,
+    template_path: str,
+    output_dir: str,
+    json_encoding: str = "utf-8",
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> RenderResult:
+    """Load a JSON resume and render it against a DOCX or PPTX template.
+
+    Errors are caught and reported in the result, so that one bad resume never
+    stops a batch.
+
+    Args:
+        json_path (str): the JSON resume file path.
+        template_path (str): the DOCX or PPTX template file path.
+        output_dir (str): the folder to render into.
+        json_encoding (str, optional): the encoding of the JSON file. Defaults to "utf-8".
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache. Defaults to None (always render).
+
+    Returns:
+        RenderResult: the outcome of the rendering.
+    """
+    try:
+        with timing.span("load"):
+            employee = cv.Employee().keep_sorted("desc")
+            employee.load_from_json(json_path, json_encoding)
+    except Exception as err:
+        return RenderResult(json_path, error=f"{type(err).__name__}: {err}")
+
+    save_path = output_path_for(
+        json_path, output_dir, template_extension(template_path)
+    )
+    return render_employee(employee, json_path, template_path, save_path, locale, cache)
+
+
+def timed_call(function: Callable[..., RenderResult], *args) -> RenderResult:
+    """Call a task, collecting the duration of its stages into its result.
+
+    Args:
+        function (Callable[..., RenderResult]): the function to call.
+
+    Returns:
+        RenderResult: the outcome of the task, with its timings.
+    """
+    with timing.collect() as collector:
+        result = function(*args)
+    return result._replace(timings=collector.totals())
+
+
+def run_tasks(
+    function: Callable[..., RenderResult],
+    tasks: Iterable[Union[tuple, RenderResult]],
+    workers: Optional[int] = None,
+    timed: bool = False,
+) -> Iterator[RenderResult]:
+    """Run tasks across a pool of processes, with a bounded number of pending tasks.
+
+    Tasks are only pulled from the iterable as workers free up, so that a
+    streamed input is never fully held in memory.
+
+    Args:
+        function (Callable[..., RenderResult]): the function to run, importable by the workers.
+        tasks (Iterable[Union[tuple, RenderResult]]): the arguments of each call, or an
+            already known result, such as a loading failure, to yield as is.
+        workers (int, optional): the number of worker processes. Defaults to None (one per CPU).
+        timed (bool, optional): whether to time the stages of each task or not. Defaults to False.
+
+    Raises:
+        ValueError: if workers is lower than 1.
+
+    Yields:
+        RenderResult: the outcome of each task, in order of completion.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("'workers' should be at least 1.")
+
+    if timed:
+        function = functools.partial(timed_call, function)
+
+    # Run in-process when a single worker is requested
+    if workers == 1:
+        for task in tasks:
+            yield task if isinstance(task, RenderResult) else function(*task)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for task in tasks:
+            if isinstance(task, RenderResult):
+                yield task
+                continue
+
+            pending.add(executor.submit(function, *task))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def render_batch(
+    json_paths: Iterable[str],
+    template_path: str,
+    output_dir: str,
+    json_encoding: str = "utf-8",
+    workers: Optional[int] = None,
+    timed: bool = False,
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> Iterator[RenderResult]:
+    """Render many JSON resumes against a DOCX or PPTX template across a pool of processes.
+
+    Args:
+        json_paths (Iterable[str]): the JSON resume file paths.
+        template_path (str): the DOCX or PPTX template file path.
+        output_dir (str): the folder to render into.
+        json_encoding (str, optional): the encoding of the JSON files. Defaults to "utf-8".
+        workers (int, optional): the number of worker processes. Defaults to None (one per CPU).
+        timed (bool, optional): whether to time the stages of each rendering or not. Defaults to False.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache, to skip the resumes unchanged
+            since the last run. Defaults to None (always render).
+
+    Raises:
+        ValueError: if workers is lower than 1.
+
+    Yields:
+        RenderResult: the outcome of each rendering, in order of completion.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    tasks = (
+        (json_path, template_path, output_dir, json_encoding, locale, cache)
+        for json_path in json_paths
+    )
+    yield from run_tasks(render_json, tasks, workers, timed)
+
+
+def render_roster(
+    roster_path: str,
+    template_path: str,
+    output_dir: str,
+    json_encoding: str = "utf-8",
+    workers: Optional[int] = None,
+    timed: bool = False,
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> Iterator[RenderResult]:
+    """Stream the employees of a roster file and render them across a pool of processes.
+
+    The roster is read one employee at a time, in JSON Lines or JSON array format,
+    so that memory stays flat whatever its size.
+
+    Args:
+        roster_path (str): the roster file path.
+        template_path (str): the DOCX or PPTX template file path.
+        output_dir (str): the folder to render into.
+        json_encoding (str, optional): the encoding of the roster. Defaults to "utf-8".
+        workers (int, optional): the number of worker processes. Defaults to None (one per CPU).
+        timed (bool, optional): whether to time the stages of each rendering or not. Defaults to False.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache, to skip the resumes unchanged
+            since the last run. Defaults to None (always render).
+
+    Raises:
+        ValueError: if workers is lower than 1.
+
+    Yields:
+        RenderResult: the outcome of each rendering, in order of completion.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    extension = template_extension(template_path)
+
+    # The employees are loaded in this process: their loading time is kept
+    # aside, until the result of their rendering comes back
+    load_timings = {}
+
+    def tasks() -> Iterator[Union[tuple, RenderResult]]:
+        for index, json_obj in cv.iter_json_objects(
+            roster_path, json_encoding, report_errors=True
+        ):
+            source = f"{roster_path}#{index}"
+            if isinstance(json_obj, ValueError):
+                yield RenderResult(source, error=f"ValueError: {json_obj}")
+                continue
+            try:
+                start = time.perf_counter()
+                with timing.span("load"):
+                    employee = cv.Employee().keep_sorted("desc")
+                    employee.load_from_dict(json_obj)
+                if timed:
+                    load_timings[source] = time.perf_counter() - start
+            except Exception as err:
+                yield RenderResult(source, error=f"{type(err).__name__}: {err}")
+                continue
+
+            save_path = roster_output_path_for(
+                employee, roster_path, index, output_dir, extension
+            )
+            yield employee, source, template_path, save_path, locale, cache
+
+    for result in run_tasks(render_employee, tasks(), workers, timed):
+        if result.timings is not None:
+            load = load_timings.pop(result.json_path)
+            result = result._replace(timings={"load": load, **result.timings})
+        yield result
@@ -0,0 +1,739 @@
+# -*- coding: utf-8 -*-
+"""
+cli.py
+Author: Gilson, K.
+
+A command only imports the modules it runs: the renderers and docxtpl, the
+render cache, the PDF export, the render service and the GUI with tkinter are
+imported by the commands using them, so that e.g. 'validate' starts fast.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import cv
+from . import timing
+from .batch import RenderResult, collect_json_paths, render_batch, render_roster
+from .locales import get_locale
+from .variants import VARIANT_PATTERN, render_variants
+from .watch import WATCH_PATTERN, Watcher
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+
+
+def positive_int(value: str) -> int:
+    """Parse a command line argument as an integer of at least 1.
+
+    Args:
+        value (str): the argument.
+
+    Raises:
+        argparse.ArgumentTypeError: if the argument is not an integer of at least 1.
+
+    Returns:
+        int: the integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"expect an integer of at least 1, not {value!r}"
+        )
+    return number
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse the command line arguments.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+
+    Returns:
+        argparse.Namespace: the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="cv_builder",
+        description="Build resumes. Without a command, the GUI is started.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Render
+    render_parser = subparsers.add_parser(
+        "render", help="render JSON resumes against a DOCX or PPTX template"
+    )
+    render_parser.add_argument(
+        "inputs", nargs="*", help="JSON resumes, folders or glob patterns"
+    )
+    render_parser.add_argument(
+        "-r",
+        "--roster",
+        action="append",
+        default=[],
+        help="a roster of resumes, in JSON Lines or JSON array format (repeatable)",
+    )
+    render_parser.add_argument(
+        "-t", "--template", required=True, help="the DOCX or PPTX template"
+    )
+    render_parser.add_argument(
+        "-o", "--output", default=".", help="the output folder (default: '.')"
+    )
+    render_parser.add_argument(
+        "-w",
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="the number of worker processes (default: one per CPU)",
+    )
+    render_parser.add_argument(
+        "--encoding", default="utf-8", help="the JSON encoding (default: utf-8)"
+    )
+    render_parser.add_argument(
+        "-l",
+        "--locale",
+        default=None,
+        help="the locale of the dates: en, fr, nl or de (default: en)",
+    )
+    render_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print the duration of each stage of every rendering",
+    )
+    render_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="skip the files unchanged since the last run, with a render cache",
+    )
+    render_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="the render cache folder (default: the application cache)",
+    )
+    render_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="the size limit of the render cache, in MiB (default: 512)",
+    )
+    render_parser.add_argument(
+        "--pdf",
+        action="store_true",
+        help="also export every rendered file to PDF, with LibreOffice",
+    )
+    render_parser.add_argument(
+        "--office-workers",
+        type=int,
+        default=2,
+        help="the number of LibreOffice processes exporting to PDF (default: 2)",
+    )
+    render_parser.add_argument(
+        "--pdf-timeout",
+        type=float,
+        default=120.0,
+        help="the maximum duration of a PDF export, in seconds (default: 120)",
+    )
+
+    # Variants
+    variants_parser = subparsers.add_parser(
+        "variants",
+        help="render a JSON resume against several (template, locale) pairs",
+    )
+    variants_parser.add_argument("input", help="the JSON resume")
+    variants_parser.add_argument(
+        "-v",
+        "--variant",
+        nargs=2,
+        action="append",
+        required=True,
+        metavar=("TEMPLATE", "LOCALE"),
+        help="a DOCX template and the locale of the dates (repeatable)",
+    )
+    variants_parser.add_argument(
+        "-o", "--output", default=".", help="the output folder (default: '.')"
+    )
+    variants_parser.add_argument(
+        "-p",
+        "--pattern",
+        default=VARIANT_PATTERN,
+        help="the name of the output files, with the {stem}, {template}, {locale}, "
+        "{lastname} and {firstname} placeholders "
+        f"(default: {VARIANT_PATTERN})",
+    )
+    variants_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="the number of worker processes (default: one per variant)",
+    )
+    variants_parser.add_argument(
+        "--encoding", default="utf-8", help="the JSON encoding (default: utf-8)"
+    )
+    variants_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print the duration of each stage of every rendering",
+    )
+    variants_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="skip the files unchanged since the last run, with a render cache",
+    )
+    variants_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="the render cache folder (default: the application cache)",
+    )
+    variants_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="the size limit of the render cache, in MiB (default: 512)",
+    )
+
+    # Watch
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="render again the resumes of a folder as they or the templates change",
+    )
+    watch_parser.add_argument("resumes", help="the folder of JSON resumes")
+    watch_parser.add_argument("templates", help="the folder of DOCX and PPTX templates")
+    watch_parser.add_argument(
+        "-o", "--output", default=".", help="the output folder (default: '.')"
+    )
+    watch_parser.add_argument(
+        "-p",
+        "--pattern",
+        default=WATCH_PATTERN,
+        help="the name of the output files, with the {stem}, {template}, {locale}, "
+        "{lastname} and {firstname} placeholders "
+        f"(default: {WATCH_PATTERN})",
+    )
+    watch_parser.add_argument(
+        "-l",
+        "--locale",
+        default=None,
+        help="the locale of the dates: en, fr, nl or de (default: en)",
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="the time between two looks at the folders, in seconds (default: 0.5)",
+    )
+    watch_parser.add_argument(
+        "--encoding", default="utf-8", help="the JSON encoding (default: utf-8)"
+    )
+    watch_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="skip the files unchanged since the last run, with a render cache",
+    )
+    watch_parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="the render cache folder (default: the application cache)",
+    )
+    watch_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=512,
+        help="the size limit of the render cache, in MiB (default: 512)",
+    )
+
+    # Deck
+    deck_parser = subparsers.add_parser(
+        "deck", help="render JSON resumes into a single PPTX deck, a slide per resume"
+    )
+    deck_parser.add_argument(
+        "inputs", nargs="*", help="JSON resumes, folders or glob patterns"
+    )
+    deck_parser.add_argument(
+        "-r",
+        "--roster",
+        action="append",
+        default=[],
+        help="a roster of resumes, in JSON Lines or JSON array format (repeatable)",
+    )
+    deck_parser.add_argument(
+        "-t", "--template", required=True, help="the PPTX profile template"
+    )
+    deck_parser.add_argument(
+        "-o", "--output", default="deck.pptx", help="the deck (default: deck.pptx)"
+    )
+    deck_parser.add_argument(
+        "--encoding", default="utf-8", help="the JSON encoding (default: utf-8)"
+    )
+    deck_parser.add_argument(
+        "-l",
+        "--locale",
+        default=None,
+        help="the locale of the dates: en, fr, nl or de (default: en)",
+    )
+    deck_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="print the duration of each stage of the rendering",
+    )
+
+    # Validate
+    validate_parser = subparsers.add_parser(
+        "validate", help="report every data model violation of JSON resumes"
+    )
+    validate_parser.add_argument(
+        "inputs", nargs="*", help="JSON resumes, folders or glob patterns"
+    )
+    validate_parser.add_argument(
+        "-r",
+        "--roster",
+        action="append",
+        default=[],
+        help="a roster of resumes, in JSON Lines or JSON array format (repeatable)",
+    )
+    validate_parser.add_argument(
+        "-w",
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="the number of worker processes (default: one per CPU)",
+    )
+    validate_parser.add_argument(
+        "--encoding", default="utf-8", help="the JSON encoding (default: utf-8)"
+    )
+
+    # Serve
+    serve_parser = subparsers.add_parser(
+        "serve", help="start an HTTP service rendering the posted JSON resumes"
+    )
+    serve_parser.add_argument(
+        "templates", help="the folder of the DOCX and PPTX templates served"
+    )
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="the address to listen on (default: 127.0.0.1, local only)",
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8080, help="the port to listen on (default: 8080)"
+    )
+    serve_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="the number of worker processes (default: one per CPU)",
+    )
+    serve_parser.add_argument(
+        "--queue",
+        type=int,
+        default=None,
+        help="the number of requests waiting for a worker, beyond which they are "
+        "refused (default: 4 per worker)",
+    )
+    serve_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="the maximum duration of a rendering, in seconds (default: 60)",
+    )
+    serve_parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not log the requests"
+    )
+
+    # GUI
+    gui_parser = subparsers.add_parser("gui", help="start the GUI")
+    gui_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="display the duration of each stage after every build",
+    )
+
+    return parser.parse_args(argv)
+
+
+def render(args: argparse.Namespace) -> int:
+    """Run the 'render' command.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if any resume failed to render.
+    """
+    json_paths = collect_json_paths(args.inputs)
+    if not json_paths and not args.roster:
+        print("No JSON resume found.", file=sys.stderr)
+        return 1
+
+    try:
+        get_locale(args.locale)
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    options = (
+        args.template,
+        args.output,
+        args.encoding,
+        args.workers,
+        args.timings,
+        args.locale,
+        render_cache(args),
+    )
+    results = [render_batch(json_paths, *options)]
+    for roster_path in args.roster:
+        results.append(render_roster(roster_path, *options))
+    results = itertools.chain.from_iterable(results)
+
+    if not args.pdf:
+        return report(results)
+
+    from .pdf import OfficePool, convert_results
+
+    try:
+        pool = OfficePool(args.office_workers, args.pdf_timeout)
+    except (ValueError, OSError) as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    with pool:
+        return report(convert_results(results, pool))
+
+
+def variants(args: argparse.Namespace) -> int:
+    """Run the 'variants' command.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if any variant failed to render.
+    """
+    try:
+        employee = cv.Employee().keep_sorted("desc")
+        with timing.span("load"):
+            employee.load_from_json(args.input, args.encoding)
+    except Exception as err:
+        print(f"FAILED {args.input}: {type(err).__name__}: {err}", file=sys.stderr)
+        return 1
+
+    stem = os.path.splitext(os.path.basename(args.input))[0]
+    try:
+        results = render_variants(
+            employee,
+            args.variant,
+            args.output,
+            stem,
+            args.pattern,
+            args.workers,
+            args.timings,
+            render_cache(args),
+        )
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    return report(results)
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Run the 'watch' command, until interrupted.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if a folder does not exist.
+    """
+    for folder in (args.resumes, args.templates):
+        if not os.path.isdir(folder):
+            print(f"No folder '{folder}'.", file=sys.stderr)
+            return 1
+
+    try:
+        watcher = Watcher(
+            args.resumes,
+            args.templates,
+            args.output,
+            args.locale,
+            args.pattern,
+            args.encoding,
+            render_cache(args),
+        )
+    except ValueError as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    print(f"Watching {args.resumes} and {args.templates}, press Ctrl+C to stop.")
+    try:
+        watcher.run(print_result, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def deck(args: argparse.Namespace) -> int:
+    """Run the 'deck' command.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if any resume failed to load or the deck to render.
+    """
+    json_paths = collect_json_paths(args.inputs)
+    if not json_paths and not args.roster:
+        print("No JSON resume found.", file=sys.stderr)
+        return 1
+
+    employees = []
+    failures = 0
+
+    def load(source: str, populate: Callable[[cv.Employee], cv.Employee]) -> None:
+        nonlocal failures
+        try:
+            with timing.span("load"):
+                employees.append(populate(cv.Employee().keep_sorted("desc")))
+        except Exception as err:
+            failures += 1
+            print(f"FAILED {source}: {type(err).__name__}: {err}", file=sys.stderr)
+
+    with timing.collect() as collector:
+        for json_path in json_paths:
+            load(
+                json_path,
+                lambda employee: employee.load_from_json(json_path, args.encoding),
+            )
+        for roster_path in args.roster:
+            for index, json_obj in cv.iter_json_objects(
+                roster_path, args.encoding, report_errors=True
+            ):
+                source = f"{roster_path}#{index}"
+                if isinstance(json_obj, ValueError):
+                    failures += 1
+                    print(f"FAILED {source}: ValueError: {json_obj}", file=sys.stderr)
+                    continue
+                load(source, lambda employee: employee.load_from_dict(json_obj))
+
+        try:
+            from .pptx import render_deck
+
+            render_deck(employees, args.template, args.output, locale=args.locale)
+        except Exception as err:
+            print(f"FAILED {args.output}: {type(err).__name__}: {err}", file=sys.stderr)
+            return 1
+
+    print(f"OK     {len(employees)} resumes -> {args.output}")
+    if args.timings:
+        print(f"Total: {timing.format_breakdown(collector.totals())}")
+    return 1 if failures else 0
+
+
+def render_cache(args: argparse.Namespace) -> Optional["RenderCache"]:
+    """Return the render cache set by the command line arguments, if any.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        Optional[RenderCache]: the render cache, None without --cache.
+    """
+    if not args.cache:
+        return None
+
+    from .render_cache import RenderCache
+
+    return RenderCache(args.cache_dir, args.cache_size * 1024 * 1024)
+
+
+def print_result(result: RenderResult) -> None:
+    """Print the outcome of a rendering.
+
+    Args:
+        result (RenderResult): the outcome.
+    """
+    if result.ok and result.cache:
+        print(f"CACHED {result.json_path} -> {result.output_path}")
+    elif result.ok:
+        print(f"OK     {result.json_path} -> {result.output_path}")
+    else:
+        print(f"FAILED {result.json_path}: {result.error}", file=sys.stderr)
+
+    if result.timings:
+        print(f"       {timing.format_breakdown(result.timings)}")
+
+
+def report(results: Iterable[RenderResult]) -> int:
+    """Print the outcome of each rendering, then a summary.
+
+    Args:
+        results (Iterable[RenderResult]): the outcomes.
+
+    Returns:
+        int: the exit code, 1 if any rendering failed.
+    """
+    successes = cached = failures = 0
+    totals = {}
+    for result in results:
+        print_result(result)
+        if result.ok and result.cache:
+            cached += 1
+        elif result.ok:
+            successes += 1
+        else:
+            failures += 1
+
+        if result.timings:
+            for name, duration in result.timings.items():
+                totals[name] = totals.get(name, 0.0) + duration
+
+    if cached:
+        print(f"{successes} rendered, {cached} from cache, {failures} failed.")
+    else:
+        print(f"{successes} rendered, {failures} failed.")
+    if totals:
+        print(f"Total: {timing.format_breakdown(totals)}")
+    return 1 if failures else 0
+
+
+def validate_roster(
+    roster_path: str, json_encoding: str
+) -> Iterator[Tuple[str, List[cv.Violation]]]:
+    """Validate each resume of a roster file, an undecodable one being reported as a violation.
+
+    Args:
+        roster_path (str): the roster file path.
+        json_encoding (str): the encoding of the file.
+
+    Yields:
+        Tuple[str, List[cv.Violation]]: the source of each resume, e.g. "team.jsonl#2", and its violations.
+    """
+    for index, json_obj in cv.iter_json_objects(
+        roster_path, json_encoding, report_errors=True
+    ):
+        if isinstance(json_obj, ValueError):
+            violations = [cv.Violation("$", f"Unable to read JSON: {json_obj}")]
+        else:
+            violations = cv.validate_document(json_obj)
+        yield f"{roster_path}#{index}", violations
+
+
+def validate(args: argparse.Namespace) -> int:
+    """Run the 'validate' command.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if any resume is invalid.
+    """
+    json_paths = collect_json_paths(args.inputs)
+    if not json_paths and not args.roster:
+        print("No JSON resume found.", file=sys.stderr)
+        return 1
+
+    results = [cv.validate_files(json_paths, args.encoding, args.workers)]
+    for roster_path in args.roster:
+        results.append(validate_roster(roster_path, args.encoding))
+
+    valid = invalid = 0
+    for source, violations in itertools.chain.from_iterable(results):
+        if not violations:
+            valid += 1
+            continue
+
+        invalid += 1
+        print(f"INVALID {source}")
+        for violation in violations:
+            print("    " + str(violation).replace("\n", "\n        "))
+
+    print(f"{valid} valid, {invalid} invalid.")
+    return 1 if invalid else 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Run the 'serve' command, until interrupted.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code, 1 if the service failed to start.
+    """
+    from .server import RenderService, make_server
+
+    try:
+        service = RenderService(args.templates, args.workers, args.queue, args.timeout)
+    except (ValueError, FileNotFoundError) as err:
+        print(err, file=sys.stderr)
+        return 1
+
+    with service:
+        try:
+            server = make_server(service, args.host, args.port, args.quiet)
+        except OSError as err:
+            print(err, file=sys.stderr)
+            return 1
+
+        host, port = server.server_address[:2]
+        print(
+            f"Serving {', '.join(service.templates()) or 'no template'} on "
+            f"http://{host}:{port} with {service.workers} workers, "
+            "press Ctrl+C to stop."
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+def start_gui(args: argparse.Namespace) -> int:
+    """Run the 'gui' command.
+
+    Args:
+        args (argparse.Namespace): the parsed arguments.
+
+    Returns:
+        int: the exit code.
+    """
+    import gui
+
+    app = gui.App(show_timings=args.timings)
+    app.mainloop()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the command line interface.
+
+    Args:
+        argv (List[str], optional): the arguments to parse. Defaults to None (sys.argv).
+
+    Returns:
+        int: the exit code.
+    """
+    args = parse_args(argv)
+
+    if args.command == "render":
+        return render(args)
+    elif args.command == "variants":
+        return variants(args)
+    elif args.command == "watch":
+        return watch(args)
+    elif args.command == "deck":
+        return deck(args)
+    elif args.command == "validate":
+        return validate(args)
+    elif args.command == "serve":
+        return serve(args)
+    elif args.command == "gui":
+        return start_gui(args)
+    return 2
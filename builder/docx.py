@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+docx.py
+Author: Gilson, K.
+"""
+
+from typing import IO, Callable, Optional, Union
+
+import cv
+from . import timing
+from .locales import get_locale
+from .templates import template_cache
+
+# A progress callback receives the index of the step about to start, the number
+# of steps and the description of the step; it may raise to abort the render
+Progress = Callable[[int, int, str], None]
+
+# The steps of a render, as reported to a progress callback
+RENDER_STEPS = ("Loading the template", "Rendering", "Saving")
+
+
+def build_context(employee: cv.Employee) -> dict:
+    """Sort the employee by descending dates and return its template context.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+
+    Raises:
+        TypeError: if employee is not an Employee object.
+
+    Returns:
+        dict: the context to pass to the template.
+    """
+    if not isinstance(employee, cv.Employee):
+        raise TypeError("'employee' expect an Employee object.")
+
+    with timing.span("sort"):
+        employee.sort_works("desc")
+        employee.sort_projects("desc")
+        employee.sort_educations("desc")
+
+    with timing.span("to_dict"):
+        # Only read by the renderers: rebuilt where the employee changed since
+        return employee.to_dict(keep_none=False, shared=True)
+
+
+def render_context(
+    context: dict,
+    template_path: str,
+    save_path: Union[str, IO[bytes]],
+    progress: Optional[Progress] = None,
+    locale: Optional[str] = None,
+) -> Union[str, IO[bytes]]:
+    """Render a DOCX template from a context and save it.
+
+    The template is parsed once per process, then served from the template cache.
+    The locale is passed to the template as the 'locale' variable, used by the
+    date filters.
+
+    Args:
+        context (dict): the context to pass to the template.
+        template_path (str): the DOCX template file path.
+        save_path (Union[str, IO[bytes]]): the file path or binary file to save the rendered resume to.
+        progress (Progress, optional): called before each of the RENDER_STEPS. Defaults to None.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Raises:
+        ValueError: if the locale is not supported.
+
+    Returns:
+        Union[str, IO[bytes]]: the file path or binary file of the rendered resume.
+    """
+    get_locale(locale)
+    step_count = len(RENDER_STEPS)
+
+    if progress is not None:
+        progress(0, step_count, RENDER_STEPS[0])
+    with timing.span("template"):
+        docx_tpl = template_cache.new_document(template_path)
+
+    if progress is not None:
+        progress(1, step_count, RENDER_STEPS[1])
+    with timing.span("render"):
+        docx_tpl.render(dict(context, locale=locale))
+
+    if progress is not None:
+        progress(2, step_count, RENDER_STEPS[2])
+    with timing.span("save"):
+        docx_tpl.save(save_path)
+
+    return save_path
+
+
+def render_docx(
+    employee: cv.Employee,
+    template_path: str,
+    save_path: str,
+    progress: Optional[Progress] = None,
+    locale: Optional[str] = None,
+) -> str:
+    """Render a DOCX template for an employee and save it.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+        template_path (str): the DOCX template file path.
+        save_path (str): the file path to save the rendered resume to.
+        progress (Progress, optional): called before each of the RENDER_STEPS. Defaults to None.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Returns:
+        str: the file path of the rendered resume.
+    """
+    context = build_context(employee)
+    return render_context(context, template_path, save_path, progress, locale)
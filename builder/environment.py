@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+environment.py
+Author: Gilson, K.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+import jinja2
+from jinja2.bccache import Bucket
+
+from .filters import FILTERS
+
+
+def cache_dir(*parts: str) -> str:
+    """Return a folder of the on-disk cache of the application.
+
+    The root folder is set by the 'CV_BUILDER_CACHE_DIR' environment variable,
+    and defaults to the local application data folder of the user.
+
+    Args:
+        *parts (str): the sub-folders within the cache folder.
+
+    Returns:
+        str: the folder path, not necessarily existing yet.
+    """
+    root = os.environ.get("CV_BUILDER_CACHE_DIR")
+    if not root:
+        if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+            root = os.path.join(os.environ["LOCALAPPDATA"], "cv_builder", "cache")
+        else:
+            root = os.path.join(os.path.expanduser("~"), ".cache", "cv_builder")
+
+    return os.path.join(root, *parts)
+
+
+class AtomicBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """AtomicBytecodeCache: inherit from 'jinja2.FileSystemBytecodeCache'.
+
+    Safe to share between processes: the bytecode is written to a temporary file
+    then moved into place, and unreadable or truncated files are ignored.
+    """
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        """Load the bytecode of a bucket, resetting it if the file is unreadable."""
+        try:
+            super().load_bytecode(bucket)
+        except (OSError, EOFError, ValueError, TypeError):
+            bucket.reset()
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        """Write the bytecode of a bucket, ignoring a read-only cache folder."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                bucket.write_bytecode(tmp_file)
+            os.replace(tmp_path, self._get_cache_filename(bucket))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+_environment = None
+_lock = threading.Lock()
+
+
+def _create_environment() -> jinja2.Environment:
+    """Create the Jinja environment shared by the process.
+
+    Returns:
+        jinja2.Environment: the environment, with the filters registered and
+            a bytecode cache if the cache folder is writable.
+    """
+    bytecode_cache = None
+    directory = cache_dir("jinja")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        bytecode_cache = AtomicBytecodeCache(directory)
+    except OSError:
+        pass
+
+    # Same as DocxTemplate.render(autoescape=True), applied at compile time
+    jinja_env = jinja2.Environment(autoescape=True, bytecode_cache=bytecode_cache)
+    jinja_env.filters.update(FILTERS)
+    return jinja_env
+
+
+def get_environment() -> jinja2.Environment:
+    """Return the Jinja environment shared by the process, creating it on first use.
+
+    Returns:
+        jinja2.Environment: the shared environment.
+    """
+    global _environment
+
+    if _environment is None:
+        with _lock:
+            if _environment is None:
+                _environment = _create_environment()
+    return _environment
+
+
+def register_filter(name: str, function: Optional[Callable] = None) -> Callable:
+    """Register a filter on every template rendered by the application.
+
+    Can be used directly, or as a decorator when function is omitted.
+
+    Args:
+        name (str): the name of the filter within the templates.
+        function (Callable, optional): the filter function. Defaults to None.
+
+    Raises:
+        TypeError: if name is not a str.
+
+    Returns:
+        Callable: the filter function, or the decorator registering it.
+    """
+    if not isinstance(name, str):
+        raise TypeError("'name' expect a str.")
+
+    def decorator(func: Callable) -> Callable:
+        FILTERS[name] = func
+        if _environment is not None:
+            _environment.filters[name] = func
+        return func
+
+    if function is None:
+        return decorator
+    return decorator(function)
+
+
+def calling_digest(jinja_env: jinja2.Environment) -> str:
+    """Return a digest of how the filters and tests of an environment are called.
+
+    The compiled code of a template depends on it: once a filter receives the
+    render context, the bytecode compiled before must not be loaded anymore.
+
+    Args:
+        jinja_env (jinja2.Environment): the environment.
+
+    Returns:
+        str: the digest.
+    """
+    calls = sorted(
+        (kind, name, str(getattr(function, "jinja_pass_arg", None)))
+        for kind, functions in (
+            ("filter", jinja_env.filters),
+            ("test", jinja_env.tests),
+        )
+        for name, function in functions.items()
+    )
+    return hashlib.sha1(repr(calls).encode("utf-8")).hexdigest()[:16]
+
+
+def compile_template(
+    source: str, name: str, jinja_env: Optional[jinja2.Environment] = None
+) -> jinja2.Template:
+    """Compile a template source, going through the bytecode cache of the environment.
+
+    Unlike jinja2.Environment.from_string, a source already compiled by any
+    process is loaded from the bytecode cache instead of being compiled again.
+
+    Args:
+        source (str): the template source.
+        name (str): the name of the template, used as cache key.
+        jinja_env (jinja2.Environment, optional): the environment to compile with.
+            Defaults to None (the shared environment).
+
+    Returns:
+        jinja2.Template: the compiled template.
+    """
+    if jinja_env is None:
+        jinja_env = get_environment()
+
+    bytecode_cache = jinja_env.bytecode_cache
+    if bytecode_cache is None:
+        return jinja_env.from_string(source)
+
+    key = f"{name}#{calling_digest(jinja_env)}"
+    bucket = bytecode_cache.get_bucket(jinja_env, key, None, source)
+    code = bucket.code
+    if code is None:
+        code = jinja_env.compile(source, name)
+        bucket.code = code
+        bytecode_cache.set_bucket(bucket)
+
+    return jinja_env.template_class.from_code(
+        jinja_env, code, jinja_env.make_globals(None), None
+    )
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+filters.py
+Author: Gilson, K.
+
+Date filters of the templates, in several locales, see the 'locales' module.
+
+Within a template, the filters use the 'locale' variable passed to the render,
+unless a locale is given explicitly, e.g. '{{ work.start|format_date("fr") }}'.
+The variables set by the template itself are not looked up.
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+import jinja2
+
+from .locales import format_date, format_duration, format_range
+
+
+def _defined(value: Any) -> Any:
+    """Return a value, or None if undefined, e.g. the end of an ongoing work dropped by to_dict.
+
+    Args:
+        value (Any): the value.
+
+    Returns:
+        Any: the value, None if undefined.
+    """
+    return None if isinstance(value, jinja2.Undefined) else value
+
+
+@jinja2.pass_context
+def _format_date_filter(
+    context: jinja2.runtime.Context,
+    date_int: Optional[int],
+    locale: Optional[str] = None,
+) -> str:
+    """Filter version of format_date."""
+    return format_date(_defined(date_int), locale or context.parent.get("locale"))
+
+
+@jinja2.pass_context
+def _format_duration_filter(
+    context: jinja2.runtime.Context,
+    start: Optional[int],
+    end: Optional[int] = None,
+    locale: Optional[str] = None,
+) -> str:
+    """Filter version of format_duration."""
+    return format_duration(
+        _defined(start), _defined(end), locale or context.parent.get("locale")
+    )
+
+
+@jinja2.pass_context
+def _format_range_filter(
+    context: jinja2.runtime.Context,
+    start: Optional[int],
+    end: Optional[int] = None,
+    locale: Optional[str] = None,
+) -> str:
+    """Filter version of format_range."""
+    return format_range(
+        _defined(start), _defined(end), locale or context.parent.get("locale")
+    )
+
+
+# Filters registered on every Jinja environment used to render a template
+FILTERS: Dict[str, Callable] = {
+    "format_date": _format_date_filter,
+    "format_duration": _format_duration_filter,
+    "format_range": _format_range_filter,
+}
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+inmemory.py
+Author: Gilson, K.
+
+In-memory rendering, for tools that zip the resumes or stream them to a browser:
+the rendered file is returned as bytes, without any file written to disk.
+
+Example:
+    with zipfile.ZipFile("resumes.zip", "w") as zip_file:
+        for name, employee in employees.items():
+            output = render_bytes(employee, "templates/example.docx")
+            zip_file.writestr(f"{name}.docx", output.getvalue())
+"""
+
+import io
+from typing import Any, Optional, Union
+
+import cv
+from . import timing
+from .batch import template_extension
+from .docx import build_context
+
+
+def render_bytes(
+    resume: Union[cv.Employee, dict],
+    template_path: str,
+    locale: Optional[str] = None,
+) -> io.BytesIO:
+    """Render a resume against a DOCX or PPTX template, in memory.
+
+    Args:
+        resume (Union[cv.Employee, dict]): the employee to render, or its decoded JSON resume.
+        template_path (str): the DOCX or PPTX template file path.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Raises:
+        TypeError: if resume is neither an Employee object nor a dict.
+        ValueError: if the locale is not supported.
+
+    Returns:
+        io.BytesIO: the rendered file, positioned at its start.
+    """
+    if isinstance(resume, dict):
+        with timing.span("load"):
+            employee = cv.Employee().keep_sorted("desc")
+            employee.load_from_dict(_without_nulls(resume))
+    elif isinstance(resume, cv.Employee):
+        employee = resume
+    else:
+        raise TypeError("'resume' expect an Employee object or a dict.")
+
+    context = build_context(employee)
+    output = io.BytesIO()
+    if template_extension(template_path) == "pptx":
+        from .pptx import render_slides
+
+        render_slides([context], template_path, output, locale=locale)
+    else:
+        from .docx import render_context
+
+        render_context(context, template_path, output, locale=locale)
+
+    output.seek(0)
+    return output
+
+
+def _without_nulls(obj: Any) -> Any:
+    """Remove the None values of the dicts of a decoded JSON object, at every depth.
+
+    As load_from_json does with its object hook, the lists are left as is.
+
+    Args:
+        obj (Any): the decoded JSON object.
+
+    Returns:
+        Any: a copy of the object, purged from its None values.
+    """
+    if isinstance(obj, dict):
+        return cv.Employee.remove_nulls(
+            {key: _without_nulls(value) for key, value in obj.items()}
+        )
+    if isinstance(obj, list):
+        return [_without_nulls(value) for value in obj]
+    return obj
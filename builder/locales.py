@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+locales.py
+Author: Gilson, K.
+
+Formatting of the dates of the resumes in several locales.
+
+The labels of each locale are precomputed once, and the formatted dates are
+memoized.
+"""
+
+import datetime
+import functools
+from typing import NamedTuple, Optional, Tuple
+
+
+class Locale(NamedTuple):
+    """Locale: the labels of the dates of a language.
+
+    Attributes:
+        months (Tuple[str, ...]): the names of the months, from January.
+        ongoing (str): the label of a missing end date.
+        year (Tuple[str, str]): the singular and plural of "year".
+        month (Tuple[str, str]): the singular and plural of "month".
+    """
+
+    months: Tuple[str, ...]
+    ongoing: str
+    year: Tuple[str, str]
+    month: Tuple[str, str]
+
+
+LOCALES = {
+    "en": Locale(
+        months=(
+            "January",
+            "February",
+            "March",
+            "April",
+            "May",
+            "June",
+            "July",
+            "August",
+            "September",
+            "October",
+            "November",
+            "December",
+        ),
+        ongoing="Ongoing",
+        year=("year", "years"),
+        month=("month", "months"),
+    ),
+    "fr": Locale(
+        months=(
+            "janvier",
+            "février",
+            "mars",
+            "avril",
+            "mai",
+            "juin",
+            "juillet",
+            "août",
+            "septembre",
+            "octobre",
+            "novembre",
+            "décembre",
+        ),
+        ongoing="En cours",
+        year=("an", "ans"),
+        month=("mois", "mois"),
+    ),
+    "nl": Locale(
+        months=(
+            "januari",
+            "februari",
+            "maart",
+            "april",
+            "mei",
+            "juni",
+            "juli",
+            "augustus",
+            "september",
+            "oktober",
+            "november",
+            "december",
+        ),
+        ongoing="Lopend",
+        year=("jaar", "jaar"),
+        month=("maand", "maanden"),
+    ),
+    "de": Locale(
+        months=(
+            "Januar",
+            "Februar",
+            "März",
+            "April",
+            "Mai",
+            "Juni",
+            "Juli",
+            "August",
+            "September",
+            "Oktober",
+            "November",
+            "Dezember",
+        ),
+        ongoing="Laufend",
+        year=("Jahr", "Jahre"),
+        month=("Monat", "Monate"),
+    ),
+}
+
+DEFAULT_LOCALE = "en"
+
+# Separator of the two dates of a range
+RANGE_SEPARATOR = " – "
+
+
+@functools.lru_cache(maxsize=None)
+def get_locale(locale: Optional[str] = None) -> Locale:
+    """Return the labels of a locale, falling back from a region to its language.
+
+    Args:
+        locale (str, optional): the locale, e.g. "fr" or "fr_BE". Defaults to None (DEFAULT_LOCALE).
+
+    Raises:
+        ValueError: if the locale is not supported.
+
+    Returns:
+        Locale: the labels.
+    """
+    if locale is None:
+        locale = DEFAULT_LOCALE
+
+    labels = LOCALES.get(locale)
+    if labels is None:
+        labels = LOCALES.get(locale.replace("-", "_").split("_")[0].lower())
+    if labels is None:
+        raise ValueError(
+            f"'locale' expect one of {', '.join(LOCALES)}, not {locale!r}."
+        )
+    return labels
+
+
+def split_date(date_int: int) -> Tuple[int, Optional[int]]:
+    """Split a date under the YYYYMM or YYYY format.
+
+    Args:
+        date_int (int): the date.
+
+    Raises:
+        ValueError: if the month is not between 1 and 12.
+
+    Returns:
+        Tuple[int, Optional[int]]: the year, and the month if any.
+    """
+    date_int = int(date_int)
+    if date_int < 10000:
+        return date_int, None
+
+    year, month = divmod(date_int, 100)
+    if not 1 <= month <= 12:
+        raise ValueError(f"The month of the date {date_int} should be 01 to 12.")
+    return year, month
+
+
+@functools.lru_cache(maxsize=4096)
+def format_date(date_int: Optional[int], locale: Optional[str] = None) -> str:
+    """Format a date under the YYYYMM format to one with an explicit month.
+
+    Args:
+        date_int (int, optional): the date under the YYYYMM (or YYYY) format.
+        locale (str, optional): the locale. Defaults to None (DEFAULT_LOCALE).
+
+    Raises:
+        ValueError: if the month is not between 1 and 12.
+
+    Returns:
+        str: the date under the 'Month YYYY' format, or 'Ongoing' if None.
+    """
+    labels = get_locale(locale)
+    if date_int is None:
+        return labels.ongoing
+
+    year, month = split_date(date_int)
+    if month is None:
+        return str(year)
+    return f"{labels.months[month - 1]} {year}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_months(months: int, locale: Optional[str]) -> str:
+    """Format a number of months as years and months.
+
+    Args:
+        months (int): the number of months.
+        locale (str, optional): the locale.
+
+    Returns:
+        str: the duration, e.g. "2 years 3 months".
+    """
+    labels = get_locale(locale)
+    years, months = divmod(months, 12)
+
+    parts = []
+    if years:
+        parts.append(f"{years} {labels.year[years > 1]}")
+    if months or not years:
+        parts.append(f"{months} {labels.month[months > 1]}")
+    return " ".join(parts)
+
+
+def format_duration(
+    start: Optional[int],
+    end: Optional[int] = None,
+    locale: Optional[str] = None,
+    today: Optional[datetime.date] = None,
+) -> str:
+    """Format the duration between two dates, both months included.
+
+    Args:
+        start (int, optional): the start date under the YYYYMM (or YYYY) format.
+        end (int, optional): the end date, None if ongoing. Defaults to None.
+        locale (str, optional): the locale. Defaults to None (DEFAULT_LOCALE).
+        today (datetime.date, optional): the end of an ongoing duration. Defaults to None (today).
+
+    Raises:
+        ValueError: if the month of a date is not between 1 and 12.
+
+    Returns:
+        str: the duration, e.g. "2 years 3 months", or an empty string without start date.
+    """
+    if start is None:
+        return ""
+    if end is None:
+        today = today or datetime.date.today()
+        end = today.year * 100 + today.month
+
+    start_year, start_month = split_date(start)
+    end_year, end_month = split_date(end)
+
+    # Whole years, if either date has no month
+    if start_month is None or end_month is None:
+        return _format_months(max(end_year - start_year, 1) * 12, locale)
+
+    months = (end_year - start_year) * 12 + end_month - start_month + 1
+    return _format_months(max(months, 1), locale)
+
+
+@functools.lru_cache(maxsize=4096)
+def format_range(
+    start: Optional[int], end: Optional[int] = None, locale: Optional[str] = None
+) -> str:
+    """Format the range between two dates, sharing the year when they have the same.
+
+    Args:
+        start (int, optional): the start date under the YYYYMM (or YYYY) format.
+        end (int, optional): the end date, None if ongoing. Defaults to None.
+        locale (str, optional): the locale. Defaults to None (DEFAULT_LOCALE).
+
+    Raises:
+        ValueError: if the month of a date is not between 1 and 12.
+
+    Returns:
+        str: the range, e.g. "January – March 2016" or "March 2016 – Ongoing".
+    """
+    if start is None:
+        return format_date(end, locale)
+
+    if end is not None:
+        start_year, start_month = split_date(start)
+        end_year, end_month = split_date(end)
+        if start_year == end_year:
+            if start_month is None or start_month == end_month:
+                return format_date(end, locale)
+            if end_month is not None:
+                start_label = get_locale(locale).months[start_month - 1]
+                return f"{start_label}{RANGE_SEPARATOR}{format_date(end, locale)}"
+
+    return f"{format_date(start, locale)}{RANGE_SEPARATOR}{format_date(end, locale)}"
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+pdf.py
+Author: Gilson, K.
+
+PDF export of the rendered resumes, by a pool of headless LibreOffice processes.
+
+Each worker converts one document at a time with a headless 'soffice
+--convert-to' process, on a user profile of its own kept between conversions.
+The pool bounds the number of concurrent conversions, while the batch goes on
+rendering. A conversion exceeding its timeout is killed, and its worker gets a
+new profile.
+
+LibreOffice must be installed locally: it is looked up on the PATH and in its
+default install folders, or set by the 'CV_BUILDER_SOFFICE' environment variable.
+
+Example:
+    with OfficePool(size=2) as pool:
+        pool.convert("output/resume.docx")  # output/resume.pdf
+"""
+
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Optional
+
+from . import timing
+from .batch import RenderResult
+
+# Default install folders of LibreOffice, when not on the PATH
+SOFFICE_PATHS = (
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+)
+
+
+def find_soffice() -> Optional[str]:
+    """Return the LibreOffice executable installed locally, if any.
+
+    Returns:
+        Optional[str]: the executable path, None if LibreOffice is not found.
+    """
+    soffice = os.environ.get("CV_BUILDER_SOFFICE")
+    if soffice:
+        return soffice
+
+    for name in ("soffice", "libreoffice"):
+        soffice = shutil.which(name)
+        if soffice:
+            return soffice
+
+    for soffice in SOFFICE_PATHS:
+        if os.path.isfile(soffice):
+            return soffice
+    return None
+
+
+class OfficeWorker(object):
+    """OfficeWorker: a LibreOffice user profile, converting one document at a time.
+
+    Each conversion runs its own headless 'soffice --convert-to' process: a
+    profile is never used by two processes at once, so that the conversion
+    neither waits on the lock of the profile nor is handed over to another
+    instance. The profile is kept between conversions, to only pay its creation
+    once, and created again after a conversion is killed.
+
+    Not thread-safe: an OfficePool hands each worker to one thread at a time.
+    """
+
+    def __init__(self, soffice: str) -> None:
+        """Initialize the OfficeWorker class instance.
+
+        Args:
+            soffice (str): the LibreOffice executable path.
+        """
+        self.soffice = soffice
+        self.restarts = 0
+        self.__profile_dir = tempfile.mkdtemp(prefix="cv_builder_office_")
+
+    def reset(self) -> None:
+        """Replace the user profile by a new one, e.g. after a killed conversion."""
+        shutil.rmtree(self.__profile_dir, ignore_errors=True)
+        self.__profile_dir = tempfile.mkdtemp(prefix="cv_builder_office_")
+        self.restarts += 1
+
+    def convert(self, source: str, pdf_path: str, timeout: float) -> str:
+        """Convert a document to PDF.
+
+        Args:
+            source (str): the document file path.
+            pdf_path (str): the file path to save the PDF to.
+            timeout (float): the maximum duration of the conversion, in seconds.
+
+        Raises:
+            TimeoutError: if the conversion exceeded the timeout, the profile being reset.
+            RuntimeError: if LibreOffice did not produce the PDF.
+
+        Returns:
+            str: the file path of the PDF.
+        """
+        # Converted into a folder of its own, as LibreOffice names the PDF after the document
+        with tempfile.TemporaryDirectory(prefix="cv_builder_pdf_") as output_dir:
+            process = subprocess.Popen(
+                [
+                    self.soffice,
+                    "-env:UserInstallation=" + _file_uri(self.__profile_dir),
+                    "--headless",
+                    "--invisible",
+                    "--nologo",
+                    "--nodefault",
+                    "--norestore",
+                    "--convert-to",
+                    "pdf",
+                    "--outdir",
+                    output_dir,
+                    os.path.abspath(source),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                **_new_process_group(),
+            )
+            try:
+                output, _ = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill(process)
+                process.communicate()
+                self.reset()
+                raise TimeoutError(
+                    f"The conversion exceeded {timeout:g} s, LibreOffice was stopped."
+                ) from None
+
+            stem = os.path.splitext(os.path.basename(source))[0]
+            converted = os.path.join(output_dir, f"{stem}.pdf")
+            if not os.path.isfile(converted):
+                message = output.decode(errors="replace").strip()
+                raise RuntimeError(
+                    f"LibreOffice did not convert the document: {message or 'no output'}"
+                )
+            shutil.move(converted, pdf_path)
+
+        return pdf_path
+
+    def close(self) -> None:
+        """Remove the user profile."""
+        shutil.rmtree(self.__profile_dir, ignore_errors=True)
+
+
+class OfficePool(object):
+    """OfficePool: a pool of OfficeWorker, shared by the threads of the process.
+
+    A conversion waits in line for an idle worker: the number of concurrent
+    conversions is bounded by the size of the pool.
+    """
+
+    def __init__(
+        self, size: int = 2, timeout: float = 120.0, soffice: Optional[str] = None
+    ) -> None:
+        """Initialize the OfficePool class instance.
+
+        Args:
+            size (int, optional): the number of concurrent conversions. Defaults to 2.
+            timeout (float, optional): the maximum duration of a conversion, in seconds. Defaults to 120.
+            soffice (str, optional): the LibreOffice executable path. Defaults to None (find_soffice).
+
+        Raises:
+            ValueError: if size is lower than 1.
+            FileNotFoundError: if LibreOffice is not found.
+        """
+        if size < 1:
+            raise ValueError("'size' should be at least 1.")
+
+        if soffice is None:
+            soffice = find_soffice()
+        if soffice is None:
+            raise FileNotFoundError(
+                "LibreOffice was not found: install it, or set CV_BUILDER_SOFFICE."
+            )
+
+        self.size = size
+        self.timeout = timeout
+        self.__workers: List[OfficeWorker] = []
+        self.__idle: "queue.Queue[OfficeWorker]" = queue.Queue()
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+        for _ in range(size):
+            worker = OfficeWorker(soffice)
+            self.__workers.append(worker)
+            self.__idle.put(worker)
+
+    def convert(
+        self,
+        source: str,
+        pdf_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> str:
+        """Convert a document to PDF, waiting for an idle worker first.
+
+        Args:
+            source (str): the document file path.
+            pdf_path (str, optional): the file path to save the PDF to.
+                Defaults to None (next to the document).
+            timeout (float, optional): the maximum duration of the conversion, in seconds.
+                Defaults to None (the timeout of the pool).
+
+        Raises:
+            RuntimeError: if the pool is closed.
+            TimeoutError: if the conversion exceeded the timeout.
+            RuntimeError: if LibreOffice did not produce the PDF.
+
+        Returns:
+            str: the file path of the PDF.
+        """
+        if pdf_path is None:
+            pdf_path = os.path.splitext(source)[0] + ".pdf"
+        if timeout is None:
+            timeout = self.timeout
+
+        worker = self.__idle.get()
+        try:
+            if self.__closed:
+                raise RuntimeError("The pool is closed.")
+            with timing.span("pdf"):
+                return worker.convert(source, pdf_path, timeout)
+        finally:
+            self.__idle.put(worker)
+
+    @property
+    def restarts(self) -> int:
+        """int: the number of conversions killed on timeout so far."""
+        return sum(worker.restarts for worker in self.__workers)
+
+    def close(self) -> None:
+        """Remove the profiles of the workers. The conversions still waiting fail."""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        for worker in self.__workers:
+            worker.close()
+
+    def __enter__(self) -> "OfficePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def convert_result(pool: OfficePool, result: RenderResult) -> RenderResult:
+    """Convert the rendered file of a result to PDF.
+
+    Args:
+        pool (OfficePool): the pool to convert with.
+        result (RenderResult): a successful rendering.
+
+    Returns:
+        RenderResult: the result with the PDF as output, or the error of the conversion.
+    """
+    start = time.perf_counter()
+    try:
+        pdf_path = pool.convert(result.output_path)
+    except Exception as err:
+        return result._replace(
+            output_path=None, error=f"PDF export: {type(err).__name__}: {err}"
+        )
+
+    if result.timings is not None:
+        result = result._replace(
+            timings={**result.timings, "pdf": time.perf_counter() - start}
+        )
+    return result._replace(output_path=pdf_path)
+
+
+def convert_results(
+    results: Iterable[RenderResult], pool: OfficePool
+) -> Iterator[RenderResult]:
+    """Convert the rendered files of a batch to PDF, while the batch goes on.
+
+    Args:
+        results (Iterable[RenderResult]): the outcome of each rendering.
+        pool (OfficePool): the pool to convert with.
+
+    Yields:
+        RenderResult: the outcome of each rendering and conversion, in order of completion.
+    """
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        pending = set()
+        for result in results:
+            if not result.ok:
+                yield result
+                continue
+
+            pending.add(executor.submit(convert_result, pool, result))
+            done = {future for future in pending if future.done()}
+            pending -= done
+            for future in done:
+                yield future.result()
+
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def _file_uri(path: str) -> str:
+    """Return the file URI of a folder, as expected by LibreOffice.
+
+    Args:
+        path (str): the folder path.
+
+    Returns:
+        str: the URI, e.g. "file:///tmp/profile".
+    """
+    path = os.path.abspath(path).replace("\\", "/")
+    return "file://" + ("" if path.startswith("/") else "/") + path
+
+
+def _new_process_group() -> dict:
+    """Return the Popen arguments starting a process in a group of its own.
+
+    The launcher of LibreOffice spawns the actual office process: killing the
+    group kills both.
+
+    Returns:
+        dict: the keyword arguments.
+    """
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _kill(process: subprocess.Popen) -> None:
+    """Kill a process started in a group of its own, and its children.
+
+    Args:
+        process (subprocess.Popen): the process.
+    """
+    try:
+        if os.name == "nt":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    process.wait()
@@ -0,0 +1,517 @@
+# -*- coding: utf-8 -*-
+"""
+pptx.py
+Author: Gilson, K.
+
+Rendering of PPTX templates: the Jinja tags of the slides and of their notes
+are filled from the context, as for DOCX templates.
+
+A PPTX file is a zip of XML parts, so the template is edited directly, without
+python-pptx: the slide parts are compiled once per template, every other part is
+copied as is. Each slide of the template is rendered once per context, so that
+a one-slide profile template renders a one-slide deck for an employee, or a
+team deck with a slide per employee. The slide sections of the template are
+dropped, as they list its slides.
+
+Within a text box, '{%p ... %}' replaces its whole paragraph, e.g. to repeat a
+paragraph per work, and '{%tr ... %}' its whole table row.
+"""
+
+import html
+import io
+import posixpath
+import re
+import zipfile
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import jinja2
+
+import cv
+from . import timing
+from .docx import RENDER_STEPS, Progress, build_context
+from .environment import compile_template
+from .locales import get_locale
+from .templates import TemplateCache
+
+PRESENTATION = "ppt/presentation.xml"
+PRESENTATION_RELS = "ppt/_rels/presentation.xml.rels"
+CONTENT_TYPES = "[Content_Types].xml"
+APP_PROPERTIES = "docProps/app.xml"
+
+RELATIONSHIPS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+SLIDE_TYPE = RELATIONSHIPS_NS + "/slide"
+NOTES_SLIDE_TYPE = RELATIONSHIPS_NS + "/notesSlide"
+SLIDE_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+)
+NOTES_SLIDE_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml"
+)
+
+_RELATIONSHIP = re.compile(r"<Relationship\b[^>]*?/>")
+_ATTRIBUTE = re.compile(r'([\w:]+)="([^"]*)"')
+_SLIDE_ID_LIST = re.compile(r"<(\w+:)?sldIdLst>(.*?)</\1?sldIdLst>", re.DOTALL)
+_SLIDE_ID = re.compile(r"<(?:\w+:)?sldId\b[^>]*?/>")
+_SECTION_LIST = re.compile(
+    r"<(?:\w+:)?ext\b[^>]*>(?:(?!</(?:\w+:)?ext>).)*?<(?:\w+:)?sectionLst\b.*?"
+    r"</(?:\w+:)?sectionLst>\s*</(?:\w+:)?ext>",
+    re.DOTALL,
+)
+_EMPTY_EXT_LIST = re.compile(r"<((?:\w+:)?extLst)>\s*</\1>")
+_SLIDE_COUNT = re.compile(r"<Slides>\d*</Slides>")
+_NOTES_COUNT = re.compile(r"<Notes>\d*</Notes>")
+_SLIDES_MARKER = "\x00slides\x00"
+_OVERRIDE = re.compile(r'<Override\b[^>]*?PartName="([^"]*)"[^>]*?/>')
+
+# Braces of a Jinja tag split across runs, e.g. "{</a:t></a:r><a:r><a:t>{"
+_SPLIT_BRACES = re.compile(r"(?<=\{)(?:<[^>]*>)+(?=[{%#])|(?<=[%}#])(?:<[^>]*>)+(?=\})")
+_JINJA_TAG = re.compile(r"\{%.*?%\}|\{\{.*?\}\}|\{#.*?#\}", re.DOTALL)
+_XML_TAG = re.compile(r"<[^>]*>")
+_PARAGRAPH_TAG = re.compile(r"<a:p>(?:(?!<a:p>).)*?\{%p (.*?)%\}.*?</a:p>", re.DOTALL)
+_ROW_TAG = re.compile(
+    r"<a:tr[ >](?:(?!<a:tr[ >]).)*?\{%tr (.*?)%\}.*?</a:tr>", re.DOTALL
+)
+
+# Typographic quotes, as typed by the autocorrect of PowerPoint
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+
+def patch_xml(xml: str) -> str:
+    """Turn the XML of a slide into a Jinja template source.
+
+    The runs and the XML escaping within the Jinja tags are removed, and the
+    paragraph and table row tags replace their paragraph or row.
+
+    Args:
+        xml (str): the XML of the slide.
+
+    Returns:
+        str: the template source.
+    """
+    xml = _SPLIT_BRACES.sub("", xml)
+    xml = _JINJA_TAG.sub(
+        lambda match: html.unescape(_XML_TAG.sub("", match.group(0))).translate(
+            _QUOTES
+        ),
+        xml,
+    )
+    xml = _PARAGRAPH_TAG.sub(r"{% \1 %}", xml)
+    return _ROW_TAG.sub(r"{% \1 %}", xml)
+
+
+def _relationships(rels_xml: str) -> List[Tuple[str, Dict[str, str]]]:
+    """Return the relationships of a relationships part.
+
+    Args:
+        rels_xml (str): the XML of the part.
+
+    Returns:
+        List[Tuple[str, Dict[str, str]]]: the XML element and the attributes of each relationship.
+    """
+    return [
+        (match.group(0), dict(_ATTRIBUTE.findall(match.group(0))))
+        for match in _RELATIONSHIP.finditer(rels_xml)
+    ]
+
+
+def _rels_path(part_name: str) -> str:
+    """Return the name of the relationships part of a part.
+
+    Args:
+        part_name (str): the name of the part, e.g. "ppt/slides/slide1.xml".
+
+    Returns:
+        str: the name of its relationships part, e.g. "ppt/slides/_rels/slide1.xml.rels".
+    """
+    folder, name = posixpath.split(part_name)
+    return posixpath.join(folder, "_rels", f"{name}.rels")
+
+
+def _resolve(part_name: str, target: str) -> str:
+    """Return the name of the part targeted by a relationship of a part.
+
+    Args:
+        part_name (str): the name of the source part.
+        target (str): the relative target of the relationship.
+
+    Returns:
+        str: the name of the targeted part.
+    """
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+
+class _Slide(NamedTuple):
+    """_Slide: a slide of a PPTX template, compiled once.
+
+    Attributes:
+        template (jinja2.Template): the compiled template of the slide.
+        rels (str): the XML of the relationships of the slide.
+        notes_target (str, optional): the target of the notes of the slide in rels.
+            None if the slide has no notes.
+        notes (jinja2.Template, optional): the compiled template of the notes.
+        notes_rels (str): the XML of the relationships of the notes.
+        slide_target (str): the target of the slide in notes_rels.
+    """
+
+    template: jinja2.Template
+    rels: str
+    notes_target: Optional[str] = None
+    notes: Optional[jinja2.Template] = None
+    notes_rels: str = ""
+    slide_target: str = ""
+
+
+class ParsedPptxTemplate(object):
+    """ParsedPptxTemplate: a PPTX template split into parts and compiled once.
+
+    Attributes:
+        digest (str): the SHA-256 hash of the file content.
+        slides (List[_Slide]): the compiled slides, in order.
+        parts (Dict[str, bytes]): the parts copied as is to every rendered deck.
+        presentation (str): the XML of the presentation, without its slide list
+            and its sections.
+        slide_id (str): the format of an element of the slide list.
+        presentation_rels (str): the XML of the relationships of the presentation,
+            without the slides.
+        content_types (str): the XML of the content types, without the slides and notes.
+        app_properties (str, optional): the XML of the application properties, counting
+            the slides and notes. None if the template has none.
+    """
+
+    def __init__(self, digest: str, data: bytes, jinja_env: jinja2.Environment) -> None:
+        """Initialize the ParsedPptxTemplate class instance.
+
+        Args:
+            digest (str): the SHA-256 hash of the file content.
+            data (bytes): the content of the file.
+            jinja_env (jinja2.Environment): the environment to compile the template with.
+
+        Raises:
+            ValueError: if the file is not a PPTX file, or has no slide.
+        """
+        self.digest = digest
+
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as pptx_file:
+                self.parts = {
+                    info.filename: pptx_file.read(info)
+                    for info in pptx_file.infolist()
+                    if not info.is_dir()
+                }
+        except zipfile.BadZipFile:
+            raise ValueError("The template is not a PPTX file.") from None
+        if PRESENTATION not in self.parts:
+            raise ValueError("The template is not a PPTX file.")
+
+        presentation = self.parts.pop(PRESENTATION).decode("utf-8")
+        presentation_rels = self.parts.pop(PRESENTATION_RELS).decode("utf-8")
+        content_types = self.parts.pop(CONTENT_TYPES).decode("utf-8")
+        app_properties = self.parts.pop(APP_PROPERTIES, None)
+        self.app_properties = (
+            None if app_properties is None else app_properties.decode("utf-8")
+        )
+
+        # The slides, in the order of the slide list of the presentation
+        slide_rels = {
+            attributes["Id"]: (element, attributes)
+            for element, attributes in _relationships(presentation_rels)
+            if attributes.get("Type") == SLIDE_TYPE
+        }
+        prefix = re.search(
+            rf'xmlns:(\w+)="{re.escape(RELATIONSHIPS_NS)}"', presentation
+        )
+        id_attribute = f"{prefix.group(1) if prefix else 'r'}:id"
+
+        # Only the slide list: the sections of the presentation have slide ids too
+        slide_list = _SLIDE_ID_LIST.search(presentation)
+        if slide_list is None:
+            raise ValueError("The template has no slide.")
+
+        removed_parts = set()
+        self.slides = []
+        for slide_id in _SLIDE_ID.findall(slide_list.group(2)):
+            rel_id = dict(_ATTRIBUTE.findall(slide_id)).get(id_attribute)
+            element, attributes = slide_rels[rel_id]
+            slide_name = _resolve(PRESENTATION, attributes["Target"])
+            self.slides.append(
+                self.__parse_slide(slide_name, digest, jinja_env, removed_parts)
+            )
+            presentation_rels = presentation_rels.replace(element, "")
+        if not self.slides:
+            raise ValueError("The template has no slide.")
+
+        # The slide list is rebuilt for each deck, with the same prefixes. The
+        # sections are dropped, as they list the slides of the template
+        start, end = slide_list.span(2)
+        presentation = presentation[:start] + _SLIDES_MARKER + presentation[end:]
+        self.presentation = _EMPTY_EXT_LIST.sub("", _SECTION_LIST.sub("", presentation))
+        self.slide_id = f'<{slide_list.group(1) or ""}sldId id="{{id}}" {id_attribute}="{{rel_id}}"/>'
+        self.presentation_rels = presentation_rels
+        self.content_types = _OVERRIDE.sub(
+            lambda match: ""
+            if match.group(1).lstrip("/") in removed_parts
+            else match.group(0),
+            content_types,
+        )
+        for part_name in removed_parts:
+            self.parts.pop(part_name, None)
+            self.parts.pop(_rels_path(part_name), None)
+
+    def __parse_slide(
+        self,
+        slide_name: str,
+        digest: str,
+        jinja_env: jinja2.Environment,
+        removed_parts: set,
+    ) -> _Slide:
+        """Compile a slide and its notes, and set their parts aside.
+
+        Args:
+            slide_name (str): the name of the slide part.
+            digest (str): the SHA-256 hash of the file content.
+            jinja_env (jinja2.Environment): the environment to compile the template with.
+            removed_parts (set): the names of the parts rendered instead of copied.
+
+        Returns:
+            _Slide: the compiled slide.
+        """
+        removed_parts.add(slide_name)
+        rels = self.parts.get(_rels_path(slide_name), b"").decode("utf-8")
+        template = self.__compile(slide_name, digest, jinja_env)
+
+        for _, attributes in _relationships(rels):
+            if attributes.get("Type") != NOTES_SLIDE_TYPE:
+                continue
+
+            notes_name = _resolve(slide_name, attributes["Target"])
+            removed_parts.add(notes_name)
+            notes_rels = self.parts.get(_rels_path(notes_name), b"").decode("utf-8")
+            slide_target = next(
+                (
+                    notes_attributes["Target"]
+                    for _, notes_attributes in _relationships(notes_rels)
+                    if notes_attributes.get("Type") == SLIDE_TYPE
+                ),
+                "",
+            )
+            return _Slide(
+                template,
+                rels,
+                attributes["Target"],
+                self.__compile(notes_name, digest, jinja_env),
+                notes_rels,
+                slide_target,
+            )
+
+        return _Slide(template, rels)
+
+    def __compile(
+        self, part_name: str, digest: str, jinja_env: jinja2.Environment
+    ) -> jinja2.Template:
+        """Patch the XML of a part and compile it into a Jinja template.
+
+        Args:
+            part_name (str): the name of the part.
+            digest (str): the SHA-256 hash of the file content.
+            jinja_env (jinja2.Environment): the environment to compile the template with.
+
+        Returns:
+            jinja2.Template: the compiled template.
+        """
+        xml = patch_xml(self.parts[part_name].decode("utf-8"))
+        return compile_template(xml, f"{digest}/{part_name}", jinja_env)
+
+    def render(self, contexts: Iterable[dict], output: Union[str, IO[bytes]]) -> int:
+        """Render every slide of the template once per context, into a new deck.
+
+        Args:
+            contexts (Iterable[dict]): the context of each repetition of the slides.
+            output (Union[str, IO[bytes]]): the file path or binary file to save the deck to.
+
+        Returns:
+            int: the number of slides of the deck.
+        """
+        slides = [
+            (number, slide, context)
+            for number, (context, slide) in enumerate(
+                ((context, slide) for context in contexts for slide in self.slides),
+                start=1,
+            )
+        ]
+
+        content_types = []
+        slide_ids = []
+        slide_rels = []
+        for number, slide, _ in slides:
+            content_types.append(
+                f'<Override PartName="/ppt/slides/slide{number}.xml" '
+                f'ContentType="{SLIDE_CONTENT_TYPE}"/>'
+            )
+            if slide.notes is not None:
+                content_types.append(
+                    f'<Override PartName="/ppt/notesSlides/notesSlide{number}.xml" '
+                    f'ContentType="{NOTES_SLIDE_CONTENT_TYPE}"/>'
+                )
+            slide_ids.append(
+                self.slide_id.format(id=255 + number, rel_id=f"rIdSlide{number}")
+            )
+            slide_rels.append(
+                f'<Relationship Id="rIdSlide{number}" Type="{SLIDE_TYPE}" '
+                f'Target="slides/slide{number}.xml"/>'
+            )
+
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as pptx_file:
+            pptx_file.writestr(
+                CONTENT_TYPES,
+                self.content_types.replace(
+                    "</Types>", "".join(content_types) + "</Types>"
+                ),
+            )
+            pptx_file.writestr(
+                PRESENTATION,
+                self.presentation.replace(_SLIDES_MARKER, "".join(slide_ids), 1),
+            )
+            pptx_file.writestr(
+                PRESENTATION_RELS,
+                self.presentation_rels.replace(
+                    "</Relationships>", "".join(slide_rels) + "</Relationships>"
+                ),
+            )
+            if self.app_properties is not None:
+                notes = sum(slide.notes is not None for _, slide, _ in slides)
+                app_properties = _SLIDE_COUNT.sub(
+                    f"<Slides>{len(slides)}</Slides>", self.app_properties
+                )
+                pptx_file.writestr(
+                    APP_PROPERTIES,
+                    _NOTES_COUNT.sub(f"<Notes>{notes}</Notes>", app_properties),
+                )
+            for part_name, data in self.parts.items():
+                pptx_file.writestr(part_name, data)
+
+            for number, slide, context in slides:
+                slide_name = f"ppt/slides/slide{number}.xml"
+                rels = slide.rels
+
+                if slide.notes is not None:
+                    notes_name = f"ppt/notesSlides/notesSlide{number}.xml"
+                    rels = rels.replace(
+                        f'Target="{slide.notes_target}"',
+                        f'Target="../notesSlides/notesSlide{number}.xml"',
+                    )
+                    pptx_file.writestr(notes_name, slide.notes.render(context))
+                    pptx_file.writestr(
+                        _rels_path(notes_name),
+                        slide.notes_rels.replace(
+                            f'Target="{slide.slide_target}"',
+                            f'Target="../slides/slide{number}.xml"',
+                        ),
+                    )
+
+                pptx_file.writestr(slide_name, slide.template.render(context))
+                if rels:
+                    pptx_file.writestr(_rels_path(slide_name), rels)
+
+        return len(slides)
+
+
+# Cache shared by every PPTX render of the current process
+pptx_template_cache = TemplateCache(parse=ParsedPptxTemplate)
+
+
+def render_slides(
+    contexts: Iterable[dict],
+    template_path: str,
+    save_path: Union[str, IO[bytes]],
+    progress: Optional[Progress] = None,
+    locale: Optional[str] = None,
+) -> Union[str, IO[bytes]]:
+    """Render the slides of a PPTX template once per context, and save the deck.
+
+    The template is parsed once per process, then served from the template cache.
+    The locale is passed to the template as the 'locale' variable, used by the
+    date filters.
+
+    Args:
+        contexts (Iterable[dict]): the context of each repetition of the slides.
+        template_path (str): the PPTX template file path.
+        save_path (Union[str, IO[bytes]]): the file path or binary file to save the rendered deck to.
+        progress (Progress, optional): called before each of the RENDER_STEPS. Defaults to None.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Raises:
+        ValueError: if the locale is not supported.
+        ValueError: if the template is not a PPTX file, or has no slide.
+
+    Returns:
+        Union[str, IO[bytes]]: the file path or binary file of the rendered deck.
+    """
+    get_locale(locale)
+    step_count = len(RENDER_STEPS)
+
+    if progress is not None:
+        progress(0, step_count, RENDER_STEPS[0])
+    with timing.span("template"):
+        parsed = pptx_template_cache.get(template_path)
+
+    # The slides are rendered while being written, straight into a binary file
+    if progress is not None:
+        progress(1, step_count, RENDER_STEPS[1])
+    with timing.span("render"):
+        buffer = io.BytesIO() if isinstance(save_path, str) else save_path
+        parsed.render((dict(context, locale=locale) for context in contexts), buffer)
+
+    if progress is not None:
+        progress(2, step_count, RENDER_STEPS[2])
+    with timing.span("save"):
+        if isinstance(save_path, str):
+            with open(save_path, "wb") as pptx_file:
+                pptx_file.write(buffer.getbuffer())
+
+    return save_path
+
+
+def render_pptx(
+    employee: cv.Employee,
+    template_path: str,
+    save_path: str,
+    progress: Optional[Progress] = None,
+    locale: Optional[str] = None,
+) -> str:
+    """Render a PPTX template for an employee and save it.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+        template_path (str): the PPTX template file path.
+        save_path (str): the file path to save the rendered deck to.
+        progress (Progress, optional): called before each of the RENDER_STEPS. Defaults to None.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Returns:
+        str: the file path of the rendered deck.
+    """
+    context = build_context(employee)
+    return render_slides([context], template_path, save_path, progress, locale)
+
+
+def render_deck(
+    employees: Iterable[cv.Employee],
+    template_path: str,
+    save_path: str,
+    progress: Optional[Progress] = None,
+    locale: Optional[str] = None,
+) -> str:
+    """Render the slides of a PPTX template for each employee, into a single team deck.
+
+    Args:
+        employees (Iterable[cv.Employee]): the employees to render, in order.
+        template_path (str): the PPTX template file path.
+        save_path (str): the file path to save the rendered deck to.
+        progress (Progress, optional): called before each of the RENDER_STEPS. Defaults to None.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+
+    Returns:
+        str: the file path of the rendered deck.
+    """
+    contexts = [build_context(employee) for employee in employees]
+    return render_slides(contexts, template_path, save_path, progress, locale)
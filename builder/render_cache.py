@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+"""
+render_cache.py
+Author: Gilson, K.
+
+Content-addressed cache of the rendered files, to skip the resumes unchanged
+since the last run.
+
+A rendered file is keyed by a hash of the template content, of the normalized
+context, of the locale, of the filters and library versions rendering it, and
+of the current month, as the duration of an ongoing work runs until today.
+The cache is a folder of files named after their key, shared by the processes
+of a batch. Once over its size limit, the least recently used files are evicted.
+
+Each process reads the size of the folder from disk, then only counts the files
+it stores, up to its share of the room left under the limit, before reading the
+size again with the files of the other processes.
+"""
+
+import datetime
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import docxtpl
+import jinja2
+
+from .environment import cache_dir, calling_digest, get_environment
+from .locales import DEFAULT_LOCALE, LOCALES
+
+# Bump to invalidate every cached file, e.g. when the rendering code changes
+CACHE_VERSION = "1"
+
+# Default size limit of the cache, in bytes
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Share of the size limit kept once full, leaving room for the next files
+EVICT_RATIO = 0.9
+
+# Shares of the room left under the size limit, one per process storing files:
+# up to this many processes cannot together store past the limit
+STORE_SHARES = max(os.cpu_count() or 1, 16)
+
+# Content hash of the templates, by path, mtime and size
+_template_digests: Dict[Tuple[str, int, int], str] = {}
+
+# Settings hash, by extension and registered filters
+_settings_digests: Dict[tuple, str] = {}
+
+# Size of each cache folder, as last read from disk plus the files stored since
+# by the current process, and the bytes it may store before reading it again
+_sizes: Dict[str, List[int]] = {}
+_lock = threading.Lock()
+
+
+def template_digest(template_path: str) -> str:
+    """Return the SHA-256 hash of a template file, read again only if it changed.
+
+    Args:
+        template_path (str): the template file path.
+
+    Returns:
+        str: the hash.
+    """
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+
+    digest = _template_digests.get(key)
+    if digest is None:
+        with open(path, "rb") as template_file:
+            digest = hashlib.sha256(template_file.read()).hexdigest()
+        _template_digests[key] = digest
+    return digest
+
+
+def settings_digest(extension: str) -> str:
+    """Return a hash of what renders a template besides its content and context.
+
+    That is the filters of the Jinja environment and how they are called, the
+    locale tables and the versions of the rendering libraries.
+
+    Args:
+        extension (str): the extension of the rendered file, "docx" or "pptx".
+
+    Returns:
+        str: the hash.
+    """
+    jinja_env = get_environment()
+    memo_key = (
+        extension,
+        tuple((name, id(function)) for name, function in jinja_env.filters.items()),
+    )
+    digest = _settings_digests.get(memo_key)
+    if digest is not None:
+        return digest
+
+    filters = sorted(
+        (
+            name,
+            getattr(function, "__module__", "") or "",
+            getattr(function, "__qualname__", "") or repr(function),
+            hashlib.sha1(function.__code__.co_code).hexdigest()
+            if hasattr(function, "__code__")
+            else "",
+        )
+        for name, function in jinja_env.filters.items()
+    )
+    settings = (
+        CACHE_VERSION,
+        extension,
+        jinja2.__version__,
+        docxtpl.__version__,
+        calling_digest(jinja_env),
+        filters,
+        sorted(LOCALES.items()),
+    )
+    digest = hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()
+    _settings_digests[memo_key] = digest
+    return digest
+
+
+def render_key(
+    template_path: str,
+    context: dict,
+    locale: Optional[str] = None,
+    extension: str = "docx",
+) -> str:
+    """Return the key of a rendered file, for the current month.
+
+    Args:
+        template_path (str): the template file path.
+        context (dict): the context, as returned by to_dict(keep_none=False).
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        extension (str, optional): the extension of the rendered file. Defaults to "docx".
+
+    Returns:
+        str: the key, a SHA-256 hash.
+    """
+    key = hashlib.sha256()
+    for part in (
+        template_digest(template_path),
+        settings_digest(extension),
+        locale or DEFAULT_LOCALE,
+        # format_duration counts an ongoing work up to the current month
+        datetime.date.today().strftime("%Y-%m"),
+    ):
+        key.update(part.encode("utf-8"))
+        key.update(b"\0")
+    key.update(
+        json.dumps(
+            context, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    )
+    return key.hexdigest()
+
+
+class RenderCache(object):
+    """RenderCache: a folder of rendered files, named after their key.
+
+    The modification time of a file is its last use, for the LRU eviction.
+    Instances only hold the folder and the size limit, so that they can be sent
+    to worker processes.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """Initialize the RenderCache class instance.
+
+        Args:
+            directory (str, optional): the cache folder. Defaults to None (the
+                'renders' folder of the application cache).
+            max_bytes (int, optional): the size limit of the cache, in bytes.
+                Defaults to DEFAULT_MAX_BYTES (512 MiB).
+
+        Raises:
+            ValueError: if max_bytes is negative.
+        """
+        if max_bytes < 0:
+            raise ValueError("'max_bytes' should be positive.")
+
+        self.directory = os.path.abspath(directory or cache_dir("renders"))
+        self.max_bytes = max_bytes
+
+    def path_for(self, key: str, extension: str = "docx") -> str:
+        """Return the path of the cached file of a key.
+
+        Args:
+            key (str): the key.
+            extension (str, optional): the extension of the file. Defaults to "docx".
+
+        Returns:
+            str: the file path, not necessarily existing.
+        """
+        return os.path.join(self.directory, key[:2], f"{key}.{extension}")
+
+    def fetch(self, key: str, save_path: str, extension: str = "docx") -> Optional[str]:
+        """Save the cached file of a key, if any, and mark it as recently used.
+
+        Args:
+            key (str): the key.
+            save_path (str): the file path to save the file to.
+            extension (str, optional): the extension of the file. Defaults to "docx".
+
+        Returns:
+            Optional[str]: "unchanged" if save_path already was the cached file,
+                "copied" if it was copied from the cache, None if not cached.
+        """
+        cached_path = self.path_for(key, extension)
+        try:
+            os.utime(cached_path)
+        except OSError:
+            return None
+
+        if os.path.isfile(save_path) and filecmp.cmp(
+            cached_path, save_path, shallow=False
+        ):
+            return "unchanged"
+
+        shutil.copyfile(cached_path, save_path)
+        return "copied"
+
+    def store(self, key: str, rendered_path: str, extension: str = "docx") -> None:
+        """Add a rendered file to the cache, evicting the least recently used ones if full.
+
+        Args:
+            key (str): the key.
+            rendered_path (str): the rendered file path.
+            extension (str, optional): the extension of the file. Defaults to "docx".
+        """
+        cached_path = self.path_for(key, extension)
+        folder = os.path.dirname(cached_path)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            # Written aside then moved, as other processes may read it meanwhile
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(rendered_path, tmp_path)
+            added = os.path.getsize(tmp_path)
+            if os.path.isfile(cached_path):
+                added -= os.path.getsize(cached_path)
+            os.replace(tmp_path, cached_path)
+        except OSError:
+            return
+
+        with _lock:
+            known = _sizes.get(self.directory)
+            if known is not None and added <= known[1]:
+                known[0] += added
+                known[1] -= added
+                return
+
+            # Over the share of this process: the others may have stored files too
+            size = self.size()
+            if size > self.max_bytes:
+                size = self.evict(int(self.max_bytes * EVICT_RATIO))
+            room = max(self.max_bytes - size, 0)
+            _sizes[self.directory] = [size, room // STORE_SHARES]
+
+    def __files(self) -> list:
+        """Return the cached files.
+
+        Returns:
+            list: the (last use, size, path) of each file.
+        """
+        files = []
+        if not os.path.isdir(self.directory):
+            return files
+
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                if entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return files
+
+    def size(self) -> int:
+        """Return the size of the cached files.
+
+        Returns:
+            int: the size, in bytes.
+        """
+        return sum(size for _, size, _ in self.__files())
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Remove the least recently used files until the cache fits a size.
+
+        Args:
+            max_bytes (int, optional): the size to fit, in bytes. Defaults to None (the size limit).
+
+        Returns:
+            int: the size of the remaining files, in bytes.
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        files = sorted(self.__files())
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in files:
+            if size <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+        return size
+
+    def clear(self) -> None:
+        """Remove every cached file."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        with _lock:
+            _sizes.pop(self.directory, None)
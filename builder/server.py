@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+server.py
+Author: Gilson, K.
+
+A small HTTP render service, to be run on localhost: a JSON resume is posted
+with the id of a template, the rendered file is sent back.
+
+The renderings are spread over a bounded pool of worker processes, each keeping
+the templates parsed and the Jinja environment warm between requests. Beyond
+the workers, a bounded number of requests wait in line; the others are refused
+with 503, so that a burst cannot pile up unbounded work.
+
+Endpoints:
+    GET  /health                the number of workers and of requests in progress.
+    GET  /templates             the ids of the templates, their file name without extension.
+    POST /render/<template id>  render the JSON resume of the body, in the locale
+                                of the optional '?locale=' parameter.
+
+Example:
+    curl --data-binary @examples/example.json -o resume.docx \\
+        "http://127.0.0.1:8080/render/example?locale=fr"
+"""
+
+import json
+import os
+import threading
+from concurrent import futures
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import cv
+from .batch import template_extension
+from .environment import get_environment
+from .inmemory import render_bytes
+from .locales import get_locale
+from .pptx import pptx_template_cache
+from .templates import template_cache
+
+# Extensions of the templates served
+TEMPLATE_EXTENSIONS = (".docx", ".pptx")
+
+# Maximum size of a posted resume, in bytes
+MAX_BODY_BYTES = 4 * 1024 * 1024
+
+CONTENT_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+
+class ServiceBusy(Exception):
+    """Raised when every worker is busy and the queue of requests is full."""
+
+
+def _warm_up(template_paths: Iterable[str]) -> None:
+    """Parse the templates in a new worker process, before its first rendering.
+
+    Args:
+        template_paths (Iterable[str]): the DOCX and PPTX template file paths.
+    """
+    get_environment()
+    for template_path in template_paths:
+        try:
+            if template_extension(template_path) == "pptx":
+                pptx_template_cache.get(template_path)
+            else:
+                template_cache.get(template_path)
+        except Exception:
+            # Reported by the requests rendering it, if any
+            pass
+
+
+def _render(json_obj: dict, template_path: str, locale: Optional[str]) -> bytes:
+    """Render a decoded JSON resume in a worker process.
+
+    Args:
+        json_obj (dict): the decoded JSON resume.
+        template_path (str): the DOCX or PPTX template file path.
+        locale (str, optional): the locale of the dates.
+
+    Returns:
+        bytes: the rendered file.
+    """
+    return render_bytes(json_obj, template_path, locale).getvalue()
+
+
+class RenderService(object):
+    """RenderService: a pool of warm worker processes, behind a bounded queue."""
+
+    def __init__(
+        self,
+        templates_dir: str,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        timeout: float = 60.0,
+    ) -> None:
+        """Initialize the RenderService class instance, starting its workers.
+
+        Args:
+            templates_dir (str): the folder of DOCX and PPTX templates.
+            workers (int, optional): the number of worker processes. Defaults to None (one per CPU).
+            queue_size (int, optional): the number of requests waiting for a worker, at most.
+                Defaults to None (4 per worker).
+            timeout (float, optional): the maximum time to wait for a rendering, in seconds.
+                Defaults to 60.
+
+        Raises:
+            ValueError: if workers is lower than 1, or queue_size negative.
+            FileNotFoundError: if the templates folder does not exist.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("'workers' should be at least 1.")
+        if queue_size is None:
+            queue_size = 4 * workers
+        if queue_size < 0:
+            raise ValueError("'queue_size' should be positive.")
+        if not os.path.isdir(templates_dir):
+            raise FileNotFoundError(f"No folder '{templates_dir}'.")
+
+        self.templates_dir = templates_dir
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+
+        self.__slots = threading.BoundedSemaphore(workers + queue_size)
+        self.__lock = threading.Lock()
+        self.__in_progress = 0
+        self.__executor = futures.ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_warm_up,
+            initargs=(list(self.templates().values()),),
+        )
+        # Start the workers now rather than on the first request
+        self.__executor.submit(os.getpid).result()
+
+    def templates(self) -> Dict[str, str]:
+        """Return the templates served, as found in the templates folder right now.
+
+        Returns:
+            Dict[str, str]: the file path of each template, by id.
+        """
+        templates = {}
+        for name in sorted(os.listdir(self.templates_dir)):
+            template_id, extension = os.path.splitext(name)
+            if extension.lower() in TEMPLATE_EXTENSIONS and not name.startswith(
+                (".", "~$")
+            ):
+                templates.setdefault(
+                    template_id, os.path.join(self.templates_dir, name)
+                )
+        return templates
+
+    @property
+    def in_progress(self) -> int:
+        """int: the number of requests rendering or waiting for a worker, timed out ones included."""
+        return self.__in_progress
+
+    def render(
+        self, json_obj: dict, template_path: str, locale: Optional[str] = None
+    ) -> bytes:
+        """Render a decoded JSON resume on a worker, waiting in line if they are all busy.
+
+        A rendering keeps its place in the pool until it ends, even past its
+        timeout, as a running rendering cannot be cancelled.
+
+        Args:
+            json_obj (dict): the decoded JSON resume.
+            template_path (str): the DOCX or PPTX template file path.
+            locale (str, optional): the locale of the dates. Defaults to None (English).
+
+        Raises:
+            ServiceBusy: if the queue of requests is full.
+            TimeoutError: if the rendering did not complete within the timeout.
+
+        Returns:
+            bytes: the rendered file.
+        """
+        if not self.__slots.acquire(blocking=False):
+            raise ServiceBusy(
+                f"{self.workers + self.queue_size} requests are already in progress."
+            )
+
+        with self.__lock:
+            self.__in_progress += 1
+        try:
+            future = self.__executor.submit(_render, json_obj, template_path, locale)
+        except BaseException:
+            self.__release()
+            raise
+        future.add_done_callback(self.__release)
+
+        try:
+            return future.result(self.timeout)
+        except futures.TimeoutError:
+            # Only cancelled if still waiting for a worker
+            future.cancel()
+            raise TimeoutError(f"The rendering exceeded {self.timeout:g} s.") from None
+
+    def __release(self, future: Optional[futures.Future] = None) -> None:
+        """Give back the place of a request in the pool, once its rendering ended.
+
+        Args:
+            future (futures.Future, optional): the rendering. Defaults to None (not submitted).
+        """
+        with self.__lock:
+            self.__in_progress -= 1
+        self.__slots.release()
+
+    def close(self) -> None:
+        """Stop the workers, once the renderings in progress are done."""
+        self.__executor.shutdown(wait=True)
+
+    def __enter__(self) -> "RenderService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """RenderRequestHandler: the endpoints of a RenderService, one thread per request."""
+
+    server_version = "cv_builder"
+    protocol_version = "HTTP/1.1"
+
+    # Set by make_server
+    service: RenderService
+    quiet = False
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self.send_json(
+                HTTPStatus.OK,
+                {
+                    "status": "ok",
+                    "workers": self.service.workers,
+                    "queue_size": self.service.queue_size,
+                    "in_progress": self.service.in_progress,
+                },
+            )
+        elif path == "/templates":
+            self.send_json(HTTPStatus.OK, {"templates": list(self.service.templates())})
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No endpoint '{path}'.")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if not url.path.startswith("/render/"):
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No endpoint '{url.path}'.")
+            return
+
+        # Read the body first, so that the connection can be kept alive on errors
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self.send_error_json(
+                HTTPStatus.LENGTH_REQUIRED, "Expect a Content-Length header."
+            )
+            return
+        if length < 0:
+            self.close_connection = True
+            self.send_error_json(
+                HTTPStatus.BAD_REQUEST, "Expect a positive Content-Length header."
+            )
+            return
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self.send_error_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Expect a resume of at most {MAX_BODY_BYTES} bytes.",
+            )
+            return
+        body = self.rfile.read(length)
+
+        template_id = url.path[len("/render/") :]
+        template_path = self.service.templates().get(template_id)
+        if template_path is None:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"No template '{template_id}'.")
+            return
+
+        locale = parse_qs(url.query).get("locale", [None])[0]
+        try:
+            get_locale(locale)
+        except ValueError as err:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, str(err))
+            return
+
+        try:
+            json_obj = json.loads(body)
+        except ValueError as err:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {err}")
+            return
+        violations = cv.validate_document(json_obj)
+        if violations:
+            self.send_json(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                {
+                    "error": "The resume does not match the data model.",
+                    "violations": [str(violation) for violation in violations],
+                },
+            )
+            return
+
+        try:
+            data = self.service.render(json_obj, template_path, locale)
+        except ServiceBusy as err:
+            self.send_error_json(
+                HTTPStatus.SERVICE_UNAVAILABLE, str(err), {"Retry-After": "1"}
+            )
+            return
+        except TimeoutError as err:
+            self.send_error_json(HTTPStatus.GATEWAY_TIMEOUT, str(err))
+            return
+        except Exception as err:
+            self.send_error_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(err).__name__}: {err}"
+            )
+            return
+
+        extension = template_extension(template_path)
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", CONTENT_TYPES[extension])
+        self.send_header(
+            "Content-Disposition", f'attachment; filename="resume.{extension}"'
+        )
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(
+        self, status: HTTPStatus, obj: dict, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Send a JSON response.
+
+        Args:
+            status (HTTPStatus): the status of the response.
+            obj (dict): the body of the response.
+            headers (Dict[str, str], optional): extra headers. Defaults to None.
+        """
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_error_json(
+        self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Send an error as a JSON response, e.g. {"error": "No template 'x'."}.
+
+        Args:
+            status (HTTPStatus): the status of the response.
+            message (str): the description of the error.
+            headers (Dict[str, str], optional): extra headers. Defaults to None.
+        """
+        self.send_json(status, {"error": message}, headers)
+
+    def log_message(self, format: str, *args) -> None:
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(
+    service: RenderService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    quiet: bool = False,
+) -> ThreadingHTTPServer:
+    """Return an HTTP server for a render service, to be started by serve_forever.
+
+    Args:
+        service (RenderService): the render service.
+        host (str, optional): the address to listen on. Defaults to "127.0.0.1" (local only).
+        port (int, optional): the port to listen on, 0 for any free port. Defaults to 8080.
+        quiet (bool, optional): whether to log the requests or not. Defaults to False.
+
+    Returns:
+        ThreadingHTTPServer: the server, bound to the address.
+    """
+    handler = type(
+        "Handler", (RenderRequestHandler,), {"service": service, "quiet": quiet}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+templates.py
+Author: Gilson, K.
+"""
+
+import copy
+import hashlib
+import io
+import os
+import threading
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import jinja2
+from docxtpl import DocxTemplate
+
+from .environment import compile_template, get_environment
+
+
+class ParsedDocxTemplate(object):
+    """ParsedDocxTemplate: a DOCX template preprocessed and compiled once.
+
+    Attributes:
+        digest (str): the SHA-256 hash of the file content.
+        data (bytes): the content of the file.
+        document (docx.document.Document): the parsed document, never rendered, copied by each render.
+        body (jinja2.Template): the compiled template of the document body.
+        headers_footers (Dict[str, List[Tuple[str, jinja2.Template, str]]]): the
+            (relationship id, compiled template, encoding) of each header and footer, by URI.
+    """
+
+    def __init__(self, digest: str, data: bytes, jinja_env: jinja2.Environment) -> None:
+        """Initialize the ParsedDocxTemplate class instance.
+
+        Args:
+            digest (str): the SHA-256 hash of the file content.
+            data (bytes): the content of the file.
+            jinja_env (jinja2.Environment): the environment to compile the template with.
+        """
+        self.digest = digest
+        self.data = data
+
+        # Same preprocessing as DocxTemplate.build_xml, done only once
+        docx_tpl = DocxTemplate(io.BytesIO(data))
+        self.document = docx_tpl.docx
+        self.body = self.__compile(
+            docx_tpl, docx_tpl.get_xml(), f"{digest}/body", jinja_env
+        )
+
+        self.headers_footers = {}
+        for uri in (DocxTemplate.HEADER_URI, DocxTemplate.FOOTER_URI):
+            self.headers_footers[uri] = []
+            for rel_key, part in docx_tpl.get_headers_footers(uri):
+                xml = docx_tpl.get_part_xml(part)
+                encoding = docx_tpl.get_headers_footers_encoding(xml)
+                self.headers_footers[uri].append(
+                    (
+                        rel_key,
+                        self.__compile(docx_tpl, xml, f"{digest}/{rel_key}", jinja_env),
+                        encoding,
+                    )
+                )
+
+    @staticmethod
+    def __compile(
+        docx_tpl: DocxTemplate, xml: str, name: str, jinja_env: jinja2.Environment
+    ) -> jinja2.Template:
+        """Clean a XML part and compile it into a Jinja template.
+
+        Args:
+            docx_tpl (DocxTemplate): the template the XML part belongs to.
+            xml (str): the raw XML part.
+            name (str): the name of the part, used as bytecode cache key.
+            jinja_env (jinja2.Environment): the environment to compile the template with.
+
+        Returns:
+            jinja2.Template: the compiled template.
+        """
+        xml = docx_tpl.patch_xml(xml).replace(r"<w:p>", "\n<w:p>")
+        return compile_template(xml, name, jinja_env)
+
+    def new_document(self) -> "CachedDocxTemplate":
+        """Return a fresh document to render, sharing the compiled templates.
+
+        Returns:
+            CachedDocxTemplate: a document ready to be rendered once.
+        """
+        return CachedDocxTemplate(self)
+
+
+class CachedDocxTemplate(DocxTemplate):
+    """CachedDocxTemplate: inherit from 'docxtpl.DocxTemplate'.
+
+    Render the compiled templates of a ParsedDocxTemplate instead of patching
+    and compiling the XML of the document again, into a copy of its parsed
+    document instead of unzipping and parsing the file again.
+    """
+
+    def __init__(self, parsed: ParsedDocxTemplate) -> None:
+        """Initialize the CachedDocxTemplate class instance.
+
+        Args:
+            parsed (ParsedDocxTemplate): the parsed template to render.
+        """
+        # As DocxTemplate.__init__, without parsing the file again
+        self.docx = copy.deepcopy(parsed.document)
+        self.crc_to_new_media = {}
+        self.crc_to_new_embedded = {}
+        self.zipname_to_replace = {}
+        self.pics_to_replace = {}
+        self.pic_map = {}
+        self.current_rendering_part = None
+        self.docx_ids_index = 1000
+        self.parsed = parsed
+
+    def __render_compiled(
+        self, template: jinja2.Template, part: Any, context: dict
+    ) -> str:
+        """Render a compiled XML part, as DocxTemplate.render_xml_part does.
+
+        Args:
+            template (jinja2.Template): the compiled template of the part.
+            part (Any): the document part being rendered.
+            context (dict): the context of the template.
+
+        Returns:
+            str: the rendered XML part.
+        """
+        self.current_rendering_part = part
+        dst_xml = template.render(context)
+        dst_xml = dst_xml.replace("\n<w:p>", "<w:p>")
+        dst_xml = (
+            dst_xml.replace("{_{", "{{")
+            .replace("}_}", "}}")
+            .replace("{_%", "{%")
+            .replace("%_}", "%}")
+        )
+        return self.resolve_listing(dst_xml)
+
+    def build_xml(
+        self, context: dict, jinja_env: Optional[jinja2.Environment] = None
+    ) -> str:
+        """Render the body of the document from its compiled template."""
+        return self.__render_compiled(self.parsed.body, self.docx._part, context)
+
+    def build_headers_footers_xml(
+        self, context: dict, uri: str, jinja_env: Optional[jinja2.Environment] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Render the headers or footers of the document from their compiled templates."""
+        for rel_key, template, encoding in self.parsed.headers_footers[uri]:
+            part = self.docx._part._rels[rel_key].target_part
+            xml = self.__render_compiled(template, part, context)
+            yield rel_key, xml.encode(encoding)
+
+
+class TemplateCache(object):
+    """TemplateCache: parsed templates, keyed by path, mtime and content hash.
+
+    A file whose mtime changed is read and hashed again, but only parsed if its
+    content changed. Files sharing the same content share the same parsed template.
+    """
+
+    def __init__(
+        self,
+        jinja_env: Optional[jinja2.Environment] = None,
+        parse: Callable[[str, bytes, jinja2.Environment], Any] = ParsedDocxTemplate,
+    ) -> None:
+        """Initialize the TemplateCache class instance.
+
+        Args:
+            jinja_env (jinja2.Environment, optional): the environment to compile the templates with.
+                Defaults to None (the shared environment).
+            parse (Callable[[str, bytes, jinja2.Environment], Any], optional): parse a file from
+                its digest, content and environment. Defaults to ParsedDocxTemplate.
+        """
+        if jinja_env is None:
+            jinja_env = get_environment()
+
+        self.jinja_env = jinja_env
+        self.parse = parse
+        self.__by_path = {}
+        self.__by_digest = {}
+        self.__lock = threading.Lock()
+
+    def get(self, path: str) -> Any:
+        """Return the parsed template of a file, parsing it only if it changed.
+
+        Args:
+            path (str): the template file path.
+
+        Raises:
+            TypeError: if path is not a str.
+
+        Returns:
+            Any: the parsed template, a ParsedDocxTemplate by default.
+        """
+        if not isinstance(path, str):
+            raise TypeError("'path' expect a str.")
+
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self.__lock:
+            cached_mtime, parsed = self.__by_path.get(path, (None, None))
+            if parsed is not None and cached_mtime == mtime:
+                return parsed
+
+            # Modified, or never seen: compare the content before parsing it again
+            with open(path, "rb") as docx_file:
+                data = docx_file.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            if digest not in self.__by_digest:
+                self.__by_digest[digest] = self.parse(digest, data, self.jinja_env)
+            self.__by_path[path] = (mtime, self.__by_digest[digest])
+
+            # Forget the previous content if no other path uses it anymore
+            if parsed is not None and parsed.digest != digest:
+                if all(p is not parsed for _, p in self.__by_path.values()):
+                    del self.__by_digest[parsed.digest]
+
+            return self.__by_digest[digest]
+
+    def new_document(self, path: str) -> CachedDocxTemplate:
+        """Return a fresh document to render from a DOCX template file.
+
+        Args:
+            path (str): the DOCX template file path.
+
+        Returns:
+            CachedDocxTemplate: a document ready to be rendered once.
+        """
+        return self.get(path).new_document()
+
+    def clear(self) -> None:
+        """Remove every parsed template from the cache."""
+        with self.__lock:
+            self.__by_path.clear()
+            self.__by_digest.clear()
+
+
+# Cache shared by every render of the current process
+template_cache = TemplateCache()
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+timing.py
+Author: Gilson, K.
+
+Named timing spans around the stages of a build, reported to pluggable sinks.
+
+A span only measures anything while at least one sink is registered: otherwise
+'span' returns a shared context manager doing nothing.
+
+Example:
+    with timing.collect() as collector:
+        render_docx(employee, template_path, save_path)
+    print(timing.format_breakdown(collector.totals()))
+"""
+
+import contextlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import (
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# A sink receives the name of each span and its duration, in seconds
+Sink = Callable[[str, float], None]
+
+# Registered sinks, shared by every thread of the process
+_sinks: List[Sink] = []
+
+
+class _NullSpan:
+    """Context manager doing nothing, returned while no sink is registered."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager measuring a stage and reporting it to the sinks."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        duration = time.perf_counter() - self.start
+        for sink in tuple(_sinks):
+            sink(self.name, duration)
+
+
+def span(name: str) -> ContextManager[None]:
+    """Return a context manager timing a stage of the build.
+
+    Args:
+        name (str): the name of the stage.
+
+    Returns:
+        ContextManager[None]: the context manager, doing nothing if no sink is registered.
+    """
+    if not _sinks:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def add_sink(sink: Sink) -> Sink:
+    """Register a sink, to receive every span of the process.
+
+    Args:
+        sink (Sink): the sink.
+
+    Returns:
+        Sink: the sink itself.
+    """
+    _sinks.append(sink)
+    return sink
+
+
+def remove_sink(sink: Sink) -> None:
+    """Unregister a sink.
+
+    Args:
+        sink (Sink): the sink.
+
+    Raises:
+        ValueError: if the sink is not registered.
+    """
+    _sinks.remove(sink)
+
+
+class Collector:
+    """Collector: sink keeping the spans in memory."""
+
+    def __init__(self) -> None:
+        """Initialize the Collector class instance."""
+        self.spans: List[Tuple[str, float]] = []
+
+    def __call__(self, name: str, duration: float) -> None:
+        """Receive a span.
+
+        Args:
+            name (str): the name of the stage.
+            duration (float): its duration, in seconds.
+        """
+        self.spans.append((name, duration))
+
+    def totals(self) -> Dict[str, float]:
+        """Return the total duration of each stage, in order of first occurrence.
+
+        Returns:
+            Dict[str, float]: the durations, in seconds, by stage.
+        """
+        totals = {}
+        for name, duration in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        return totals
+
+    def clear(self) -> None:
+        """Forget the spans collected so far."""
+        self.spans.clear()
+
+
+class LoggerSink:
+    """LoggerSink: sink logging each span."""
+
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG
+    ) -> None:
+        """Initialize the LoggerSink class instance.
+
+        Args:
+            logger (logging.Logger, optional): the logger. Defaults to None (the 'builder.timing' logger).
+            level (int, optional): the level of the messages. Defaults to logging.DEBUG.
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, name: str, duration: float) -> None:
+        """Receive a span.
+
+        Args:
+            name (str): the name of the stage.
+            duration (float): its duration, in seconds.
+        """
+        self.logger.log(self.level, "%s took %.3f ms", name, duration * 1000)
+
+
+class JSONLinesSink:
+    """JSONLinesSink: sink appending each span to a JSON Lines file."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize the JSONLinesSink class instance.
+
+        Args:
+            path (str): the file to append to.
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+
+    def __call__(self, name: str, duration: float) -> None:
+        """Receive a span.
+
+        Args:
+            name (str): the name of the stage.
+            duration (float): its duration, in seconds.
+        """
+        line = json.dumps(
+            {
+                "span": name,
+                "ms": duration * 1000,
+                "time": time.time(),
+                "pid": os.getpid(),
+                "thread": threading.current_thread().name,
+            }
+        )
+        with self.__lock, open(self.path, "a", encoding="utf-8") as json_file:
+            json_file.write(line + "\n")
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[Collector]:
+    """Collect the spans of the process within a 'with' block.
+
+    Yields:
+        Collector: the collector, registered until the end of the block.
+    """
+    collector = add_sink(Collector())
+    try:
+        yield collector
+    finally:
+        remove_sink(collector)
+
+
+def format_breakdown(totals: Dict[str, float], separator: str = " | ") -> str:
+    """Format the durations of the stages of a build.
+
+    Args:
+        totals (Dict[str, float]): the durations, in seconds, by stage.
+        separator (str, optional): the separator of the stages. Defaults to " | ".
+
+    Returns:
+        str: the breakdown, e.g. "load 0.512 ms | render 9.871 ms | total 10.383 ms".
+    """
+    parts = [f"{name} {duration * 1000:.3f} ms" for name, duration in totals.items()]
+    parts.append(f"total {sum(totals.values()) * 1000:.3f} ms")
+    return separator.join(parts)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+variants.py
+Author: Gilson, K.
+
+Rendering of the same resume against several (template, locale) pairs, from a
+single load and a single context.
+
+The renderers are imported on the first call, docxtpl being most of the import
+time of the builder package.
+"""
+
+import os
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+
+import cv
+from . import timing
+from .batch import RenderResult, render_template, run_tasks, template_extension
+from .locales import DEFAULT_LOCALE, get_locale
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+
+# Default name of the rendered variants, without extension
+VARIANT_PATTERN = "{stem}_{template}_{locale}"
+
+
+def variant_output_path_for(
+    pattern: str,
+    output_dir: str,
+    employee: cv.Employee,
+    stem: str,
+    template_path: str,
+    locale: Optional[str],
+    extension: str = "docx",
+) -> str:
+    """Return the output file path of a variant, named by a pattern.
+
+    Args:
+        pattern (str): the file name, without extension, with any of the {stem},
+            {template}, {locale}, {lastname} and {firstname} placeholders.
+        output_dir (str): the folder to render into.
+        employee (cv.Employee): the employee to render.
+        stem (str): the name of the resume, e.g. its JSON file name without extension.
+        template_path (str): the DOCX or PPTX template file path.
+        locale (str, optional): the locale of the dates.
+        extension (str, optional): the extension of the output file. Defaults to "docx".
+
+    Raises:
+        ValueError: if the pattern has an unknown placeholder.
+
+    Returns:
+        str: the output file path.
+    """
+    fields = {
+        "stem": stem,
+        "template": os.path.splitext(os.path.basename(template_path))[0],
+        "locale": locale or DEFAULT_LOCALE,
+        "lastname": employee.lastname or "",
+        "firstname": employee.firstname or "",
+    }
+    fields = {
+        key: "".join(char if char.isalnum() or char in "-_" else "_" for char in value)
+        for key, value in fields.items()
+    }
+
+    try:
+        name = pattern.format(**fields)
+    except (KeyError, IndexError) as err:
+        raise ValueError(
+            f"'pattern' has an unknown placeholder {err}, expect {', '.join(fields)}."
+        ) from None
+
+    return os.path.join(output_dir, f"{name}.{extension}")
+
+
+def render_variant(
+    context: dict,
+    source: str,
+    template_path: str,
+    save_path: str,
+    locale: Optional[str] = None,
+    cache: Optional["RenderCache"] = None,
+) -> RenderResult:
+    """Render a context against a DOCX or PPTX template, in a locale.
+
+    Args:
+        context (dict): the context to pass to the template.
+        source (str): where the context comes from, reported in the result.
+        template_path (str): the DOCX or PPTX template file path.
+        save_path (str): the file path to save the rendered resume to.
+        locale (str, optional): the locale of the dates. Defaults to None (English).
+        cache (RenderCache, optional): the render cache. Defaults to None (always render).
+
+    Returns:
+        RenderResult: the outcome of the rendering.
+    """
+    try:
+        status = render_template(context, template_path, save_path, locale, cache)
+    except Exception as err:
+        return RenderResult(source, error=f"{type(err).__name__}: {err}")
+
+    return RenderResult(source, output_path=save_path, cache=status)
+
+
+def render_variants(
+    employee: cv.Employee,
+    variants: Iterable[Tuple[str, Optional[str]]],
+    output_dir: str,
+    stem: str,
+    pattern: str = VARIANT_PATTERN,
+    workers: Optional[int] = None,
+    timed: bool = False,
+    cache: Optional["RenderCache"] = None,
+) -> Iterator[RenderResult]:
+    """Render an employee against several (template, locale) pairs across a pool of processes.
+
+    The context is built once, then shared by every variant. The variants are
+    checked before any is rendered, the renderings start when iterating the results.
+
+    Args:
+        employee (cv.Employee): the employee to render.
+        variants (Iterable[Tuple[str, Optional[str]]]): the DOCX or PPTX template file
+            path and the locale of each variant.
+        output_dir (str): the folder to render into.
+        stem (str): the name of the resume, for the {stem} placeholder of the pattern.
+        pattern (str, optional): the name of the output files, see variant_output_path_for.
+            Defaults to VARIANT_PATTERN.
+        workers (int, optional): the number of worker processes. Defaults to None (one per variant, up to one per CPU).
+        timed (bool, optional): whether to time the stages of each rendering or not. Defaults to False.
+        cache (RenderCache, optional): the render cache, to skip the variants unchanged
+            since the last run. Defaults to None (always render).
+
+    Raises:
+        ValueError: if workers is lower than 1.
+        ValueError: if a locale is not supported.
+        ValueError: if the pattern has an unknown placeholder.
+        ValueError: if two variants have the same output file path.
+
+    Returns:
+        Iterator[RenderResult]: the outcome of each rendering, in order of completion.
+    """
+    from .docx import build_context
+
+    if workers is not None and workers < 1:
+        raise ValueError("'workers' should be at least 1.")
+
+    # Check every variant before rendering any
+    tasks: List[tuple] = []
+    save_paths = set()
+    for template_path, locale in variants:
+        get_locale(locale)
+        save_path = variant_output_path_for(
+            pattern,
+            output_dir,
+            employee,
+            stem,
+            template_path,
+            locale,
+            template_extension(template_path),
+        )
+        if save_path in save_paths:
+            raise ValueError(
+                f"Two variants would be saved as '{save_path}': "
+                "add {template} or {locale} to the pattern."
+            )
+        save_paths.add(save_path)
+
+        source = (
+            f"{stem} ({os.path.basename(template_path)}, {locale or DEFAULT_LOCALE})"
+        )
+        tasks.append((source, template_path, save_path, locale, cache))
+
+    if workers is None:
+        workers = min(len(tasks), os.cpu_count() or 1) or 1
+
+    with timing.span("context"):
+        context = build_context(employee)
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(context, *task) for task in tasks]
+    return run_tasks(render_variant, tasks, workers, timed)
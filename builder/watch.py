@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+watch.py
+Author: Gilson, K.
+
+Watch mode: a folder of JSON resumes and a folder of templates are polled, and
+only the outputs affected by a change are rendered again.
+
+Every resume is rendered against every template: there is no mapping of a
+resume to the templates it uses, so a changed template renders again all the
+resumes, against this template only. A changed resume is loaded and rendered
+again against each template. The employees, their contexts and the parsed
+templates stay in memory between changes.
+
+builder.docx, and docxtpl with it, is imported by the first resume loaded rather
+than with the CLI.
+"""
+
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import cv
+from . import timing
+from .batch import RenderResult, template_extension
+from .locales import get_locale
+from .variants import render_variant, variant_output_path_for
+
+if TYPE_CHECKING:
+    from .render_cache import RenderCache
+
+# Default name of the rendered files, without extension
+WATCH_PATTERN = "{stem}_{template}"
+
+# A file signature changes whenever the file is written
+Signature = Tuple[int, int]
+
+
+def scan(folder: str, extensions: Tuple[str, ...]) -> Dict[str, Signature]:
+    """Return the signature of the files of a folder with some extensions.
+
+    Hidden files and the lock files of Office ("~$...") are ignored.
+
+    Args:
+        folder (str): the folder.
+        extensions (Tuple[str, ...]): the extensions, lowercase, e.g. (".json",).
+
+    Returns:
+        Dict[str, Signature]: the (mtime, size) of each file, by path.
+    """
+    signatures = {}
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return signatures
+
+    for entry in entries:
+        if entry.name.startswith((".", "~$")):
+            continue
+        if not entry.name.lower().endswith(extensions):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if entry.is_file():
+            signatures[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return signatures
+
+
+class Watcher(object):
+    """Watcher: render again the outputs affected by the changes of two folders.
+
+    Attributes:
+        employees (Dict[str, cv.Employee]): the resumes loaded, by JSON file path.
+    """
+
+    def __init__(
+        self,
+        resumes_dir: str,
+        templates_dir: str,
+        output_dir: str,
+        locale: Optional[str] = None,
+        pattern: str = WATCH_PATTERN,
+        json_encoding: str = "utf-8",
+        cache: Optional["RenderCache"] = None,
+    ) -> None:
+        """Initialize the Watcher class instance.
+
+        Args:
+            resumes_dir (str): the folder of JSON resumes.
+            templates_dir (str): the folder of DOCX and PPTX templates.
+            output_dir (str): the folder to render into.
+            locale (str, optional): the locale of the dates. Defaults to None (English).
+            pattern (str, optional): the name of the output files, see variant_output_path_for.
+                Defaults to WATCH_PATTERN.
+            json_encoding (str, optional): the encoding of the JSON files. Defaults to "utf-8".
+            cache (RenderCache, optional): the render cache. Defaults to None (always render).
+
+        Raises:
+            ValueError: if the locale is not supported.
+        """
+        get_locale(locale)
+
+        self.resumes_dir = resumes_dir
+        self.templates_dir = templates_dir
+        self.output_dir = output_dir
+        self.locale = locale
+        self.pattern = pattern
+        self.json_encoding = json_encoding
+        self.cache = cache
+
+        self.employees: Dict[str, cv.Employee] = {}
+        self.__contexts: Dict[str, dict] = {}
+        self.__resumes: Dict[str, Signature] = {}
+        self.__templates: Dict[str, Signature] = {}
+
+    def poll(self) -> List[RenderResult]:
+        """Look for changes once, and render again the outputs they affect.
+
+        A changed resume is rendered against every template, a changed template
+        for every resume loaded.
+
+        Returns:
+            List[RenderResult]: the outcome of each rendering, empty without change.
+        """
+        resumes = scan(self.resumes_dir, (".json",))
+        templates = scan(self.templates_dir, (".docx", ".pptx"))
+
+        changed_resumes = sorted(
+            path
+            for path, signature in resumes.items()
+            if self.__resumes.get(path) != signature
+        )
+        changed_templates = sorted(
+            path
+            for path, signature in templates.items()
+            if self.__templates.get(path) != signature
+        )
+        for path in set(self.employees) - set(resumes):
+            del self.employees[path]
+            del self.__contexts[path]
+        self.__resumes = resumes
+        self.__templates = templates
+
+        results = []
+        if changed_resumes or changed_templates:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+        # A changed resume, against every template
+        for json_path in changed_resumes:
+            try:
+                self.load(json_path)
+            except Exception as err:
+                self.employees.pop(json_path, None)
+                self.__contexts.pop(json_path, None)
+                results.append(
+                    RenderResult(json_path, error=f"{type(err).__name__}: {err}")
+                )
+                continue
+
+            for template_path in sorted(templates):
+                results.append(self.render(json_path, template_path))
+
+        # The other resumes, against a changed template
+        for template_path in changed_templates:
+            for json_path in sorted(self.employees):
+                if json_path not in changed_resumes:
+                    results.append(self.render(json_path, template_path))
+
+        return results
+
+    def load(self, json_path: str) -> cv.Employee:
+        """Load a resume, and build its context.
+
+        Args:
+            json_path (str): the JSON resume file path.
+
+        Returns:
+            cv.Employee: the employee loaded.
+        """
+        from .docx import build_context
+
+        with timing.span("load"):
+            employee = cv.Employee().keep_sorted("desc")
+            employee.load_from_json(json_path, self.json_encoding)
+        with timing.span("context"):
+            context = build_context(employee)
+
+        self.employees[json_path] = employee
+        self.__contexts[json_path] = context
+        return employee
+
+    def render(self, json_path: str, template_path: str) -> RenderResult:
+        """Render a loaded resume against a template.
+
+        Args:
+            json_path (str): the JSON resume file path.
+            template_path (str): the DOCX or PPTX template file path.
+
+        Returns:
+            RenderResult: the outcome of the rendering.
+        """
+        source = f"{json_path} ({os.path.basename(template_path)})"
+        try:
+            save_path = variant_output_path_for(
+                self.pattern,
+                self.output_dir,
+                self.employees[json_path],
+                os.path.splitext(os.path.basename(json_path))[0],
+                template_path,
+                self.locale,
+                template_extension(template_path),
+            )
+        except ValueError as err:
+            return RenderResult(source, error=f"{type(err).__name__}: {err}")
+
+        return render_variant(
+            self.__contexts[json_path],
+            source,
+            template_path,
+            save_path,
+            self.locale,
+            self.cache,
+        )
+
+    def run(
+        self,
+        on_result: Callable[[RenderResult], None],
+        interval: float = 0.5,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Poll for changes until stopped, reporting every rendering.
+
+        Args:
+            on_result (Callable[[RenderResult], None]): called with the outcome of each rendering.
+            interval (float, optional): the time between two polls, in seconds. Defaults to 0.5.
+            stop (threading.Event, optional): set to stop watching. Defaults to None (watch forever).
+        """
+        if stop is None:
+            stop = threading.Event()
+
+        while not stop.is_set():
+            start = time.monotonic()
+            for result in self.poll():
+                on_result(result)
+            stop.wait(max(0.0, interval - (time.monotonic() - start)))
@@ -9,3 +9,19 @@ from .employee import Employee
 from .language import Language
 from .project import Project
 from .work_experience import WorkExperience
+from .stream import iter_employees, iter_json_objects
+from .schema import Violation, validate_document, validate_file, validate_files
+from .roster import (
+    And,
+    HasSkill,
+    HasTraining,
+    Not,
+    Or,
+    ProjectBetween,
+    Query,
+    Roster,
+    Speaks,
+    WorkedAt,
+)
+from .search import SearchHit, SearchIndex, Snippet
+from .ranking import Candidate, CandidateRanker, JobProfile
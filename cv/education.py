@@ -6,6 +6,7 @@ Author: Gilson, K.
 
 from typing import Any
 
+from . import validation
 from .mixin import JSONableMixin
 
 
@@ -19,6 +20,16 @@ class Education(JSONableMixin):
         end (int, optional): the end date fo the degree, under YYYY format. Defaults to None.
     """
 
+    __slots__ = ("school", "degree", "start", "end")
+
+    # Validation rules of the attributes
+    _RULES = {
+        "school": validation.instance_of("school", str, "a str"),
+        "degree": validation.instance_of("degree", str, "a str"),
+        "start": validation.date("start", 4, "YYYY"),
+        "end": validation.date("end", 4, "YYYY"),
+    }
+
     def __init__(self, school: str, degree: str, start: int, end: int = None) -> None:
         """Initialize the Education class instance.
 
@@ -45,15 +56,8 @@ class Education(JSONableMixin):
             AttributeError: if 'start' or 'end' have and incorrect length.
             TypeError: if 'school' or 'degree' are not a str.
         """
-        if name in ["start", "end"] and value is not None:
-            if not isinstance(value, int):
-                raise TypeError(f"'{name}' expect an int.")
-            elif len(str(value)) != 4:
-                raise AttributeError(
-                    f"{name} '{value}' has an incorrect lenght.\nShould be 4 characters in the YYYY format."
-                )
-        else:
-            if value is not None and not isinstance(value, str):
-                raise TypeError(f"'{name}' expect a str.")
-
-        self.__dict__[name] = value
+        rule = self._RULES.get(name)
+        if rule is not None:
+            value = rule(value)
+
+        super().__setattr__(name, value)
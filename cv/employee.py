@@ -7,6 +7,7 @@ Author: Gilson, K.
 import json
 from typing import List, Optional, Union
 
+from . import ordering
 from .education import Education
 from .language import Language
 from .mixin import JSONableMixin
@@ -29,6 +30,27 @@ class Employee(JSONableMixin):
         educations (List[Education], optional): list of Education objects. Defaults to None.
     """
 
+    __slots__ = (
+        "lastname",
+        "firstname",
+        "position",
+        "languages",
+        "summary",
+        "works",
+        "trainings",
+        "itskills",
+        "educations",
+    )
+
+    # Attributes holding a list of JSONableMixin children
+    _CHILDREN = ("languages", "works", "educations")
+
+    # Attributes holding a list of plain values
+    _LISTS = ("summary", "trainings", "itskills")
+
+    # Attributes holding a list of children kept in order, see 'keep_sorted'
+    _SORTED = ("works", "educations")
+
     def __init__(
         self,
         lastname: Optional[str] = None,
@@ -83,6 +105,8 @@ class Employee(JSONableMixin):
         if self.languages is None:
             self.languages = []
         self.languages.append(new_language)
+        self._adopt(new_language)
+        self.touch()
         return self
 
     def remove_language(self, old_language: Language) -> "Employee":
@@ -101,6 +125,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_language' expect a Language object.")
 
         self.languages.remove(old_language)
+        self.touch()
         return self
 
     def reorder_languages(self, order: list) -> "Employee":
@@ -140,6 +165,7 @@ class Employee(JSONableMixin):
         if self.summary is None:
             self.summary = []
         self.summary.append(new_summary)
+        self.touch()
         return self
 
     def remove_summary(self, old_summary: str) -> "Employee":
@@ -158,6 +184,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_summary' expect a str.")
 
         self.summary.remove(old_summary)
+        self.touch()
         return self
 
     def reorder_summary(self, order: list) -> "Employee":
@@ -196,7 +223,14 @@ class Employee(JSONableMixin):
 
         if self.works is None:
             self.works = []
-        self.works.append(new_work)
+        order = self._kept_order("works")
+        if order is None:
+            self.works.append(new_work)
+        else:
+            new_work.keep_sorted(order)
+            ordering.insort(self.works, new_work, order)
+        self._adopt(new_work)
+        self.touch()
         return self
 
     def remove_work(self, old_work: WorkExperience) -> "Employee":
@@ -215,6 +249,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_work' expect a WorkExperience object.")
 
         self.works.remove(old_work)
+        self.touch()
         return self
 
     def reorder_works(self, order: list) -> "Employee":
@@ -254,6 +289,7 @@ class Employee(JSONableMixin):
         if self.trainings is None:
             self.trainings = []
         self.trainings.append(new_training)
+        self.touch()
         return self
 
     def remove_training(self, old_training: str) -> "Employee":
@@ -272,6 +308,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_training' expect a str.")
 
         self.trainings.remove(old_training)
+        self.touch()
         return self
 
     def reorder_trainings(self, order: list) -> "Employee":
@@ -311,6 +348,7 @@ class Employee(JSONableMixin):
         if self.itskills is None:
             self.itskills = []
         self.itskills.append(new_itskill)
+        self.touch()
         return self
 
     def remove_itskill(self, old_itskill: str) -> "Employee":
@@ -329,6 +367,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_itskill' expect a str.")
 
         self.itskills.remove(old_itskill)
+        self.touch()
         return self
 
     def reorder_itskills(self, order: list) -> "Employee":
@@ -367,7 +406,13 @@ class Employee(JSONableMixin):
 
         if self.educations is None:
             self.educations = []
-        self.educations.append(new_education)
+        order = self._kept_order("educations")
+        if order is None:
+            self.educations.append(new_education)
+        else:
+            ordering.insort(self.educations, new_education, order)
+        self._adopt(new_education)
+        self.touch()
         return self
 
     def remove_education(self, old_education: Education) -> "Employee":
@@ -386,6 +431,7 @@ class Employee(JSONableMixin):
             raise TypeError("'old_education' expect an Education object.")
 
         self.educations.remove(old_education)
+        self.touch()
         return self
 
     def reorder_educations(self, order: list) -> "Employee":
@@ -410,6 +456,8 @@ class Employee(JSONableMixin):
     def sort_works(self, sort_type: Optional[str] = "asc") -> "Employee":
         """Sort the works attribute by their start and end dates.
 
+        An unknown start date sorts as the earliest, an ongoing end date as the latest.
+
         Args:
             sort_type (str, optional): the order of sorting. Defaults to "asc".
 
@@ -422,14 +470,7 @@ class Employee(JSONableMixin):
         if not isinstance(sort_type, str):
             raise TypeError("'sort_type' expect a str.")
 
-        if sort_type == "desc":
-            self.works = sorted(
-                self.works, key=lambda x: (x.start, x.end), reverse=True
-            )
-        else:
-            self.works = sorted(
-                self.works, key=lambda x: (x.start, x.end), reverse=False
-            )
+        self._sort("works", sort_type)
         return self
 
     def sort_projects(self, sort_type: Optional[str] = "asc") -> "Employee":
@@ -447,20 +488,15 @@ class Employee(JSONableMixin):
         if not isinstance(sort_type, str):
             raise TypeError("'sort_type' expect a str.")
 
-        for work in self.works:
-            if sort_type == "desc":
-                work.projects = sorted(
-                    work.projects, key=lambda x: (x.start, x.end), reverse=True
-                )
-            else:
-                work.projects = sorted(
-                    work.projects, key=lambda x: (x.start, x.end), reverse=False
-                )
-            return self
+        for work in self.works or ():
+            work.sort_projects(sort_type)
+        return self
 
     def sort_educations(self, sort_type: Optional[str] = "asc") -> "Employee":
         """Sort the educations attribute by their start and end dates.
 
+        An unknown start date sorts as the earliest, an ongoing end date as the latest.
+
         Args:
             sort_type (str, optional): the order of sorting. Defaults to "asc".
 
@@ -473,18 +509,43 @@ class Employee(JSONableMixin):
         if not isinstance(sort_type, str):
             raise TypeError("'sort_type' expect a str.")
 
-        if sort_type == "desc":
-            self.educations = sorted(
-                self.educations, key=lambda x: (x.start, x.end), reverse=True
-            )
-        else:
-            self.educations = sorted(
-                self.educations, key=lambda x: (x.start, x.end), reverse=False
-            )
+        self._sort("educations", sort_type)
+        return self
+
+    def keep_sorted(self, sort_type: Optional[str] = "desc") -> "Employee":
+        """Sort the works, their projects and the educations, then keep them sorted as they are added.
+
+        'add_work', 'add_project' and 'add_education' then insert each object in
+        place, by bisection. Assigning the works or the educations directly, or
+        sorting them in another order, stops keeping that list sorted until the
+        next call. The objects whose dates change are only ordered again by the
+        'sort_' methods.
+
+        Args:
+            sort_type (str, optional): the order to keep, or None to stop keeping one. Defaults to "desc".
+
+        Raises:
+            TypeError: if sort_type is neither a str, nor None.
+
+        Returns:
+            Employee: the class instance itself.
+        """
+        if sort_type is not None and not isinstance(sort_type, str):
+            raise TypeError("'sort_type' expect a str or None.")
+
+        object.__setattr__(self, "_order", None)
+        for work in self.works or ():
+            work.keep_sorted(sort_type)
+
+        if sort_type is not None:
+            self.sort_works(sort_type)
+            self.sort_educations(sort_type)
+            self._keep_order("works", sort_type)
+            self._keep_order("educations", sort_type)
         return self
 
     @staticmethod
-    def __remove_nulls(obj: Union[dict, list]) -> Union[dict, list]:
+    def remove_nulls(obj: Union[dict, list]) -> Union[dict, list]:
         """Object hook function to remove None values from either a dict or a list.
 
         Args:
@@ -523,7 +584,24 @@ class Employee(JSONableMixin):
 
         # Open JSON file
         with open(json_path, encoding=json_encoding) as json_file:
-            json_obj = json.load(json_file, object_hook=self.__remove_nulls)
+            json_obj = json.load(json_file, object_hook=self.remove_nulls)
+
+        return self.load_from_dict(json_obj)
+
+    def load_from_dict(self, json_obj: dict) -> "Employee":
+        """Populate the current instance from a decoded JSON resume.
+
+        Args:
+            json_obj (dict): the decoded JSON resume, purged from its None values.
+
+        Raises:
+            TypeError: if json_obj is not a dict.
+
+        Returns:
+            Employee: the class instance itself.
+        """
+        if not isinstance(json_obj, dict):
+            raise TypeError("'json_obj' expect a dict.")
 
         self.lastname = json_obj["lastname"]
         self.firstname = json_obj["firstname"]
@@ -531,7 +609,7 @@ class Employee(JSONableMixin):
 
         # Languages
         for language in json_obj["languages"]:
-            new_language = Language(**language)
+            new_language = Language.from_fields(**language)
             self.add_language(new_language)
 
         # Summary
@@ -541,15 +619,12 @@ class Employee(JSONableMixin):
 
         # Works
         for work in json_obj["works"]:
-            new_work = WorkExperience(employer=work["employer"], start=work["start"])
-
-            # End
-            if "end" in work:
-                new_work.end = work["end"]
-
-            # Position
-            if "position" in work:
-                new_work.position = work["position"]
+            new_work = WorkExperience.from_fields(
+                employer=work["employer"],
+                start=work["start"],
+                end=work.get("end"),
+                position=work.get("position"),
+            )
 
             # Description
             if "description" in work:
@@ -559,7 +634,7 @@ class Employee(JSONableMixin):
             # Project
             if "projects" in work:
                 for project in work["projects"]:
-                    new_project = Project(**project)
+                    new_project = Project.from_fields(**project)
                     new_work.add_project(new_project)
 
             self.add_work(new_work)
@@ -576,7 +651,7 @@ class Employee(JSONableMixin):
 
         # Education
         for education in json_obj["educations"]:
-            new_education = Education(**education)
+            new_education = Education.from_fields(**education)
             self.add_education(new_education)
 
         return self
@@ -6,6 +6,7 @@ Author: Gilson, K.
 
 from typing import Any
 
+from . import validation
 from .mixin import JSONableMixin
 
 
@@ -18,6 +19,15 @@ class Language(JSONableMixin):
         cefr_level (str, optional): CEFR Level of competence. Defaults to None.
     """
 
+    __slots__ = ("name", "irl_scale", "cefr_level")
+
+    # Validation rules of the attributes
+    _RULES = {
+        "name": validation.instance_of("name", str, "a str"),
+        "irl_scale": validation.irl_scale("irl_scale"),
+        "cefr_level": validation.cefr_level("cefr_level"),
+    }
+
     def __init__(
         self, name: str, irl_scale: str = None, cefr_level: str = None
     ) -> None:
@@ -44,45 +54,8 @@ class Language(JSONableMixin):
             AttributeError: if the irl_scale value is unknown.
             AttributeError: if the cefr_level value is unknown.
         """
-        # Validation
-        if value is not None and not isinstance(value, str):
-            raise TypeError(f"'{name}' expect a str.")
-
-        if name == "irl_scale" and value is not None:
-            irl_list = [
-                "No Proficiency",
-                "Elementary Proficiency",
-                "Limited Working Proficiency",
-                "Professional Working Proficiency",
-                "Full Professional Proficiency",
-                "Bilingual",
-                "Native",
-            ]
-            if value.title() not in irl_list:
-                raise AttributeError(
-                    f"IRL Scale '{value}' unknown.\nShould be part of list:\n{irl_list}"
-                )
-        elif name == "cefr_level" and value is not None:
-            cefr_list = [
-                "A1",
-                "A2",
-                "B1",
-                "B2",
-                "C1",
-                "C2",
-            ]
-            if value.upper() not in cefr_list:
-                raise AttributeError(
-                    f"CEFR Level '{value}' unknown.\nShould be part of list:\n{cefr_list}"
-                )
+        rule = self._RULES.get(name)
+        if rule is not None:
+            value = rule(value)
 
-        # Set
-        if value is None:
-            self.__dict__[name] = value
-        else:
-            if name == "irl_scale":
-                self.__dict__[name] = value.title()
-            elif name == "cefr_level":
-                self.__dict__[name] = value.upper()
-            else:
-                self.__dict__[name] = value
+        super().__setattr__(name, value)
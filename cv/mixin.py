@@ -4,44 +4,219 @@ mixin.py
 Author: Gilson, K.
 """
 
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
+
+from . import ordering, serialization, validation
+
+# Compiled constructors, by class, see JSONableMixin.from_fields
+_CONSTRUCTORS = {}
 
 
 class JSONableMixin(object):
-    """JSONableMixin: mixin for nested dictionaries objects."""
+    """JSONableMixin: mixin for nested dictionaries objects.
+
+    The attributes to serialize are the ones listed in the '__slots__' of the
+    class, in that order.
+
+    The dictionary returned by 'to_dict(shared=True)' is cached until the
+    instance, or one of its children, changes. Assigning an attribute marks the instance and its
+    parents as changed, as do the 'add_' and 'remove_' methods of the classes.
+    Lists modified in place by other means require a call to 'touch'.
+
+    The dated children of the classes with a 'keep_sorted' method can be kept in
+    chronological order as they are added, instead of being sorted afterwards.
+    """
+
+    __slots__ = ("_parent", "_cache", "_order")
+
+    # Validation rules of the attributes, see the 'validation' module
+    _RULES: Dict[str, validation.Rule] = {}
+
+    # Attributes holding a list of JSONableMixin children
+    _CHILDREN: Tuple[str, ...] = ()
+
+    # Attributes holding a list of plain values
+    _LISTS: Tuple[str, ...] = ()
+
+    # Attributes holding a list of dated children kept in order, see 'keep_sorted'.
+    # '_order' holds the order kept for each of them, or None if none is
+    _SORTED: Tuple[str, ...] = ()
+
+    def __new__(cls, *args, **kwargs) -> "JSONableMixin":
+        """Create the instance, with no parent, no cached dictionary and no kept order."""
+        instance = super().__new__(cls)
+        object.__setattr__(instance, "_parent", None)
+        object.__setattr__(instance, "_cache", None)
+        object.__setattr__(instance, "_order", None)
+        return instance
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute and mark the instance as changed.
+
+        Args:
+            name (str): name of the attribute.
+            value (Any): value of the attribute.
+        """
+        object.__setattr__(self, name, value)
+
+        if name in self._CHILDREN and isinstance(value, list):
+            for child in value:
+                self._adopt(child)
+        if name in self._SORTED and value and self._order is not None:
+            # Assigned directly, the list may be out of order
+            self._keep_order(name, None)
+        if self._cache is not None:
+            self.touch()
+
+    def _kept_order(self, name: str) -> Optional[str]:
+        """Return the order a list of dated children is kept in.
+
+        Args:
+            name (str): the name of the attribute, listed in '_SORTED'.
+
+        Returns:
+            Optional[str]: "asc" or "desc", None if the list is not kept sorted.
+        """
+        if self._order is None:
+            return None
+        return self._order[self._SORTED.index(name)]
+
+    def _keep_order(self, name: str, sort_type: Optional[str]) -> None:
+        """Set the order a list of dated children is kept in.
+
+        Args:
+            name (str): the name of the attribute, listed in '_SORTED'.
+            sort_type (str, optional): the order, or None to stop keeping one.
+        """
+        orders = list(self._order or (None,) * len(self._SORTED))
+        orders[self._SORTED.index(name)] = (
+            None if sort_type is None else ordering.normalize(sort_type)
+        )
+        object.__setattr__(self, "_order", tuple(orders) if any(orders) else None)
+
+    def _sort(self, name: str, sort_type: str) -> None:
+        """Sort a list of dated children, still kept in its order if sorted in the same.
+
+        Args:
+            name (str): the name of the attribute, listed in '_SORTED'.
+            sort_type (str): "desc" for the latest first, anything else for the oldest first.
+        """
+        items = getattr(self, name)
+        if not items:
+            return
+
+        sorted_items = ordering.sort(items, sort_type)
+
+        # Keep the cached dictionaries if the order did not change
+        if sorted_items != items:
+            kept = self._kept_order(name)
+            setattr(self, name, sorted_items)
+            if kept == ordering.normalize(sort_type):
+                self._keep_order(name, kept)
 
-    def to_dict(self, keep_none: Optional[bool] = True) -> dict:
+    def _adopt(self, child: Any) -> None:
+        """Make the instance the parent of a child, to be notified of its changes.
+
+        Args:
+            child (Any): the child, ignored if not a JSONableMixin.
+        """
+        if isinstance(child, JSONableMixin):
+            object.__setattr__(child, "_parent", self)
+
+    def touch(self) -> "JSONableMixin":
+        """Mark the instance and its parents as changed, dropping their cached dictionaries.
+
+        Returns:
+            JSONableMixin: the class instance itself.
+        """
+        node = self
+        while node is not None and node._cache is not None:
+            object.__setattr__(node, "_cache", None)
+            node = node._parent
+        return self
+
+    @classmethod
+    def from_fields(cls, **fields: Any) -> "JSONableMixin":
+        """Create an instance, validating all its attributes at once.
+
+        Bulk alternative to the constructor, which goes through __setattr__ for
+        each attribute. The rules of the class are compiled once into a single
+        function, and run in the same order, so that the errors raised are the
+        same as the constructor ones.
+
+        Args:
+            **fields (Any): the arguments of the constructor.
+
+        Raises:
+            TypeError: if an argument is unknown, missing, or has an incorrect type.
+            AttributeError: if an argument has an incorrect value.
+
+        Returns:
+            JSONableMixin: the new instance.
+        """
+        constructor = _CONSTRUCTORS.get(cls)
+        if constructor is None:
+            constructor = validation.compile_constructor(cls, cls._RULES)
+            _CONSTRUCTORS[cls] = constructor
+
+        instance = constructor(fields)
+        for name in cls._CHILDREN:
+            for child in getattr(instance, name) or ():
+                instance._adopt(child)
+        return instance
+
+    def validate(self) -> "JSONableMixin":
+        """Validate all the attributes of the instance at once.
+
+        Raises:
+            TypeError: if an attribute has an incorrect type.
+            AttributeError: if an attribute has an incorrect value.
+
+        Returns:
+            JSONableMixin: the class instance itself.
+        """
+        validation.validate(self, self._RULES)
+        return self.touch()
+
+    def to_dict(self, keep_none: Optional[bool] = True, shared: bool = False) -> dict:
         """Return a nested dictionary of the instance attributes.
 
+        By default, the dictionary is new and belongs to the caller. A shared
+        dictionary is cached, along with the ones of the children, so that a
+        later call only builds again the parts changed since: it is shared with
+        the later calls and with the parents, and must not be modified.
+
         Args:
             keep_none (bool, optional): whether to keep None values in the dictionary or not. Defaults to True.
+            shared (bool, optional): whether to return the cached, read-only dictionary or a new one.
+                Defaults to False.
 
         Raises:
             TypeError: if keep_none is not bool.
+            TypeError: if shared is not bool.
 
         Returns:
             dict: the nested dictionary of the instance attributes.
         """
         if not isinstance(keep_none, bool):
             raise TypeError("'keep_none' expect a bool.")
+        if not isinstance(shared, bool):
+            raise TypeError("'shared' expect a bool.")
+
+        return self._serialize(keep_none, shared)
+
+    def _serialize(self, keep_none: bool, shared: bool) -> dict:
+        """Return the dictionary of the instance, from the serializer of its class.
+
+        Args:
+            keep_none (bool): whether to keep None values in the dictionary or not.
+            shared (bool): whether to return the cached dictionary or a new one.
 
-        dic = {}
-        for key, value in self.__dict__.items():
-            if isinstance(value, JSONableMixin):
-                dic[key] = value.to_dict(keep_none)
-            elif isinstance(value, list):
-                lst = []
-                for item in value:
-                    if isinstance(item, JSONableMixin):
-                        lst.append(item.to_dict(keep_none))
-                    else:
-                        if item is not None or keep_none == True:
-                            lst.append(item)
-
-                if lst or keep_none == True:
-                    dic[key] = lst
-            else:
-                if value is not None or keep_none == True:
-                    dic[key] = value
-
-        return dic
+        Returns:
+            dict: the nested dictionary of the instance attributes.
+        """
+        try:
+            serializer = serialization.SERIALIZERS[type(self), keep_none, shared]
+        except KeyError:
+            serializer = serialization.get_serializer(type(self), keep_none, shared)
+        return serializer(self)
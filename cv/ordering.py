@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+ordering.py
+Author: Gilson, K.
+
+Chronological order of the dated cv objects (WorkExperience, Project, Education),
+by start then end date.
+
+An unknown start date sorts as the earliest, and an ongoing (None) end date as
+the latest, so that objects with missing dates can be compared with the others.
+"""
+
+import bisect
+from typing import Any, Callable, List, Tuple
+
+# A key returns the sort key of a dated object
+Key = Callable[[Any], Tuple[int, int, int, int]]
+
+
+def ascending_key(item: Any) -> Tuple[int, int, int, int]:
+    """Return the key sorting a dated object from the oldest to the latest.
+
+    Args:
+        item (Any): the object, with a start and an end attribute.
+
+    Returns:
+        Tuple[int, int, int, int]: the key.
+    """
+    start, end = item.start, item.end
+    return (start is not None, start or 0, end is None, end or 0)
+
+
+def descending_key(item: Any) -> Tuple[int, int, int, int]:
+    """Return the key sorting a dated object from the latest to the oldest.
+
+    Args:
+        item (Any): the object, with a start and an end attribute.
+
+    Returns:
+        Tuple[int, int, int, int]: the key.
+    """
+    start, end = item.start, item.end
+    return (start is None, -(start or 0), end is not None, -(end or 0))
+
+
+def normalize(sort_type: str) -> str:
+    """Return the order of a sort type.
+
+    Args:
+        sort_type (str): "desc" for the latest first, anything else for the oldest first.
+
+    Returns:
+        str: "desc" or "asc".
+    """
+    return "desc" if sort_type == "desc" else "asc"
+
+
+def key_for(sort_type: str) -> Key:
+    """Return the key of an order.
+
+    Args:
+        sort_type (str): "desc" for the latest first, anything else for the oldest first.
+
+    Returns:
+        Key: the key.
+    """
+    return descending_key if sort_type == "desc" else ascending_key
+
+
+def sort(items: List[Any], sort_type: str) -> List[Any]:
+    """Return the dated objects sorted, equal ones keeping their relative order.
+
+    Args:
+        items (List[Any]): the objects.
+        sort_type (str): "desc" for the latest first, anything else for the oldest first.
+
+    Returns:
+        List[Any]: a new sorted list.
+    """
+    return sorted(items, key=key_for(sort_type))
+
+
+def insort(items: List[Any], item: Any, sort_type: str) -> None:
+    """Insert a dated object into a sorted list, by bisection.
+
+    The object goes after the ones with an equal key, as if the list was sorted
+    again with the object appended.
+
+    Args:
+        items (List[Any]): the sorted objects, modified in place.
+        item (Any): the object to insert.
+        sort_type (str): "desc" for the latest first, anything else for the oldest first.
+    """
+    bisect.insort(items, item, key=key_for(sort_type))
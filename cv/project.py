@@ -6,6 +6,7 @@ Author: Gilson, K.
 
 from typing import Any, List, Optional
 
+from . import validation
 from .mixin import JSONableMixin
 
 
@@ -23,6 +24,32 @@ class Project(JSONableMixin):
         confidential (bool, optional): whether to treat the project as confidential or not. Defaults to True.
     """
 
+    __slots__ = (
+        "name",
+        "redacted",
+        "position",
+        "start",
+        "end",
+        "description",
+        "activities",
+        "confidential",
+    )
+
+    # Attributes holding a list of plain values
+    _LISTS = ("description", "activities")
+
+    # Validation rules of the attributes
+    _RULES = {
+        "name": validation.instance_of("name", str, "a str"),
+        "redacted": validation.instance_of("redacted", str, "a str"),
+        "position": validation.instance_of("position", str, "a str"),
+        "start": validation.date("start", 6, "YYYYMM"),
+        "end": validation.date("end", 6, "YYYYMM"),
+        "description": validation.instance_of("description", list, "a list"),
+        "activities": validation.instance_of("activities", list, "a list"),
+        "confidential": validation.instance_of("confidential", bool, "a bool"),
+    }
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -68,22 +95,11 @@ class Project(JSONableMixin):
             AttributeError: if 'start' or 'end' have and incorrect length.
             TypeError: if 'description' or 'activities' are not a list.
         """
-        if value is not None:
-            if name in ["name", "redacted", "position"] and not isinstance(value, str):
-                raise TypeError(f"'{name}' expect a str.")
-            elif name in ["start", "end"]:
-                if not isinstance(value, int):
-                    raise TypeError(f"'{name}' expect an int.")
-                elif len(str(value)) != 6:
-                    raise AttributeError(
-                        f"{name} '{value}' has an incorrect lenght.\nShould be 6 characters in the YYYYMM format."
-                    )
-            elif name in ["description", "activities"] and not isinstance(value, list):
-                raise TypeError(f"'{name}' expect a list.")
-            elif name == "confidential" and not isinstance(value, bool):
-                raise TypeError(f"'{name}' expect a bool.")
-
-        self.__dict__[name] = value
+        rule = self._RULES.get(name)
+        if rule is not None:
+            value = rule(value)
+
+        super().__setattr__(name, value)
 
     # Description
     def add_description(self, new_description: str) -> "Project":
@@ -104,6 +120,7 @@ class Project(JSONableMixin):
         if self.description is None:
             self.description = []
         self.description.append(new_description)
+        self.touch()
         return self
 
     def remove_description(self, old_description: str) -> "Project":
@@ -122,6 +139,7 @@ class Project(JSONableMixin):
             raise TypeError("'old_description' expect a str.")
 
         self.description.remove(old_description)
+        self.touch()
         return self
 
     def reorder_description(self, order: list) -> "Project":
@@ -161,6 +179,7 @@ class Project(JSONableMixin):
         if self.activities is None:
             self.activities = []
         self.activities.append(new_activity)
+        self.touch()
         return self
 
     def remove_activity(self, old_activity: str) -> "Project":
@@ -179,6 +198,7 @@ class Project(JSONableMixin):
             raise TypeError("'old_activity' expect a str.")
 
         self.activities.remove(old_activity)
+        self.touch()
         return self
 
     def reorder_activity(self, order: list) -> "Project":
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+ranking.py
+Author: Gilson, K.
+
+Rank the employees of a roster against a job profile: weighted IT skills, a
+minimum CEFR level per language, and recent experience in a domain.
+
+The employees are encoded once into NumPy arrays: a one-hot matrix of their IT
+skills, a matrix of the ordinal of their CEFR level in each language, and the
+works and projects as periods in months, with an inverted index of the words
+describing them. A profile then scores the whole roster in a few array
+operations, and the best employees come with the part of their score due to
+each requirement. The arrays are not updated with the roster: encode it again
+after a change.
+
+NumPy is an optional dependency, only imported when a roster is encoded.
+
+Example:
+    ranker = CandidateRanker(iter_employees("team.jsonl", "utf-8"))
+    profile = JobProfile(
+        skills={"Kubernetes": 3, "Python": 2},
+        languages={"French": "C1", "Dutch": "B2"},
+        domain=["banking", "insurance"],
+    )
+    for candidate in ranker.rank(profile, limit=5):
+        print(candidate.score, candidate.breakdown)
+"""
+
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .employee import Employee
+from .roster import normalize
+from .search import tokenize, vocabulary
+from .validation import CEFR_LEVELS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Ordinal of each CEFR level, from A1 to C2, 0 being no level
+_CEFR_ORDINALS = {level: ordinal for ordinal, level in enumerate(CEFR_LEVELS, 1)}
+
+
+def month_number(yyyymm: int) -> int:
+    """Return the number of a YYYYMM month, counted from year 0.
+
+    Args:
+        yyyymm (int): the month, e.g. 202403.
+
+    Returns:
+        int: the number of the month, consecutive months having consecutive numbers.
+    """
+    return (yyyymm // 100) * 12 + yyyymm % 100 - 1
+
+
+def current_month() -> int:
+    """Return the current month.
+
+    Returns:
+        int: the month, as YYYYMM.
+    """
+    now = time.localtime()
+    return now.tm_year * 100 + now.tm_mon
+
+
+class JobProfile(object):
+    """JobProfile: the requirements of a job, each scoring points to the employees meeting it."""
+
+    __slots__ = (
+        "skills",
+        "languages",
+        "language_weight",
+        "domain",
+        "domain_months",
+        "domain_weight",
+        "recent_months",
+        "until",
+    )
+
+    def __init__(
+        self,
+        skills: Optional[Dict[str, float]] = None,
+        languages: Optional[Dict[str, str]] = None,
+        language_weight: float = 1.0,
+        domain: Iterable[str] = (),
+        domain_months: int = 24,
+        domain_weight: float = 1.0,
+        recent_months: int = 60,
+        until: Optional[int] = None,
+    ) -> None:
+        """Initialize the JobProfile class instance.
+
+        Args:
+            skills (Dict[str, float], optional): the weight of each IT skill, scored in full by
+                the employees having it. Defaults to None.
+            languages (Dict[str, str], optional): the minimum CEFR level in each language,
+                e.g. {"French": "C1"}. Defaults to None.
+            language_weight (float, optional): the score of each language spoken at its minimum
+                level or above. Defaults to 1.
+            domain (Iterable[str], optional): the words of the domain, e.g. ["banking", "public sector"],
+                matched in the works and projects described with every word of any of them.
+                Defaults to () (no domain).
+            domain_months (int, optional): the months of experience in the domain scoring in full,
+                fewer scoring in proportion. Defaults to 24.
+            domain_weight (float, optional): the score of a full experience in the domain. Defaults to 1.
+            recent_months (int, optional): the months before 'until' in which the experience counts.
+                Defaults to 60.
+            until (int, optional): the last month in which the experience counts, as YYYYMM.
+                Defaults to None (the current month).
+
+        Raises:
+            TypeError: if a weight is not a number.
+            AttributeError: if a level is not a CEFR level.
+            ValueError: if domain_months or recent_months is lower than 1.
+        """
+        skills = dict(skills or {})
+        for weight in (*skills.values(), language_weight, domain_weight):
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise TypeError("'weight' expect an int or a float.")
+
+        levels = {}
+        for language, level in (languages or {}).items():
+            if not isinstance(level, str) or level.upper() not in _CEFR_ORDINALS:
+                raise AttributeError(
+                    f"CEFR Level '{level}' unknown.\nShould be part of list:\n{CEFR_LEVELS}"
+                )
+            levels[language] = level.upper()
+
+        if domain_months < 1:
+            raise ValueError("'domain_months' should be at least 1.")
+        if recent_months < 1:
+            raise ValueError("'recent_months' should be at least 1.")
+
+        self.skills = skills
+        self.languages = levels
+        self.language_weight = language_weight
+        self.domain = [domain] if isinstance(domain, str) else list(domain)
+        self.domain_months = domain_months
+        self.domain_weight = domain_weight
+        self.recent_months = recent_months
+        self.until = current_month() if until is None else until
+
+    def __repr__(self) -> str:
+        return (
+            f"JobProfile(skills={self.skills!r}, languages={self.languages!r}, "
+            f"domain={self.domain!r})"
+        )
+
+
+class Candidate(NamedTuple):
+    """Candidate: an employee, scored against a job profile.
+
+    Attributes:
+        employee (Employee): the employee.
+        score (float): the score, the sum of the breakdown.
+        breakdown (Dict[str, float]): the score due to each requirement, by name,
+            e.g. {"skill:Python": 2.0, "language:French": 1.0, "domain": 0.5}.
+        months (int): the months of recent experience in the domain.
+    """
+
+    employee: Employee
+    score: float
+    breakdown: Dict[str, float]
+    months: int
+
+
+def _texts(employee: Employee) -> Iterable[Tuple[Optional[int], Optional[int], List]]:
+    """Yield the works and projects of an employee, with the texts describing them.
+
+    Args:
+        employee (Employee): the employee.
+
+    Yields:
+        Tuple[Optional[int], Optional[int], List]: the start and end, as YYYYMM, and the texts.
+    """
+    for work in employee.works or []:
+        yield work.start, work.end, [
+            work.employer,
+            work.position,
+            *(work.description or []),
+        ]
+        for project in work.projects or []:
+            yield project.start, project.end, [
+                project.redacted if project.confidential else project.name,
+                project.position,
+                *(project.description or []),
+                *(project.activities or []),
+            ]
+
+
+class CandidateRanker(object):
+    """CandidateRanker: employees encoded as feature arrays, to be scored against job profiles."""
+
+    def __init__(self, employees: Iterable[Employee]) -> None:
+        """Initialize the CandidateRanker class instance, encoding the employees.
+
+        Args:
+            employees (Iterable[Employee]): the employees, e.g. a Roster.
+
+        Raises:
+            ImportError: if NumPy is not installed.
+        """
+        import numpy as np
+
+        self.employees: List[Employee] = list(employees)
+        count = len(self.employees)
+
+        # Column of each IT skill and language, an extra column staying empty for
+        # the requirements nobody meets
+        self.skills: Dict[str, int] = {}
+        self.languages: Dict[str, int] = {}
+        skill_cells: Tuple[List[int], List[int]] = ([], [])
+        language_cells: Tuple[List[int], List[int], List[int]] = ([], [], [])
+
+        # Works and projects, with the periods of each word describing them
+        owners: List[int] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        words: Dict[str, List[int]] = {}
+
+        for row, employee in enumerate(self.employees):
+            for skill in employee.itskills or []:
+                column = self.skills.setdefault(normalize(skill), len(self.skills))
+                skill_cells[0].append(row)
+                skill_cells[1].append(column)
+
+            for language in employee.languages or []:
+                column = self.languages.setdefault(
+                    normalize(language.name), len(self.languages)
+                )
+                language_cells[0].append(row)
+                language_cells[1].append(column)
+                language_cells[2].append(_CEFR_ORDINALS.get(language.cefr_level, 0))
+
+            for start, end, texts in _texts(employee):
+                if start is None:
+                    continue
+                period = len(owners)
+                owners.append(row)
+                starts.append(month_number(start))
+                # Ongoing until the profile's last month, as an end past any
+                ends.append(month_number(end) if end is not None else 2**30)
+                for word in vocabulary(" ".join(text for text in texts if text)):
+                    words.setdefault(word, []).append(period)
+
+        self.skill_matrix: "np.ndarray" = np.zeros(
+            (count, len(self.skills) + 1), dtype=bool
+        )
+        self.skill_matrix[
+            np.array(skill_cells[0], dtype=np.intp),
+            np.array(skill_cells[1], dtype=np.intp),
+        ] = True
+
+        # Ordinal of the CEFR level, the highest one if a language is given twice
+        self.language_levels: "np.ndarray" = np.zeros(
+            (count, len(self.languages) + 1), dtype=np.int8
+        )
+        np.maximum.at(
+            self.language_levels,
+            (
+                np.array(language_cells[0], dtype=np.intp),
+                np.array(language_cells[1], dtype=np.intp),
+            ),
+            np.array(language_cells[2], dtype=np.int8),
+        )
+
+        self.period_owners: "np.ndarray" = np.array(owners, dtype=np.int64)
+        self.period_starts: "np.ndarray" = np.array(starts, dtype=np.int64)
+        self.period_ends: "np.ndarray" = np.array(ends, dtype=np.int64)
+        self.words: Dict[str, "np.ndarray"] = {
+            word: np.array(periods, dtype=np.int64) for word, periods in words.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def score(
+        self, profile: JobProfile
+    ) -> Tuple[List[str], "np.ndarray", "np.ndarray"]:
+        """Score every employee against a job profile.
+
+        Args:
+            profile (JobProfile): the job profile.
+
+        Returns:
+            Tuple[List[str], np.ndarray, np.ndarray]: the name of each requirement, the score of
+                each employee (rows) due to each requirement (columns), and the months of recent
+                experience of each employee in the domain.
+        """
+        import numpy as np
+
+        unknown_skill = len(self.skills)
+        skill_columns = [
+            self.skills.get(normalize(skill), unknown_skill) for skill in profile.skills
+        ]
+        skill_scores = self.skill_matrix[:, skill_columns] * np.array(
+            list(profile.skills.values()), dtype=float
+        )
+
+        unknown_language = len(self.languages)
+        language_columns = [
+            self.languages.get(normalize(language), unknown_language)
+            for language in profile.languages
+        ]
+        min_ordinals = np.array(
+            [_CEFR_ORDINALS[level] for level in profile.languages.values()],
+            dtype=np.int8,
+        )
+        language_scores = (
+            self.language_levels[:, language_columns] >= min_ordinals
+        ) * float(profile.language_weight)
+
+        months = self.__domain_months(profile)
+        domain_scores = (
+            np.minimum(months / profile.domain_months, 1.0) * profile.domain_weight
+        )
+
+        names = [
+            *(f"skill:{skill}" for skill in profile.skills),
+            *(f"language:{language}" for language in profile.languages),
+            "domain",
+        ]
+        scores = np.column_stack((skill_scores, language_scores, domain_scores))
+        return names, scores, months
+
+    def rank(self, profile: JobProfile, limit: Optional[int] = 10) -> List[Candidate]:
+        """Return the employees best matching a job profile, the best first.
+
+        Args:
+            profile (JobProfile): the job profile.
+            limit (int, optional): the maximum number of candidates. Defaults to 10, None for all.
+
+        Returns:
+            List[Candidate]: the candidates, the employees scoring the same in roster order.
+        """
+        import numpy as np
+
+        count = len(self.employees)
+        if count == 0 or limit == 0:
+            return []
+
+        names, scores, months = self.score(profile)
+        totals = scores.sum(axis=1)
+
+        rows = np.arange(count)
+        if limit is not None and limit < count:
+            # Only the employees scoring at least the limit-th best are sorted
+            threshold = -np.partition(-totals, limit - 1)[limit - 1]
+            rows = np.flatnonzero(totals >= threshold)
+        rows = rows[np.lexsort((rows, -totals[rows]))][:limit]
+
+        return [
+            Candidate(
+                self.employees[row],
+                float(totals[row]),
+                dict(zip(names, scores[row].tolist())),
+                int(months[row]),
+            )
+            for row in rows.tolist()
+        ]
+
+    def __domain_months(self, profile: JobProfile) -> "np.ndarray":
+        """Return the months of recent experience of every employee in the domain of a profile.
+
+        The overlapping works and projects of an employee only count once.
+
+        Args:
+            profile (JobProfile): the job profile.
+
+        Returns:
+            np.ndarray: the months of each employee.
+        """
+        import numpy as np
+
+        count = len(self.employees)
+        matched = []
+        for expression in profile.domain:
+            postings = [self.words.get(word) for word in tokenize(expression)]
+            if postings and all(periods is not None for periods in postings):
+                periods = postings[0]
+                for other in postings[1:]:
+                    periods = np.intersect1d(periods, other, assume_unique=True)
+                matched.append(periods)
+        if not matched:
+            return np.zeros(count, dtype=np.int64)
+
+        periods = np.unique(np.concatenate(matched))
+        last = month_number(profile.until) + 1
+        first = last - profile.recent_months
+        owners = self.period_owners[periods]
+        starts = np.clip(self.period_starts[periods], first, last)
+        ends = np.clip(self.period_ends[periods] + 1, first, last)
+
+        # Sorted by employee then start, each period only adds the months after
+        # the furthest end of the previous periods of its employee
+        order = np.lexsort((starts, owners))
+        owners, starts, ends = owners[order], starts[order], ends[order]
+        offsets = owners * (last - first + 1) - first
+        reach = np.maximum.accumulate(ends + offsets) - offsets
+        previous = np.empty_like(reach)
+        previous[:1] = first
+        previous[1:] = np.where(owners[1:] == owners[:-1], reach[:-1], first)
+        added = np.maximum(ends - np.maximum(starts, previous), 0)
+        return np.bincount(owners, weights=added, minlength=count).astype(np.int64)
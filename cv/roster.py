@@ -0,0 +1,649 @@
+# -*- coding: utf-8 -*-
+"""
+roster.py
+Author: Gilson, K.
+
+Roster: an in-memory collection of employees, with inverted indexes to answer
+staffing queries without walking every resume.
+
+The IT skills, the trainings, the languages with their CEFR level and the
+employers each map to the set of employees having them, so that a query is a
+few set operations. The projects of an employee are merged into the periods
+it was on projects; the employees are kept sorted by the start of their first
+period and by the end of their last one, so that a date range is found by
+bisection, only the employees with gaps between periods being checked. The
+indexes are updated as employees are added or removed, an employee changed
+afterwards is indexed again by 'update'.
+
+Example:
+    roster = Roster(iter_employees("team.jsonl", "utf-8"))
+    roster.find(
+        HasSkill("Kubernetes") & Speaks("French", "C1") & ProjectBetween(start=202001)
+    )
+"""
+
+import bisect
+from typing import (
+    AbstractSet,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .employee import Employee
+from .validation import CEFR_LEVELS
+
+# End of the ongoing projects, after any YYYYMM date
+ONGOING = 999999
+
+# Result of a query matching nobody
+_NOBODY: AbstractSet[int] = frozenset()
+
+# Rank of each CEFR level, from A1 to C2
+_CEFR_RANKS = {level: rank for rank, level in enumerate(CEFR_LEVELS)}
+
+
+def normalize(text: str) -> str:
+    """Return the key of a value in the indexes, matched regardless of case and spaces.
+
+    Args:
+        text (str): the value, e.g. "  Kubernetes ".
+
+    Returns:
+        str: the key, e.g. "kubernetes".
+    """
+    return " ".join(text.split()).casefold()
+
+
+class _Entry(NamedTuple):
+    """_Entry: what an employee was indexed under, to remove it from the indexes."""
+
+    itskills: Tuple[str, ...]
+    trainings: Tuple[str, ...]
+    employers: Tuple[str, ...]
+    languages: Tuple[Tuple[str, Optional[str]], ...]
+    periods: Tuple[Tuple[int, int], ...]
+
+
+class Query(object):
+    """Query: a condition on the employees of a roster.
+
+    Queries are combined with '&' (and), '|' (or) and '~' (not).
+    """
+
+    __slots__ = ()
+
+    # Whether a few candidates are checked one by one, rather than looked up
+    _CHECKED = False
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        """Return the ids of the employees of a roster matching the query.
+
+        Args:
+            roster (Roster): the roster.
+
+        Returns:
+            AbstractSet[int]: the ids, possibly a set of the indexes: not to be modified.
+        """
+        raise NotImplementedError
+
+    def filter(
+        self, roster: "Roster", candidates: AbstractSet[int]
+    ) -> AbstractSet[int]:
+        """Return the ids of some employees of a roster matching the query.
+
+        Args:
+            roster (Roster): the roster.
+            candidates (AbstractSet[int]): the ids of the employees to check.
+
+        Returns:
+            AbstractSet[int]: the ids matching, not to be modified.
+        """
+        return candidates & self.ids(roster)
+
+    def __and__(self, other: "Query") -> "Query":
+        if not isinstance(other, Query):
+            return NotImplemented
+        # Flattened, so that an And sees all its operands at once
+        return And(*_operands(self, And), *_operands(other, And))
+
+    def __or__(self, other: "Query") -> "Query":
+        if not isinstance(other, Query):
+            return NotImplemented
+        return Or(*_operands(self, Or), *_operands(other, Or))
+
+    def __invert__(self) -> "Query":
+        return Not(self)
+
+
+class And(Query):
+    """And: the employees matching every query."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self, *queries: Query) -> None:
+        self.queries = queries
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        # Starting from the smallest set, so that the intersections only shrink it
+        found = sorted(
+            (
+                query.ids(roster)
+                for query in self.queries
+                if not query._CHECKED and not isinstance(query, Not)
+            ),
+            key=len,
+        )
+        checked = [query for query in self.queries if query._CHECKED]
+        excluded = [query.query for query in self.queries if isinstance(query, Not)]
+
+        if found:
+            matches = found[0].intersection(*found[1:])
+        elif checked:
+            matches = checked.pop(0).ids(roster)
+        else:
+            matches = set(roster.ids())
+        for query in checked:
+            matches = query.filter(roster, matches)
+        # Removing the employees of a negated query, rather than its complement
+        for query in excluded:
+            matches = matches - query.ids(roster)
+        return matches
+
+
+class Or(Query):
+    """Or: the employees matching any query."""
+
+    __slots__ = ("queries",)
+
+    def __init__(self, *queries: Query) -> None:
+        self.queries = queries
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        return set().union(*(query.ids(roster) for query in self.queries))
+
+
+class Not(Query):
+    """Not: the employees not matching a query."""
+
+    __slots__ = ("query",)
+
+    def __init__(self, query: Query) -> None:
+        self.query = query
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        return set(roster.ids()) - self.query.ids(roster)
+
+
+class HasSkill(Query):
+    """HasSkill: the employees with an IT skill."""
+
+    __slots__ = ("itskill",)
+
+    def __init__(self, itskill: str) -> None:
+        self.itskill = normalize(itskill)
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        return roster._itskills.get(self.itskill, _NOBODY)
+
+
+class HasTraining(Query):
+    """HasTraining: the employees with a training."""
+
+    __slots__ = ("training",)
+
+    def __init__(self, training: str) -> None:
+        self.training = normalize(training)
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        return roster._trainings.get(self.training, _NOBODY)
+
+
+class WorkedAt(Query):
+    """WorkedAt: the employees with a work experience at an employer."""
+
+    __slots__ = ("employer",)
+
+    def __init__(self, employer: str) -> None:
+        self.employer = normalize(employer)
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        return roster._employers.get(self.employer, _NOBODY)
+
+
+class Speaks(Query):
+    """Speaks: the employees speaking a language, at least at a CEFR level."""
+
+    __slots__ = ("language", "min_level")
+
+    def __init__(self, language: str, min_level: Optional[str] = None) -> None:
+        """Initialize the Speaks class instance.
+
+        Args:
+            language (str): the language name.
+            min_level (str, optional): the minimum CEFR level, e.g. "C1". Defaults to None (any level,
+                including none).
+
+        Raises:
+            AttributeError: if min_level is not a CEFR level.
+        """
+        if min_level is not None and min_level.upper() not in _CEFR_RANKS:
+            raise AttributeError(
+                f"CEFR Level '{min_level}' unknown.\nShould be part of list:\n{CEFR_LEVELS}"
+            )
+
+        self.language = normalize(language)
+        self.min_level = None if min_level is None else min_level.upper()
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        levels = roster._languages.get(self.language, {})
+        if self.min_level is None:
+            return set().union(*levels.values())
+
+        min_rank = _CEFR_RANKS[self.min_level]
+        return set().union(
+            *(
+                employee_ids
+                for level, employee_ids in levels.items()
+                if level is not None and _CEFR_RANKS[level] >= min_rank
+            )
+        )
+
+
+class ProjectBetween(Query):
+    """ProjectBetween: the employees with a project overlapping a date range.
+
+    The projects without start date are not indexed, the ones without end date
+    are ongoing.
+    """
+
+    __slots__ = ("start", "end")
+
+    _CHECKED = True
+
+    def __init__(self, start: Optional[int] = None, end: Optional[int] = None) -> None:
+        """Initialize the ProjectBetween class instance.
+
+        Args:
+            start (int, optional): the first month of the range under YYYYMM format. Defaults to None (no limit).
+            end (int, optional): the last month of the range under YYYYMM format. Defaults to None (no limit).
+
+        Raises:
+            ValueError: if start is after end.
+        """
+        if start is not None and end is not None and start > end:
+            raise ValueError(f"'start' {start} should not be after 'end' {end}.")
+
+        self.start = start
+        self.end = end
+
+    def ids(self, roster: "Roster") -> AbstractSet[int]:
+        # Employees on projects by the end of the range, and from its start
+        if self.start is None and self.end is None:
+            return roster._periods.keys()
+        if self.start is None:
+            return set(roster._first_starts.until(self.end))
+        if self.end is None:
+            return set(roster._last_ends.since(self.start))
+
+        # Both hold for the employees on projects all along, the others are checked
+        matches = set(roster._first_starts.until(self.end))
+        matches.intersection_update(roster._last_ends.since(self.start))
+        periods = roster._periods
+        for employee_id in matches & roster._gapped:
+            if not _overlaps(periods[employee_id], self.start, self.end):
+                matches.discard(employee_id)
+        return matches
+
+    def filter(
+        self, roster: "Roster", candidates: AbstractSet[int]
+    ) -> AbstractSet[int]:
+        # Checking a few candidates beats building the whole result
+        if 8 * len(candidates) > len(roster):
+            return candidates & self.ids(roster)
+
+        low = -1 if self.start is None else self.start
+        high = ONGOING if self.end is None else self.end
+        periods = roster._periods
+        return {
+            employee_id
+            for employee_id in candidates
+            if employee_id in periods and _overlaps(periods[employee_id], low, high)
+        }
+
+
+class _SortedIds(object):
+    """_SortedIds: employee ids sorted by a date, to be sliced by bisection."""
+
+    __slots__ = ("keys", "ids")
+
+    def __init__(self) -> None:
+        # The (date, id) keys, and the ids in the same order
+        self.keys: List[Tuple[int, int]] = []
+        self.ids: List[int] = []
+
+    def add(self, date: int, employee_id: int) -> None:
+        index = bisect.bisect_left(self.keys, (date, employee_id))
+        self.keys.insert(index, (date, employee_id))
+        self.ids.insert(index, employee_id)
+
+    def remove(self, date: int, employee_id: int) -> None:
+        index = bisect.bisect_left(self.keys, (date, employee_id))
+        del self.keys[index]
+        del self.ids[index]
+
+    def until(self, date: int) -> List[int]:
+        """Return the ids up to a date, included."""
+        return self.ids[: bisect.bisect_left(self.keys, (date + 1,))]
+
+    def since(self, date: int) -> List[int]:
+        """Return the ids from a date, included."""
+        return self.ids[bisect.bisect_left(self.keys, (date,)) :]
+
+
+class Roster(object):
+    """Roster: employees indexed by IT skill, training, language, employer and project dates.
+
+    Each employee gets an id, its position of insertion, reported in the
+    results in that order.
+    """
+
+    def __init__(self, employees: Iterable[Employee] = ()) -> None:
+        """Initialize the Roster class instance.
+
+        Args:
+            employees (Iterable[Employee], optional): the employees to add. Defaults to ().
+        """
+        self._employees: Dict[int, Employee] = {}
+        self._entries: Dict[int, _Entry] = {}
+        self._ids: Dict[int, int] = {}
+        self._next_id = 0
+
+        self._itskills: Dict[str, Set[int]] = {}
+        self._trainings: Dict[str, Set[int]] = {}
+        self._employers: Dict[str, Set[int]] = {}
+        self._languages: Dict[str, Dict[Optional[str], Set[int]]] = {}
+        # Starts and ends of the periods on projects of each employee
+        self._periods: Dict[int, Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+        # Employees by start of their first period, and by end of their last one
+        self._first_starts = _SortedIds()
+        self._last_ends = _SortedIds()
+        # Employees with gaps between their periods
+        self._gapped: Set[int] = set()
+
+        for employee in employees:
+            self.add(employee)
+
+    def __len__(self) -> int:
+        return len(self._employees)
+
+    def __iter__(self) -> Iterator[Employee]:
+        return iter(self._employees.values())
+
+    def __contains__(self, employee: object) -> bool:
+        return id(employee) in self._ids
+
+    def ids(self) -> Iterable[int]:
+        """Return the ids of every employee.
+
+        Returns:
+            Iterable[int]: the ids.
+        """
+        return self._employees.keys()
+
+    def add(self, employee: Employee) -> "Roster":
+        """Add an employee, and index it.
+
+        Args:
+            employee (Employee): the Employee object to add.
+
+        Raises:
+            TypeError: if employee is not an Employee object.
+            ValueError: if employee is already in the roster.
+
+        Returns:
+            Roster: the class instance itself.
+        """
+        if not isinstance(employee, Employee):
+            raise TypeError("'employee' expect an Employee object.")
+        if id(employee) in self._ids:
+            raise ValueError("'employee' is already in the roster.")
+
+        employee_id = self._next_id
+        self._next_id += 1
+        self._employees[employee_id] = employee
+        self._ids[id(employee)] = employee_id
+        self.__index(employee_id, employee)
+        return self
+
+    def remove(self, employee: Employee) -> "Roster":
+        """Remove an employee, and its entries in the indexes.
+
+        Args:
+            employee (Employee): the Employee object to remove.
+
+        Raises:
+            ValueError: if employee is not in the roster.
+
+        Returns:
+            Roster: the class instance itself.
+        """
+        employee_id = self._ids.pop(id(employee), None)
+        if employee_id is None:
+            raise ValueError("'employee' is not in the roster.")
+
+        self.__unindex(employee_id)
+        del self._employees[employee_id]
+        return self
+
+    def update(self, employee: Employee) -> "Roster":
+        """Index an employee again, after it changed.
+
+        Args:
+            employee (Employee): the Employee object changed.
+
+        Raises:
+            ValueError: if employee is not in the roster.
+
+        Returns:
+            Roster: the class instance itself.
+        """
+        employee_id = self._ids.get(id(employee))
+        if employee_id is None:
+            raise ValueError("'employee' is not in the roster.")
+
+        self.__unindex(employee_id)
+        self.__index(employee_id, employee)
+        return self
+
+    def find(self, query: Query) -> List[Employee]:
+        """Return the employees matching a query.
+
+        Args:
+            query (Query): the query, e.g. HasSkill("Python") & Speaks("Dutch", "B2").
+
+        Raises:
+            TypeError: if query is not a Query object.
+
+        Returns:
+            List[Employee]: the employees, in order of insertion.
+        """
+        if not isinstance(query, Query):
+            raise TypeError("'query' expect a Query object.")
+
+        return [self._employees[employee_id] for employee_id in sorted(query.ids(self))]
+
+    def count(self, query: Query) -> int:
+        """Return the number of employees matching a query.
+
+        Args:
+            query (Query): the query.
+
+        Raises:
+            TypeError: if query is not a Query object.
+
+        Returns:
+            int: the number of employees.
+        """
+        if not isinstance(query, Query):
+            raise TypeError("'query' expect a Query object.")
+
+        return len(query.ids(self))
+
+    def __index(self, employee_id: int, employee: Employee) -> None:
+        """Add an employee to the indexes, remembering its entries.
+
+        Args:
+            employee_id (int): the id of the employee.
+            employee (Employee): the employee.
+        """
+        works = employee.works or []
+        entry = _Entry(
+            tuple({normalize(itskill) for itskill in employee.itskills or []}),
+            tuple({normalize(training) for training in employee.trainings or []}),
+            tuple({normalize(work.employer) for work in works}),
+            tuple(
+                {
+                    (normalize(language.name), language.cefr_level)
+                    for language in employee.languages or []
+                }
+            ),
+            merge_periods(
+                (project.start, ONGOING if project.end is None else project.end)
+                for work in works
+                for project in work.projects or []
+                if project.start is not None
+            ),
+        )
+        self._entries[employee_id] = entry
+
+        for index, keys in (
+            (self._itskills, entry.itskills),
+            (self._trainings, entry.trainings),
+            (self._employers, entry.employers),
+        ):
+            for key in keys:
+                index.setdefault(key, set()).add(employee_id)
+        for name, level in entry.languages:
+            self._languages.setdefault(name, {}).setdefault(level, set()).add(
+                employee_id
+            )
+        if entry.periods:
+            starts, ends = zip(*entry.periods)
+            self._periods[employee_id] = (starts, ends)
+            self._first_starts.add(starts[0], employee_id)
+            self._last_ends.add(ends[-1], employee_id)
+            if len(entry.periods) > 1:
+                self._gapped.add(employee_id)
+
+    def __unindex(self, employee_id: int) -> None:
+        """Remove an employee from the indexes, as it was indexed.
+
+        Args:
+            employee_id (int): the id of the employee.
+        """
+        entry = self._entries.pop(employee_id)
+
+        for index, keys in (
+            (self._itskills, entry.itskills),
+            (self._trainings, entry.trainings),
+            (self._employers, entry.employers),
+        ):
+            for key in keys:
+                _discard(index, key, employee_id)
+        for name, level in entry.languages:
+            levels = self._languages[name]
+            _discard(levels, level, employee_id)
+            if not levels:
+                del self._languages[name]
+        if entry.periods:
+            del self._periods[employee_id]
+            self._first_starts.remove(entry.periods[0][0], employee_id)
+            self._last_ends.remove(entry.periods[-1][1], employee_id)
+            self._gapped.discard(employee_id)
+
+
+def _operands(query: Query, operator: type) -> Tuple[Query, ...]:
+    """Return the operands of a query combined by an operator, the query itself otherwise.
+
+    Args:
+        query (Query): the query.
+        operator (type): And or Or.
+
+    Returns:
+        Tuple[Query, ...]: the operands.
+    """
+    return query.queries if type(query) is operator else (query,)
+
+
+def merge_periods(periods: Iterable[Tuple[int, int]]) -> Tuple[Tuple[int, int], ...]:
+    """Merge overlapping or consecutive periods.
+
+    Args:
+        periods (Iterable[Tuple[int, int]]): the start and end of each period, under YYYYMM format.
+
+    Returns:
+        Tuple[Tuple[int, int], ...]: the merged periods, in chronological order.
+    """
+    merged: List[List[int]] = []
+    for start, end in sorted(periods):
+        if merged and start <= _next_month(merged[-1][1]):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return tuple((start, end) for start, end in merged)
+
+
+def _overlaps(
+    periods: Tuple[Tuple[int, ...], Tuple[int, ...]], low: int, high: int
+) -> bool:
+    """Return whether any period overlaps a date range.
+
+    As the periods are sorted and disjoint, only the last one starting by the
+    end of the range may overlap it.
+
+    Args:
+        periods (Tuple[Tuple[int, ...], Tuple[int, ...]]): the starts and the ends of the periods.
+        low (int): the first month of the range under YYYYMM format.
+        high (int): the last month of the range under YYYYMM format.
+
+    Returns:
+        bool: True if a period overlaps the range, False otherwise.
+    """
+    starts, ends = periods
+    index = bisect.bisect_right(starts, high)
+    return index > 0 and ends[index - 1] >= low
+
+
+def _next_month(date: int) -> int:
+    """Return the month after a date under YYYYMM format.
+
+    Args:
+        date (int): the date, or ONGOING.
+
+    Returns:
+        int: the next month, or ONGOING.
+    """
+    if date >= ONGOING:
+        return ONGOING
+    year, month = divmod(date, 100)
+    return (year + 1) * 100 + 1 if month >= 12 else date + 1
+
+
+def _discard(index: dict, key: object, employee_id: int) -> None:
+    """Remove an employee from the set of a key, and the key once its set is empty.
+
+    Args:
+        index (dict): the index, mapping keys to sets of ids.
+        key (object): the key.
+        employee_id (int): the id of the employee.
+    """
+    employee_ids = index[key]
+    employee_ids.discard(employee_id)
+    if not employee_ids:
+        del index[key]
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+schema.py
+Author: Gilson, K.
+
+Validator of JSON resumes against the data model, reporting every violation
+at once instead of stopping at the first one like Employee.load_from_json.
+
+The process pool is only imported to validate files over several workers, and
+stays out of the import of the cv package.
+"""
+
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from .education import Education
+from .employee import Employee
+from .language import Language
+from .project import Project
+from . import validation
+from .validation import Rule
+from .work_experience import WorkExperience
+
+
+class Violation(NamedTuple):
+    """Violation: a field of a JSON resume not matching the data model.
+
+    Attributes:
+        path (str): the JSON path of the field, e.g. "$.works[1].start".
+        message (str): the description of the violation.
+    """
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}: {self.message}"
+
+
+# A checker appends the violations of a value, found at a given path, to a list
+Checker = Callable[[Any, str, List[Violation]], None]
+
+
+def _rule(rule: Rule) -> Checker:
+    """Return a checker running a validation rule of the cv classes.
+
+    Args:
+        rule (Rule): the rule.
+
+    Returns:
+        Checker: the checker, reporting the error message of the rule.
+    """
+
+    def check(value: Any, path: str, violations: List[Violation]) -> None:
+        try:
+            rule(value)
+        except (TypeError, AttributeError) as err:
+            violations.append(Violation(path, str(err)))
+
+    return check
+
+
+def _str_item(name: str) -> Checker:
+    """Return a checker of the str items of a list.
+
+    Args:
+        name (str): the name of the list.
+
+    Returns:
+        Checker: the checker.
+    """
+    message = f"'{name}' item expect a str."
+
+    def check(value: Any, path: str, violations: List[Violation]) -> None:
+        if not isinstance(value, str):
+            violations.append(Violation(path, message))
+
+    return check
+
+
+def _list_of(name: str, item_checker: Checker) -> Checker:
+    """Return a checker of a list and of each of its items.
+
+    Args:
+        name (str): the name of the list.
+        item_checker (Checker): the checker of the items.
+
+    Returns:
+        Checker: the checker.
+    """
+    message = f"'{name}' expect a list."
+
+    def check(value: Any, path: str, violations: List[Violation]) -> None:
+        if not isinstance(value, list):
+            violations.append(Violation(path, message))
+            return
+
+        for index, item in enumerate(value):
+            item_checker(item, f"{path}[{index}]", violations)
+
+    return check
+
+
+def _object_of(
+    name: str,
+    fields: Dict[str, Checker],
+    required: Tuple[str, ...] = (),
+    strict: bool = True,
+) -> Checker:
+    """Return a checker of a JSON object and of each of its fields.
+
+    As with Employee.load_from_json, a null field is the same as a missing one.
+
+    Args:
+        name (str): the name of the object.
+        fields (Dict[str, Checker]): the checkers of the known fields, by name.
+        required (Tuple[str, ...], optional): the names of the required fields. Defaults to ().
+        strict (bool, optional): whether unknown fields are violations or not. Defaults to True.
+
+    Returns:
+        Checker: the checker.
+    """
+    message = f"'{name}' expect an object."
+
+    def check(value: Any, path: str, violations: List[Violation]) -> None:
+        if not isinstance(value, dict):
+            violations.append(Violation(path, message))
+            return
+
+        for key, item in value.items():
+            if item is None:
+                continue
+
+            checker = fields.get(key)
+            if checker is not None:
+                checker(item, f"{path}.{key}", violations)
+            elif strict:
+                violations.append(Violation(f"{path}.{key}", f"'{key}' is unknown."))
+
+        for key in required:
+            if value.get(key) is None:
+                violations.append(Violation(f"{path}.{key}", f"'{key}' is required."))
+
+    return check
+
+
+def _rules_of(cls: type, lists: Tuple[str, ...] = ()) -> Dict[str, Checker]:
+    """Return the checkers of the attributes of a cv class, from its validation rules.
+
+    Args:
+        cls (type): the cv class.
+        lists (Tuple[str, ...], optional): the attributes holding a list of str. Defaults to ().
+
+    Returns:
+        Dict[str, Checker]: the checkers, by attribute.
+    """
+    checkers = {name: _rule(rule) for name, rule in cls._RULES.items()}
+    for name in lists:
+        checkers[name] = _list_of(name, _str_item(name))
+    return checkers
+
+
+# Compiled once, following the data model documented in the README.
+# Unknown fields are only violations where Employee.load_from_json rejects them.
+_LANGUAGE = _object_of("languages", _rules_of(Language), required=("name",))
+_PROJECT = _object_of(
+    "projects", _rules_of(Project, lists=("description", "activities"))
+)
+_WORK = _object_of(
+    "works",
+    {
+        **_rules_of(WorkExperience, lists=("description",)),
+        "projects": _list_of("projects", _PROJECT),
+    },
+    required=("employer", "start"),
+    strict=False,
+)
+_EDUCATION = _object_of(
+    "educations", _rules_of(Education), required=("school", "degree", "start")
+)
+_EMPLOYEE = _object_of(
+    "employee",
+    {
+        "lastname": _rule(validation.instance_of("lastname", str, "a str")),
+        "firstname": _rule(validation.instance_of("firstname", str, "a str")),
+        "position": _rule(validation.instance_of("position", str, "a str")),
+        "languages": _list_of("languages", _LANGUAGE),
+        "summary": _list_of("summary", _str_item("summary")),
+        "works": _list_of("works", _WORK),
+        "trainings": _list_of("trainings", _str_item("trainings")),
+        "itskills": _list_of("itskills", _str_item("itskills")),
+        "educations": _list_of("educations", _EDUCATION),
+    },
+    required=("lastname", "firstname", "position", "languages", "works", "educations"),
+    strict=False,
+)
+
+
+def validate_document(json_obj: Any) -> List[Violation]:
+    """Return every violation of the data model within a decoded JSON resume.
+
+    Args:
+        json_obj (Any): the decoded JSON resume.
+
+    Returns:
+        List[Violation]: the violations, in the order of the document. Empty if valid.
+    """
+    violations = []
+    _EMPLOYEE(json_obj, "$", violations)
+    return violations
+
+
+def validate_file(json_path: str, json_encoding: str = "utf-8") -> List[Violation]:
+    """Return every violation of the data model within a JSON resume file.
+
+    Args:
+        json_path (str): the JSON file path.
+        json_encoding (str, optional): the encoding of the file. Defaults to "utf-8".
+
+    Returns:
+        List[Violation]: the violations, including unreadable or invalid JSON. Empty if valid.
+    """
+    try:
+        with open(json_path, encoding=json_encoding) as json_file:
+            json_obj = json.load(json_file)
+    except (OSError, ValueError) as err:
+        return [Violation("$", f"Unable to read JSON: {err}")]
+
+    return validate_document(json_obj)
+
+
+def validate_files(
+    json_paths: Iterable[str],
+    json_encoding: str = "utf-8",
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, List[Violation]]]:
+    """Validate many JSON resume files across a pool of processes.
+
+    Args:
+        json_paths (Iterable[str]): the JSON file paths.
+        json_encoding (str, optional): the encoding of the files. Defaults to "utf-8".
+        workers (int, optional): the number of worker processes. Defaults to None (one per CPU).
+
+    Raises:
+        ValueError: if workers is lower than 1.
+
+    Yields:
+        Tuple[str, List[Violation]]: each file path and its violations, in the input order.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("'workers' should be at least 1.")
+
+    json_paths = list(json_paths)
+    encodings = [json_encoding] * len(json_paths)
+
+    if workers == 1:
+        yield from zip(json_paths, map(validate_file, json_paths, encodings))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(validate_file, json_paths, encodings, chunksize=16)
+        yield from zip(json_paths, results)
@@ -0,0 +1,602 @@
+# -*- coding: utf-8 -*-
+"""
+search.py
+Author: Gilson, K.
+
+Full-text search over the free text of the resumes: the summary, the
+description of the works, and the description and activities of the projects.
+
+Each employee is a document of the index, ranked by BM25. The positions of the
+words are kept, so that "quoted phrases" match words in sequence, and the
+paragraphs, so that each result comes with highlighted snippets. The index is
+saved to a JSON file; once loaded, an employee added again under the same key
+is only tokenized again if its text changed.
+
+Example:
+    index = SearchIndex.load("search.json") if os.path.isfile("search.json") else SearchIndex()
+    for key, employee in employees.items():
+        index.add(key, employee)
+    index.save("search.json")
+    for hit in index.search('"data migration" banking'):
+        print(hit.key, hit.score, hit.snippets[0].text)
+"""
+
+import base64
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import unicodedata
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .employee import Employee
+
+# Bump when the tokenizer or the file format changes
+INDEX_VERSION = 1
+
+# BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+_WORD = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"([^"]*)"|(\S+)')
+
+
+class Snippet(NamedTuple):
+    """Snippet: a paragraph matching a query, with its matches highlighted.
+
+    Attributes:
+        path (str): the JSON path of the paragraph, e.g. "$.works[1].projects[0].activities[2]".
+        text (str): the paragraph, shortened around the matches.
+    """
+
+    path: str
+    text: str
+
+
+class SearchHit(NamedTuple):
+    """SearchHit: an employee matching a query.
+
+    Attributes:
+        key (str): the key of the employee in the index.
+        score (float): the BM25 score, the higher the better.
+        snippets (List[Snippet]): the best matching paragraphs.
+    """
+
+    key: str
+    score: float
+    snippets: List[Snippet]
+
+
+class _Document(NamedTuple):
+    """_Document: an employee, as indexed."""
+
+    key: str
+    digest: str
+    length: int
+    # JSON path and text of each paragraph, and the position of its first word
+    paragraphs: List[Tuple[str, str]]
+    starts: List[int]
+
+
+def normalize_word(word: str) -> str:
+    """Return the term of a word, matched regardless of case and accents.
+
+    Args:
+        word (str): the word, e.g. "Équipe".
+
+    Returns:
+        str: the term, e.g. "equipe".
+    """
+    if word.isascii():
+        return word.lower()
+    decomposed = unicodedata.normalize("NFKD", word.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the terms of a text, in order.
+
+    Args:
+        text (str): the text.
+
+    Returns:
+        List[str]: the terms.
+    """
+    return [normalize_word(word) for word in _WORD.findall(text)]
+
+
+def vocabulary(text: str) -> Set[str]:
+    """Return the distinct terms of a text.
+
+    Args:
+        text (str): the text.
+
+    Returns:
+        Set[str]: the terms.
+    """
+    return {
+        word if word.isascii() else normalize_word(word)
+        for word in set(_WORD.findall(text.lower()))
+    }
+
+
+def parse_query(query: str) -> List[Tuple[str, ...]]:
+    """Return the parts of a query: its "quoted phrases" and its other words.
+
+    Args:
+        query (str): the query, e.g. 'kubernetes "data migration"'.
+
+    Returns:
+        List[Tuple[str, ...]]: the terms of each part, e.g. [("kubernetes",), ("data", "migration")].
+    """
+    parts = []
+    for phrase, words in _QUERY_PART.findall(query):
+        if phrase:
+            terms = tuple(tokenize(phrase))
+            if terms:
+                parts.append(terms)
+        else:
+            parts.extend((term,) for term in tokenize(words))
+    return list(dict.fromkeys(parts))
+
+
+def paragraphs_of(employee: Employee) -> Iterator[Tuple[str, str]]:
+    """Yield the searchable paragraphs of an employee.
+
+    Args:
+        employee (Employee): the employee.
+
+    Yields:
+        Tuple[str, str]: the JSON path and the text of each paragraph.
+    """
+    for index, text in enumerate(employee.summary or []):
+        yield f"$.summary[{index}]", text
+    for work_index, work in enumerate(employee.works or []):
+        work_path = f"$.works[{work_index}]"
+        for index, text in enumerate(work.description or []):
+            yield f"{work_path}.description[{index}]", text
+        for project_index, project in enumerate(work.projects or []):
+            project_path = f"{work_path}.projects[{project_index}]"
+            for index, text in enumerate(project.description or []):
+                yield f"{project_path}.description[{index}]", text
+            for index, text in enumerate(project.activities or []):
+                yield f"{project_path}.activities[{index}]", text
+
+
+class SearchIndex(object):
+    """SearchIndex: an inverted index of the free text of employees, ranked by BM25.
+
+    The employees are added under a key of the caller, e.g. their JSON file path,
+    reported in the results.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the SearchIndex class instance, empty."""
+        self._documents: Dict[int, _Document] = {}
+        self._ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._total_length = 0
+        # Positions of each term, by document id
+        self._postings: Dict[str, Dict[int, Sequence[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._ids
+
+    def add(self, key: str, employee: Employee) -> bool:
+        """Index an employee under a key, replacing the employee indexed under it, if any.
+
+        Args:
+            key (str): the key of the employee.
+            employee (Employee): the employee.
+
+        Raises:
+            TypeError: if key is not a str, or employee not an Employee object.
+
+        Returns:
+            bool: True if the employee was indexed, False if unchanged since indexed under that key.
+        """
+        if not isinstance(key, str):
+            raise TypeError("'key' expect a str.")
+        if not isinstance(employee, Employee):
+            raise TypeError("'employee' expect an Employee object.")
+
+        paragraphs = list(paragraphs_of(employee))
+        digest = hashlib.sha1(
+            json.dumps(paragraphs, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+        document_id = self._ids.get(key)
+        if document_id is not None:
+            if self._documents[document_id].digest == digest:
+                return False
+            self.remove(key)
+
+        document_id = self._next_id
+        self._next_id += 1
+
+        # A position is skipped between paragraphs, so that no phrase spans two
+        position = 0
+        starts = []
+        postings = self._postings
+        for _, text in paragraphs:
+            starts.append(position)
+            for term in tokenize(text):
+                postings.setdefault(term, {}).setdefault(document_id, []).append(
+                    position
+                )
+                position += 1
+            position += 1
+
+        self._documents[document_id] = _Document(
+            key, digest, position, paragraphs, starts
+        )
+        self._ids[key] = document_id
+        self._total_length += position
+        return True
+
+    def remove(self, key: str) -> None:
+        """Remove the employee indexed under a key.
+
+        Args:
+            key (str): the key of the employee.
+
+        Raises:
+            KeyError: if no employee is indexed under the key.
+        """
+        document_id = self._ids.pop(key)
+        document = self._documents.pop(document_id)
+        self._total_length -= document.length
+
+        for _, text in document.paragraphs:
+            for term in tokenize(text):
+                documents = self._postings.get(term)
+                if documents is not None and documents.pop(document_id, None):
+                    if not documents:
+                        del self._postings[term]
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = 10,
+        snippets: int = 1,
+        highlight: Tuple[str, str] = ("[", "]"),
+        width: int = 160,
+    ) -> List[SearchHit]:
+        """Return the employees matching a query, the most relevant first.
+
+        A word of the query matches any employee using it, a "quoted phrase"
+        the employees using its words in sequence. Matching more parts, and
+        rarer ones, ranks higher.
+
+        Args:
+            query (str): the query, e.g. 'kubernetes "data migration"'.
+            limit (int, optional): the maximum number of results. Defaults to 10, None for all.
+            snippets (int, optional): the number of snippets per result. Defaults to 1.
+            highlight (Tuple[str, str], optional): the marks around the matching words.
+                Defaults to ("[", "]").
+            width (int, optional): the maximum length of a snippet, in characters. Defaults to 160.
+
+        Returns:
+            List[SearchHit]: the results.
+        """
+        parts = parse_query(query)
+        if not parts or not self._documents:
+            return []
+
+        count = len(self._documents)
+        average_length = self._total_length / count
+        scores: Dict[int, float] = {}
+        # The length of each matching part, and its occurrences
+        found: List[Tuple[int, Dict[int, Sequence[int]]]] = []
+
+        for part in parts:
+            occurrences = self.__occurrences(part)
+            if not occurrences:
+                continue
+            found.append((len(part), occurrences))
+
+            idf = math.log(
+                1 + (count - len(occurrences) + 0.5) / (len(occurrences) + 0.5)
+            )
+            for document_id, positions in occurrences.items():
+                frequency = len(positions)
+                length = self._documents[document_id].length
+                scores[document_id] = scores.get(document_id, 0.0) + idf * (
+                    frequency
+                    * (K1 + 1)
+                    / (frequency + K1 * (1 - B + B * length / average_length))
+                )
+
+        def rank(item: Tuple[int, float]) -> Tuple[float, str]:
+            return -item[1], self._documents[item[0]].key
+
+        if limit is None:
+            ranked = sorted(scores.items(), key=rank)
+        else:
+            ranked = heapq.nsmallest(limit, scores.items(), key=rank)
+
+        return [
+            SearchHit(
+                self._documents[document_id].key,
+                score,
+                self.__snippets(
+                    self._documents[document_id],
+                    {
+                        # Every word of the phrases is highlighted
+                        position + offset
+                        for length, occurrences in found
+                        for position in occurrences.get(document_id, ())
+                        for offset in range(length)
+                    },
+                    snippets,
+                    highlight,
+                    width,
+                ),
+            )
+            for document_id, score in ranked
+        ]
+
+    def __occurrences(self, part: Tuple[str, ...]) -> Dict[int, Sequence[int]]:
+        """Return the positions of a word or phrase, by document id.
+
+        Args:
+            part (Tuple[str, ...]): the terms of the word or phrase.
+
+        Returns:
+            Dict[int, Sequence[int]]: the positions of the first term of each occurrence.
+        """
+        postings = [self._postings.get(term) for term in part]
+        if not all(postings):
+            return {}
+        if len(part) == 1:
+            return postings[0]
+
+        # Documents with every term, starting from the rarest
+        document_ids = set(min(postings, key=len))
+        for documents in postings:
+            document_ids.intersection_update(documents)
+
+        occurrences = {}
+        for document_id in document_ids:
+            positions = postings[0][document_id]
+            for offset, documents in enumerate(postings[1:], 1):
+                following = set(documents[document_id])
+                positions = [
+                    position for position in positions if position + offset in following
+                ]
+                if not positions:
+                    break
+            if positions:
+                occurrences[document_id] = positions
+        return occurrences
+
+    def __snippets(
+        self,
+        document: _Document,
+        positions: Set[int],
+        count: int,
+        highlight: Tuple[str, str],
+        width: int,
+    ) -> List[Snippet]:
+        """Return the paragraphs of a document with the most matches, highlighted.
+
+        Args:
+            document (_Document): the document.
+            positions (Set[int]): the positions of the matching words.
+            count (int): the number of snippets.
+            highlight (Tuple[str, str]): the marks around the matching words.
+            width (int): the maximum length of a snippet, in characters.
+
+        Returns:
+            List[Snippet]: the snippets, in the order of the document.
+        """
+        by_paragraph: Dict[int, List[int]] = {}
+        for position in positions:
+            paragraph = bisect.bisect_right(document.starts, position) - 1
+            by_paragraph.setdefault(paragraph, []).append(
+                position - document.starts[paragraph]
+            )
+
+        best = sorted(by_paragraph, key=lambda index: -len(by_paragraph[index]))
+        snippets = []
+        for paragraph in sorted(best[:count]):
+            path, text = document.paragraphs[paragraph]
+            words = set(by_paragraph[paragraph])
+            spans = [
+                match.span()
+                for index, match in enumerate(_WORD.finditer(text))
+                if index in words
+            ]
+            snippets.append(Snippet(path, _highlighted(text, spans, highlight, width)))
+        return snippets
+
+    def save(self, path: str) -> None:
+        """Save the index to a JSON file, replacing it at once.
+
+        The positions of the terms are saved packed, so that loading neither
+        tokenizes the paragraphs again nor parses millions of numbers.
+
+        Args:
+            path (str): the file path.
+        """
+        terms: Dict[int, List[str]] = {
+            document_id: [] for document_id in self._documents
+        }
+        positions: Dict[int, array] = {
+            document_id: array(_typecode(document.length))
+            for document_id, document in self._documents.items()
+        }
+        for term, documents in self._postings.items():
+            for document_id, term_positions in documents.items():
+                terms[document_id].append(term)
+                positions[document_id].append(len(term_positions))
+                positions[document_id].extend(term_positions)
+
+        data = {
+            "version": INDEX_VERSION,
+            "documents": [
+                {
+                    "key": document.key,
+                    "digest": document.digest,
+                    "length": document.length,
+                    "paragraphs": document.paragraphs,
+                    "starts": document.starts,
+                    "terms": terms[document_id],
+                    "positions": _pack(positions[document_id]),
+                }
+                for document_id, document in self._documents.items()
+            ],
+        }
+
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as index_file:
+                json.dump(data, index_file, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        """Load an index saved to a JSON file.
+
+        Args:
+            path (str): the file path.
+
+        Raises:
+            ValueError: if the file was saved by another version of the index.
+
+        Returns:
+            SearchIndex: the index.
+        """
+        with open(path, encoding="utf-8") as index_file:
+            data = json.load(index_file)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"'{path}' is not a search index of version {INDEX_VERSION}."
+            )
+
+        index = cls()
+        postings = index._postings
+        for document_id, document_data in enumerate(data["documents"]):
+            document = _Document(
+                document_data["key"],
+                document_data["digest"],
+                document_data["length"],
+                [tuple(paragraph) for paragraph in document_data["paragraphs"]],
+                document_data["starts"],
+            )
+            index._documents[document_id] = document
+            index._ids[document.key] = document_id
+            index._total_length += document.length
+
+            # The count of positions of each term, then its positions
+            positions = _unpack(document_data["positions"], _typecode(document.length))
+            offset = 0
+            for term in document_data["terms"]:
+                count = positions[offset]
+                postings.setdefault(term, {})[document_id] = positions[
+                    offset + 1 : offset + 1 + count
+                ]
+                offset += 1 + count
+        index._next_id = len(data["documents"])
+        return index
+
+
+def _typecode(length: int) -> str:
+    """Return the array type of the positions of a document: 16-bit if they fit, 32-bit else.
+
+    Args:
+        length (int): the length of the document.
+
+    Returns:
+        str: the array type code.
+    """
+    return "H" if length <= 0xFFFF else "I"
+
+
+def _pack(numbers: array) -> str:
+    """Return unsigned numbers packed as little-endian bytes, in base64.
+
+    Args:
+        numbers (array): the numbers.
+
+    Returns:
+        str: the base64 text.
+    """
+    if sys.byteorder == "big":
+        numbers = array(numbers.typecode, numbers)
+        numbers.byteswap()
+    return base64.b64encode(numbers.tobytes()).decode("ascii")
+
+
+def _unpack(text: str, typecode: str) -> array:
+    """Return unsigned numbers packed by _pack.
+
+    Args:
+        text (str): the base64 text.
+        typecode (str): the array type code of the numbers.
+
+    Returns:
+        array: the numbers.
+    """
+    numbers = array(typecode)
+    numbers.frombytes(base64.b64decode(text))
+    if sys.byteorder == "big":
+        numbers.byteswap()
+    return numbers
+
+
+def _highlighted(
+    text: str, spans: List[Tuple[int, int]], highlight: Tuple[str, str], width: int
+) -> str:
+    """Return a text with some spans highlighted, shortened around the first one.
+
+    Args:
+        text (str): the text.
+        spans (List[Tuple[int, int]]): the start and end of each span, in order.
+        highlight (Tuple[str, str]): the marks around each span.
+        width (int): the maximum length of the text, marks excluded, in characters.
+
+    Returns:
+        str: the text.
+    """
+    start, end = 0, len(text)
+    if end > width:
+        # A quarter of the width before the first match, unless near the end,
+        # cut between words
+        start = min(spans[0][0] - width // 4, end - width) if spans else 0
+        start = max(0, start)
+        if start > 0:
+            space = text.find(" ", start)
+            start = space + 1 if 0 <= space < spans[0][0] else start
+        end = min(len(text), start + width)
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            end = space if space > start else end
+
+    opening, closing = highlight
+    pieces = ["…" if start > 0 else ""]
+    cursor = start
+    for span_start, span_end in spans:
+        if span_start < start or span_end > end:
+            continue
+        pieces.extend(
+            (text[cursor:span_start], opening, text[span_start:span_end], closing)
+        )
+        cursor = span_end
+    pieces.append(text[cursor:end])
+    pieces.append("…" if end < len(text) else "")
+    return "".join(pieces)
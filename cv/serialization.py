@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+serialization.py
+Author: Gilson, K.
+
+Serializers of the cv classes into nested dictionaries, generated once per class
+from its known attributes instead of inspecting each value at every call.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+# A serializer returns the dictionary of the attributes of an instance
+Serializer = Callable[[Any], dict]
+
+# Generated serializers, by (class, keep_none, shared)
+SERIALIZERS: Dict[Tuple[type, bool, bool], Serializer] = {}
+
+
+def _field_source(name: str, kind: str, keep_none: bool, shared: bool) -> List[str]:
+    """Return the source serializing an attribute into 'dic'.
+
+    Args:
+        name (str): the name of the attribute.
+        kind (str): "children" for a list of JSONableMixin, "values" for a list
+            of plain values, "value" for anything else.
+        keep_none (bool): whether to keep None values in the dictionary or not.
+        shared (bool): whether to serialize the children into their cached dictionaries or not.
+
+    Returns:
+        List[str]: the lines of the source.
+    """
+    lines = [f"value = self.{name}"]
+
+    if kind == "value":
+        if keep_none:
+            lines.append(f"dic[{name!r}] = value")
+        else:
+            lines.extend(["if value is not None:", f"    dic[{name!r}] = value"])
+        return lines
+
+    if kind == "children":
+        items = f"[item._serialize({keep_none}, {shared}) for item in value]"
+    elif keep_none:
+        items = "list(value)"
+    else:
+        items = "[item for item in value if item is not None]"
+
+    if keep_none:
+        lines.extend(
+            [
+                "if value is None:",
+                f"    dic[{name!r}] = None",
+                "else:",
+                f"    dic[{name!r}] = {items}",
+            ]
+        )
+    else:
+        lines.extend(
+            [
+                "if value is not None:",
+                f"    value = {items}",
+                "    if value:",
+                f"        dic[{name!r}] = value",
+            ]
+        )
+    return lines
+
+
+def compile_serializer(cls: type, keep_none: bool, shared: bool) -> Serializer:
+    """Generate the serializer of a class, from the kind of each of its '__slots__'.
+
+    The attributes listed in the '_CHILDREN' of the class hold lists of
+    JSONableMixin, the ones listed in its '_LISTS' hold lists of plain values.
+    A shared serializer returns the cached dictionary of the instance if any, and
+    caches the one it builds otherwise; the other one always builds a new
+    dictionary, caching nothing. The output is the same as the one of a
+    reflective walk of the attributes.
+
+    Args:
+        cls (type): the class.
+        keep_none (bool): whether to keep None values in the dictionary or not.
+        shared (bool): whether to return the cached dictionary or a new one.
+
+    Returns:
+        Serializer: the serializer.
+    """
+    lines = ["def serialize(self):"]
+    if shared:
+        lines.extend(
+            [
+                "    cache = self._cache",
+                "    if cache is None:",
+                "        cache = {}",
+                "        set_attribute(self, '_cache', cache)",
+                f"    elif {keep_none} in cache:",
+                f"        return cache[{keep_none}]",
+            ]
+        )
+    lines.append("    dic = {}")
+    for name in cls.__slots__:
+        if name in cls._CHILDREN:
+            kind = "children"
+        elif name in cls._LISTS:
+            kind = "values"
+        else:
+            kind = "value"
+        lines.extend(
+            f"    {line}" for line in _field_source(name, kind, keep_none, shared)
+        )
+    if shared:
+        lines.append(f"    cache[{keep_none}] = dic")
+    lines.append("    return dic")
+
+    namespace = {"set_attribute": object.__setattr__}
+    source = "\n".join(lines)
+    exec(
+        compile(source, f"<{cls.__name__}.to_dict({keep_none}, {shared})>", "exec"),
+        namespace,
+    )
+    return namespace["serialize"]
+
+
+def get_serializer(cls: type, keep_none: bool, shared: bool) -> Serializer:
+    """Return the serializer of a class, generating it on first use.
+
+    Args:
+        cls (type): the class.
+        keep_none (bool): whether to keep None values in the dictionary or not.
+        shared (bool): whether to return the cached dictionary or a new one.
+
+    Returns:
+        Serializer: the serializer.
+    """
+    serializer = SERIALIZERS.get((cls, keep_none, shared))
+    if serializer is None:
+        serializer = compile_serializer(cls, keep_none, shared)
+        SERIALIZERS[(cls, keep_none, shared)] = serializer
+    return serializer
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+stream.py
+Author: Gilson, K.
+"""
+
+import json
+from typing import IO, Iterator, Tuple, Union
+
+from .employee import Employee
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_lines(
+    json_file: IO[str], decoder: json.JSONDecoder, report_errors: bool
+) -> Iterator[Union[dict, ValueError]]:
+    """Decode a JSON Lines file, one object per line.
+
+    Args:
+        json_file (IO[str]): the opened file.
+        decoder (json.JSONDecoder): the decoder to use.
+        report_errors (bool): whether to yield the error of an invalid line and go on
+            with the next one, or to raise it.
+
+    Raises:
+        ValueError: if a line is not valid JSON, unless report_errors.
+        ValueError: if the first object does not end on its line, e.g. a pretty-printed
+            JSON resume, unless report_errors.
+
+    Yields:
+        Union[dict, ValueError]: each decoded object, or the error of an invalid line.
+    """
+    first = True
+    for line_number, line in enumerate(json_file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            obj = decoder.decode(line)
+        except json.JSONDecodeError as err:
+            # An object still open at the end of the first line is not JSON Lines
+            if first and line.startswith("{") and _is_cut(line, err):
+                error = ValueError(
+                    "Expect a JSON array or JSON Lines, not an object over several lines."
+                )
+                if not report_errors:
+                    raise error from err
+                yield error
+                return
+
+            error = ValueError(f"Line {line_number}: {err}")
+            if not report_errors:
+                raise error from err
+            yield error
+        else:
+            yield obj
+        first = False
+
+
+def _is_cut(text: str, err: json.JSONDecodeError) -> bool:
+    """Return whether a decoding error may only be due to the end of the text.
+
+    Args:
+        text (str): the decoded text.
+        err (json.JSONDecodeError): the error.
+
+    Returns:
+        bool: True if more text could make it valid, False if it is invalid anyway.
+    """
+    if err.msg.startswith("Unterminated string"):
+        return True
+    # What follows the error is at most a token cut short, e.g. "tru" or "1."
+    return not any(char in ' \t\r\n,:[]{}"' for char in text[err.pos :])
+
+
+def _iter_array(
+    json_file: IO[str], decoder: json.JSONDecoder, chunk_size: int
+) -> Iterator[dict]:
+    """Decode a file holding a top-level JSON array, one item at a time.
+
+    Only the item being decoded is held in memory, never the whole array.
+
+    Args:
+        json_file (IO[str]): the opened file, positioned after the '[' character.
+        decoder (json.JSONDecoder): the decoder to use.
+        chunk_size (int): the number of characters to read at once.
+
+    Raises:
+        ValueError: if the array is not valid JSON, or is followed by anything but whitespace.
+
+    Yields:
+        dict: each decoded item.
+    """
+    buffer, pos = json_file.read(chunk_size), 0
+    eof = not buffer
+    count = 0
+    # An item is expected first and after each comma, a comma or the end after an item
+    expect_item = True
+
+    while True:
+        # Skip whitespace
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Unterminated JSON array.")
+            chunk = json_file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        char = buffer[pos]
+        if not expect_item:
+            if char == "]":
+                break
+            if char != ",":
+                raise ValueError(
+                    f"Expect ',' or ']' after item {count} of the JSON array."
+                )
+            pos += 1
+            expect_item = True
+            continue
+
+        if char == "]" and count == 0:
+            break
+        if char in ",]":
+            raise ValueError(
+                f"Expect item {count + 1} of the JSON array, not '{char}'."
+            )
+
+        try:
+            obj, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as err:
+            # Only read on if the item may be cut by the end of the buffer
+            if eof or not _is_cut(buffer, err):
+                raise
+            obj, end = None, len(buffer)
+
+        # A number at the end of the buffer may go on in the next chunk
+        if end == len(buffer) and not eof:
+            chunk = json_file.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        pos = end
+        count += 1
+        expect_item = False
+        yield obj
+
+        # Drop what has already been decoded
+        if pos >= chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+    # Nothing but whitespace after the array, as json.load
+    rest = buffer[pos + 1 :]
+    while True:
+        if rest.strip(" \t\r\n"):
+            raise ValueError("Extra data after the JSON array.")
+        rest = json_file.read(chunk_size)
+        if not rest:
+            return
+
+
+def iter_json_objects(
+    json_path: str,
+    json_encoding: str,
+    chunk_size: int = CHUNK_SIZE,
+    report_errors: bool = False,
+) -> Iterator[Tuple[int, Union[dict, ValueError]]]:
+    """Stream the JSON resumes of a roster file, purged from their None values.
+
+    The roster is either a JSON Lines file, with one resume per line, or a file
+    holding a top-level JSON array of resumes.
+
+    With report_errors, an invalid line of a JSON Lines file is yielded as its
+    error, and the next lines are still read. An invalid JSON array is yielded
+    as its error too, but ends the stream, as the items after it cannot be found.
+
+    Args:
+        json_path (str): the roster file path.
+        json_encoding (str): the encoding of the file.
+        chunk_size (int, optional): the number of characters to read at once. Defaults to CHUNK_SIZE.
+        report_errors (bool, optional): whether to yield the errors of invalid JSON, or to raise
+            them. Defaults to False.
+
+    Raises:
+        TypeError: if json_path is not a str.
+        TypeError: if json_encoding is not a str.
+        ValueError: if the roster is not valid JSON, unless report_errors.
+
+    Yields:
+        Tuple[int, Union[dict, ValueError]]: the position of the resume within the roster,
+            starting at 1, and the resume, or its error with report_errors.
+    """
+    if not isinstance(json_path, str):
+        raise TypeError("'json_path' expect a str.")
+    elif not isinstance(json_encoding, str):
+        raise TypeError("'json_encoding' expect a str.")
+
+    decoder = json.JSONDecoder(object_hook=Employee.remove_nulls)
+
+    with open(json_path, encoding=json_encoding) as json_file:
+        # Look for the first significant character to guess the format
+        char = json_file.read(1)
+        while char.isspace():
+            char = json_file.read(1)
+
+        if char != "[":
+            json_file.seek(0)
+            yield from enumerate(
+                _iter_lines(json_file, decoder, report_errors), start=1
+            )
+            return
+
+        index = 0
+        try:
+            for index, obj in enumerate(
+                _iter_array(json_file, decoder, chunk_size), start=1
+            ):
+                yield index, obj
+        except ValueError as err:
+            if not report_errors:
+                raise
+            yield index + 1, err
+
+
+def iter_employees(
+    json_path: str, json_encoding: str, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Employee]:
+    """Stream the Employee objects of a roster file, one at a time.
+
+    Args:
+        json_path (str): the roster file path, in JSON Lines or JSON array format.
+        json_encoding (str): the encoding of the file.
+        chunk_size (int, optional): the number of characters to read at once. Defaults to CHUNK_SIZE.
+
+    Yields:
+        Employee: each employee of the roster.
+    """
+    for _, json_obj in iter_json_objects(json_path, json_encoding, chunk_size):
+        yield Employee().load_from_dict(json_obj)
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+validation.py
+Author: Gilson, K.
+
+Validation rules of the attributes of the cv classes.
+
+A rule validates the value of an attribute and returns the value to store. Each
+rule also carries its own Python source, so that the rules of a class can be
+compiled into a single function, see 'compile_constructor'.
+"""
+
+import inspect
+from typing import Any, Callable, Dict, List
+
+# A rule validates the value of an attribute, and returns the value to store
+Rule = Callable[[Any], Any]
+
+IRL_SCALES = [
+    "No Proficiency",
+    "Elementary Proficiency",
+    "Limited Working Proficiency",
+    "Professional Working Proficiency",
+    "Full Professional Proficiency",
+    "Bilingual",
+    "Native",
+]
+
+CEFR_LEVELS = [
+    "A1",
+    "A2",
+    "B1",
+    "B2",
+    "C1",
+    "C2",
+]
+
+
+def _with_source(rule: Rule, source: List[str], namespace: Dict[str, Any]) -> Rule:
+    """Attach to a rule the source validating 'value' in place, and its namespace.
+
+    Args:
+        rule (Rule): the rule.
+        source (List[str]): the lines of the source, using the '{p}' prefix for the namespace names.
+        namespace (Dict[str, Any]): the objects used by the source, by name without prefix.
+
+    Returns:
+        Rule: the rule itself.
+    """
+    rule.source = source
+    rule.namespace = namespace
+    return rule
+
+
+def instance_of(name: str, value_type: type, type_label: str) -> Rule:
+    """Return a rule checking that a value is either None or of a given type.
+
+    Args:
+        name (str): the name of the attribute.
+        value_type (type): the expected type.
+        type_label (str): the label of the type within the error message, e.g. "a str".
+
+    Returns:
+        Rule: the rule.
+    """
+    message = f"'{name}' expect {type_label}."
+
+    def rule(value: Any) -> Any:
+        if value is not None and not isinstance(value, value_type):
+            raise TypeError(message)
+        return value
+
+    source = [
+        "if value is not None and not isinstance(value, {p}type):",
+        "    raise TypeError({p}message)",
+    ]
+    return _with_source(rule, source, {"type": value_type, "message": message})
+
+
+def date(name: str, digits: int, date_format: str) -> Rule:
+    """Return a rule checking that a value is either None or an int date.
+
+    Args:
+        name (str): the name of the attribute.
+        digits (int): the expected number of characters of the date.
+        date_format (str): the label of the format within the error message, e.g. "YYYYMM".
+
+    Returns:
+        Rule: the rule.
+    """
+    message = f"'{name}' expect an int."
+    lowest, highest = 10 ** (digits - 1), 10**digits - 1
+
+    def check_length(value: int) -> int:
+        # The length of the string only matters for unusual values, e.g. negative ones
+        if len(str(value)) != digits:
+            raise AttributeError(
+                f"{name} '{value}' has an incorrect lenght.\nShould be {digits} characters in the {date_format} format."
+            )
+        return value
+
+    def rule(value: Any) -> Any:
+        if value is None:
+            return value
+        elif not isinstance(value, int):
+            raise TypeError(message)
+        elif not lowest <= value <= highest:
+            check_length(value)
+        return value
+
+    source = [
+        "if value is not None:",
+        "    if not isinstance(value, int):",
+        "        raise TypeError({p}message)",
+        "    elif not {p}lowest <= value <= {p}highest:",
+        "        {p}check_length(value)",
+    ]
+    namespace = {
+        "message": message,
+        "lowest": lowest,
+        "highest": highest,
+        "check_length": check_length,
+    }
+    return _with_source(rule, source, namespace)
+
+
+def irl_scale(name: str) -> Rule:
+    """Return a rule checking and normalizing an IRL Scale level.
+
+    Args:
+        name (str): the name of the attribute.
+
+    Returns:
+        Rule: the rule.
+    """
+    check_type = instance_of(name, str, "a str")
+    known = frozenset(IRL_SCALES)
+
+    def rule(value: Any) -> Any:
+        if check_type(value) is None:
+            return value
+
+        value_title = value.title()
+        if value_title not in known:
+            raise AttributeError(
+                f"IRL Scale '{value}' unknown.\nShould be part of list:\n{IRL_SCALES}"
+            )
+        return value_title
+
+    return _with_source(rule, ["value = {p}rule(value)"], {"rule": rule})
+
+
+def cefr_level(name: str) -> Rule:
+    """Return a rule checking and normalizing a CEFR Level.
+
+    Args:
+        name (str): the name of the attribute.
+
+    Returns:
+        Rule: the rule.
+    """
+    check_type = instance_of(name, str, "a str")
+    known = frozenset(CEFR_LEVELS)
+
+    def rule(value: Any) -> Any:
+        if check_type(value) is None:
+            return value
+
+        value_upper = value.upper()
+        if value_upper not in known:
+            raise AttributeError(
+                f"CEFR Level '{value}' unknown.\nShould be part of list:\n{CEFR_LEVELS}"
+            )
+        return value_upper
+
+    return _with_source(rule, ["value = {p}rule(value)"], {"rule": rule})
+
+
+def validate(obj: Any, rules: Dict[str, Rule]) -> None:
+    """Validate all the attributes of an object at once, in the order of its '__slots__'.
+
+    Values normalized by a rule are stored back, without going through '__setattr__'.
+
+    Args:
+        obj (Any): the object to validate.
+        rules (Dict[str, Rule]): the rules of the class of the object, by attribute.
+
+    Raises:
+        TypeError: if an attribute has an incorrect type.
+        AttributeError: if an attribute has an incorrect value.
+    """
+    for name in obj.__slots__:
+        rule = rules.get(name)
+        if rule is not None:
+            value = getattr(obj, name)
+            checked = rule(value)
+            if checked is not value:
+                object.__setattr__(obj, name, checked)
+
+
+def compile_constructor(cls: type, rules: Dict[str, Rule]) -> Callable[[dict], Any]:
+    """Compile the rules of a class into a function creating validated instances.
+
+    The function takes the dict of the __init__ arguments, runs the rule of each
+    attribute inline, in the order of the '__slots__', and sets it without going
+    through '__setattr__'. Unknown or missing arguments are left to the
+    constructor, so that it raises its own error.
+
+    To set the attributes at the cost of plain assignments, the instance is
+    created from an unchecked twin of the class, sharing its memory layout, and
+    only gets its actual class once fully validated.
+
+    Args:
+        cls (type): the class, whose __init__ arguments are its '__slots__'.
+        rules (Dict[str, Rule]): the rules of the class, by attribute.
+
+    Returns:
+        Callable[[dict], Any]: the function.
+    """
+    parameters = inspect.signature(cls.__init__).parameters
+    defaults = {
+        name: parameter.default
+        for name, parameter in parameters.items()
+        if name != "self"
+    }
+
+    namespace = {
+        "cls": cls,
+        "names": frozenset(defaults),
+        "required": frozenset(
+            name
+            for name, default in defaults.items()
+            if default is inspect.Parameter.empty
+        ),
+        "unchecked": type(
+            f"Unchecked{cls.__name__}",
+            (cls,),
+            {"__slots__": (), "__setattr__": object.__setattr__},
+        ),
+    }
+    lines = [
+        "def constructor(fields):",
+        "    if not names >= fields.keys() >= required:",
+        "        return cls(**fields)",
+        "    get = fields.get",
+        "    instance = unchecked.__new__(unchecked)",
+    ]
+    for name in cls.__slots__:
+        prefix = f"{name}_"
+        namespace[f"{prefix}default"] = defaults[name]
+        lines.append(f"    value = get({name!r}, {prefix}default)")
+
+        rule = rules.get(name)
+        if rule is not None:
+            lines.extend(f"    {line}".format(p=prefix) for line in rule.source)
+            namespace.update(
+                {f"{prefix}{key}": value for key, value in rule.namespace.items()}
+            )
+
+        lines.append(f"    instance.{name} = value")
+    lines.extend(["    instance.__class__ = cls", "    return instance"])
+
+    exec(compile("\n".join(lines), f"<{cls.__name__}.from_fields>", "exec"), namespace)
+    return namespace["constructor"]
@@ -6,6 +6,7 @@ Author: Gilson, K.
 
 from typing import Any, List, Optional
 
+from . import ordering, validation
 from .mixin import JSONableMixin
 from .project import Project
 
@@ -22,6 +23,27 @@ class WorkExperience(JSONableMixin):
         projects (List[Project], optional): list of Project objects. Defaults to None.
     """
 
+    __slots__ = ("employer", "start", "end", "position", "description", "projects")
+
+    # Attributes holding a list of JSONableMixin children
+    _CHILDREN = ("projects",)
+
+    # Attributes holding a list of plain values
+    _LISTS = ("description",)
+
+    # Attributes holding a list of children kept in order, see 'keep_sorted'
+    _SORTED = ("projects",)
+
+    # Validation rules of the attributes
+    _RULES = {
+        "employer": validation.instance_of("employer", str, "a str"),
+        "start": validation.date("start", 6, "YYYYMM"),
+        "end": validation.date("end", 6, "YYYYMM"),
+        "position": validation.instance_of("position", str, "a str"),
+        "description": validation.instance_of("description", list, "a list"),
+        "projects": validation.instance_of("projects", list, "a list"),
+    }
+
     def __init__(
         self,
         employer: str,
@@ -61,20 +83,11 @@ class WorkExperience(JSONableMixin):
             AttributeError: if 'start' or 'end' have and incorrect length.
             TypeError: if 'description' or 'projects' are not a list.
         """
-        if value is not None:
-            if name in ["employer", "position"] and not isinstance(value, str):
-                raise TypeError(f"'{name}' expect a str.")
-            elif name in ["start", "end"]:
-                if not isinstance(value, int):
-                    raise TypeError(f"'{name}' expect an int.")
-                elif len(str(value)) != 6:
-                    raise AttributeError(
-                        f"{name} '{value}' has an incorrect lenght.\nShould be 6 characters in the YYYYMM format."
-                    )
-            elif name in ["description", "projects"] and not isinstance(value, list):
-                raise TypeError(f"'{name}' expect a list.")
-
-        self.__dict__[name] = value
+        rule = self._RULES.get(name)
+        if rule is not None:
+            value = rule(value)
+
+        super().__setattr__(name, value)
 
     # Description
     def add_description(self, new_description: str) -> "WorkExperience":
@@ -95,6 +108,7 @@ class WorkExperience(JSONableMixin):
         if self.description is None:
             self.description = []
         self.description.append(new_description)
+        self.touch()
         return self
 
     def remove_description(self, old_description: str) -> "WorkExperience":
@@ -113,6 +127,7 @@ class WorkExperience(JSONableMixin):
             raise TypeError("'old_description' expect a str.")
 
         self.description.remove(old_description)
+        self.touch()
         return self
 
     def reorder_description(self, order: list) -> "WorkExperience":
@@ -151,7 +166,13 @@ class WorkExperience(JSONableMixin):
 
         if self.projects is None:
             self.projects = []
-        self.projects.append(new_project)
+        order = self._kept_order("projects")
+        if order is None:
+            self.projects.append(new_project)
+        else:
+            ordering.insort(self.projects, new_project, order)
+        self._adopt(new_project)
+        self.touch()
         return self
 
     def remove_project(self, old_project: Project) -> "WorkExperience":
@@ -170,6 +191,7 @@ class WorkExperience(JSONableMixin):
             raise TypeError("'old_project' expect a Project object.")
 
         self.projects.remove(old_project)
+        self.touch()
         return self
 
     def reorder_project(self, order: list) -> "WorkExperience":
@@ -194,6 +216,8 @@ class WorkExperience(JSONableMixin):
     def sort_projects(self, sort_type: Optional[str] = "asc") -> "WorkExperience":
         """Sort the projects attribute by their start and end dates.
 
+        An unknown start date sorts as the earliest, an ongoing end date as the latest.
+
         Args:
             sort_type (str, optional): the order of sorting. Defaults to "asc".
 
@@ -206,12 +230,31 @@ class WorkExperience(JSONableMixin):
         if not isinstance(sort_type, str):
             raise TypeError("'sort_type' expect a str.")
 
-        if sort_type == "desc":
-            self.projects = sorted(
-                self.projects, key=lambda x: (x.start, x.end), reverse=True
-            )
-        else:
-            self.projects = sorted(
-                self.projects, key=lambda x: (x.start, x.end), reverse=False
-            )
+        self._sort("projects", sort_type)
+        return self
+
+    def keep_sorted(self, sort_type: Optional[str] = "desc") -> "WorkExperience":
+        """Sort the projects attribute, then keep it sorted as projects are added.
+
+        'add_project' then inserts each project in place, by bisection. Assigning
+        the projects directly, or sorting them in another order, stops keeping
+        them sorted until the next call. The projects whose dates change are only
+        ordered again by 'sort_projects'.
+
+        Args:
+            sort_type (str, optional): the order to keep, or None to stop keeping one. Defaults to "desc".
+
+        Raises:
+            TypeError: if sort_type is neither a str, nor None.
+
+        Returns:
+            WorkExperience: the class instance itself.
+        """
+        if sort_type is not None and not isinstance(sort_type, str):
+            raise TypeError("'sort_type' expect a str or None.")
+
+        object.__setattr__(self, "_order", None)
+        if sort_type is not None:
+            self.sort_projects(sort_type)
+            self._keep_order("projects", sort_type)
         return self
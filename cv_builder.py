@@ -2,29 +2,48 @@
 """
 cv_builder.py
 Author: Gilson, K
+
+The GUI and the headless commands only import what they use, so that tkinter,
+docxtpl and jinja2 stay out of the cold start of the other.
 """
 
 __version__ = "0.5.0"
 
-import tkinter as tk
-from tkinter import ttk
+import sys
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gui import App
 
-import gui
 
+def __getattr__(name: str) -> Any:
+    """Import 'App', moved to the gui package, on first access.
 
-class App(tk.Tk):
-    """App: inherit from 'tkinter.Tk'."""
+    Args:
+        name (str): the name.
 
-    def __init__(self, *args, **kwargs) -> None:
-        """Initialize the App class instance."""
-        super().__init__(*args, **kwargs)
+    Raises:
+        AttributeError: if name is not 'App'.
 
-        self.title("CV Builder")
-        self.style = ttk.Style(self)
+    Returns:
+        Any: the object.
+    """
+    if name == "App":
+        import gui
 
-        self.control_frame = gui.ControlFrame(self)
+        globals()[name] = gui.App
+        return gui.App
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    app = App()
+    # Headless commands, e.g. 'python -m cv_builder render'
+    if len(sys.argv) > 1:
+        from builder import cli
+
+        sys.exit(cli.main(sys.argv[1:]))
+
+    import gui
+
+    app = gui.App()
     app.mainloop()
@@ -4,6 +4,8 @@ __init__.py (gui)
 Author: Gilson, K
 """
 
+from .app import App
 from .control import ControlFrame
 from .load_files import LoadFilesFrame
 from .projects_list import ProjectsListFrame
+from .worker import BuildCancelled, BuildWorker
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+app.py
+Author: Gilson, K
+
+The PDF export, and the LibreOffice pool behind it, is only imported by the
+first export.
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import TYPE_CHECKING, Optional
+
+from builder import timing
+from .control import ControlFrame
+
+if TYPE_CHECKING:
+    from builder.pdf import OfficePool
+
+
+class App(tk.Tk):
+    """App: inherit from 'tkinter.Tk'."""
+
+    def __init__(self, *args, show_timings: bool = False, **kwargs) -> None:
+        """Initialize the App class instance.
+
+        Args:
+            show_timings (bool, optional): whether to display the duration of each
+                stage after every build or not. Defaults to False.
+        """
+        super().__init__(*args, **kwargs)
+
+        # Spans collected since the last build, None if not displayed
+        self.timings = timing.add_sink(timing.Collector()) if show_timings else None
+
+        # LibreOffice processes exporting the builds to PDF, started on first use
+        self.__office_pool: Optional["OfficePool"] = None
+        self.__office_lock = threading.Lock()
+
+        self.title("CV Builder")
+        self.style = ttk.Style(self)
+
+        self.control_frame = ControlFrame(self)
+
+    def office_pool(self) -> "OfficePool":
+        """Return the pool exporting the builds to PDF, starting it on first use.
+
+        Can be called from a worker thread.
+
+        Raises:
+            FileNotFoundError: if LibreOffice is not found.
+
+        Returns:
+            OfficePool: the pool.
+        """
+        with self.__office_lock:
+            if self.__office_pool is None:
+                from builder.pdf import OfficePool
+
+                self.__office_pool = OfficePool(size=1)
+            return self.__office_pool
+
+    def destroy(self) -> None:
+        """Stop the LibreOffice processes, if any, then destroy the window."""
+        with self.__office_lock:
+            if self.__office_pool is not None:
+                self.__office_pool.close()
+        super().destroy()
@@ -5,9 +5,10 @@ Author: Gilson, K
 """
 
 from tkinter import ttk
-from typing import Any
+from typing import Any, Callable
 
 from .load_files import LoadFilesFrame
+from .worker import BuildWorker
 
 
 class ControlFrame(ttk.Frame):
@@ -53,6 +54,20 @@ class ControlFrame(ttk.Frame):
         )
         self.build_pptx_button.grid(column=1, row=1, **padding)
 
+        # Build progress
+        self.progress_bar = ttk.Progressbar(self, mode="determinate")
+        self.progress_bar.grid(column=0, row=2, columnspan=3, sticky="we", **padding)
+
+        self.cancel_button = ttk.Button(
+            self, text="Cancel", command=self.__cancel_build
+        )
+        self.cancel_button.grid(column=3, row=2, **padding)
+
+        self.progress_label = ttk.Label(self, text="")
+        self.progress_label.grid(column=0, row=3, columnspan=4, sticky="w", **padding)
+
+        self.worker = None
+
         # Display default
         self.current_frame = 0
         self.__change_frame(self.current_frame)
@@ -62,6 +77,7 @@ class ControlFrame(ttk.Frame):
         self.next_button.state(["disabled"])
         self.build_docx_button.state(["disabled"])
         self.build_pptx_button.state(["disabled"])
+        self.cancel_button.state(["disabled"])
 
     def __change_frame(self, frame_pos: int) -> None:
         """Move between frames.
@@ -92,3 +108,84 @@ class ControlFrame(ttk.Frame):
         """Move to the previous frame."""
         self.current_frame -= 1
         self.__change_frame(self.current_frame)
+
+    def run_build(
+        self,
+        task: Callable[[Callable[[int, int, str], None]], Any],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        """Run a build on a worker thread, showing its progress.
+
+        The build buttons are disabled until the build is over, the Cancel button
+        is enabled meanwhile.
+
+        Args:
+            task (Callable): the build, called on the worker thread with a
+                'report(step, step_count, description)' callback.
+            on_done (Callable[[Any], None]): called with the result of the task.
+            on_error (Callable[[Exception], None]): called with the error raised by the task.
+        """
+        self.__build_buttons = [
+            button
+            for button in (self.build_docx_button, self.build_pptx_button)
+            if not button.instate(["disabled"])
+        ]
+        for button in self.__build_buttons:
+            button.state(["disabled"])
+        self.cancel_button.state(["!disabled"])
+
+        self.progress_bar["value"] = 0
+        self.progress_label["text"] = "Starting..."
+
+        def done(result: Any) -> None:
+            self.__end_build("Done.", 1)
+            on_done(result)
+
+        def error(err: Exception) -> None:
+            self.__end_build("Failed.", 0)
+            on_error(err)
+
+        self.worker = BuildWorker(
+            self,
+            task,
+            on_progress=self.__show_progress,
+            on_done=done,
+            on_error=error,
+            on_cancel=lambda: self.__end_build("Cancelled.", 0),
+        )
+        self.worker.start()
+
+    def __show_progress(self, step: int, step_count: int, description: str) -> None:
+        """Display the step the build is at.
+
+        Args:
+            step (int): the index of the step starting.
+            step_count (int): the number of steps.
+            description (str): the description of the step.
+        """
+        self.progress_bar["maximum"] = step_count
+        self.progress_bar["value"] = step
+        self.progress_label["text"] = f"{description}..."
+
+    def __end_build(self, message: str, fill: int) -> None:
+        """Restore the buttons once the build is over.
+
+        Args:
+            message (str): the message to display.
+            fill (int): 1 to fill the progress bar, 0 to empty it.
+        """
+        self.progress_bar["value"] = self.progress_bar["maximum"] * fill
+        self.progress_label["text"] = message
+
+        self.cancel_button.state(["disabled"])
+        for button in self.__build_buttons:
+            button.state(["!disabled"])
+        self.worker = None
+
+    def __cancel_build(self) -> None:
+        """Cancel the running build, at its next step."""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.state(["disabled"])
+            self.progress_label["text"] = "Cancelling..."
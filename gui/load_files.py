@@ -2,17 +2,20 @@
 """
 load_files.py
 Author: Gilson, K
+
+The cv package is imported when the first JSON file is picked, to keep it out
+of the start of the GUI.
 """
 
-from docxtpl import DocxTemplate
-import jinja2
 import textwrap
+import tkinter as tk
 from tkinter import filedialog
 from tkinter import ttk
 from tkinter.messagebox import showerror, showinfo
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
-import cv
+import builder
+from builder import locales, timing
 from .projects_list import ProjectsListFrame
 
 
@@ -83,8 +86,26 @@ class LoadFilesFrame(ttk.Frame):
         self.pptx_label = ttk.Label(self.file_loading_frame, text="No file loaded.")
         self.pptx_label.grid(column=1, row=2, sticky="nswe", **padding)
 
-        # TODO: Activate the button once the PPTX function will work
-        self.pptx_button.state(["disabled"])
+        # Select the language of the dates
+        self.locale_label = ttk.Label(self.file_loading_frame, text="Dates language")
+        self.locale_label.grid(column=0, row=3, sticky="w", **padding)
+        self.locale_combobox = ttk.Combobox(
+            self.file_loading_frame,
+            values=list(locales.LOCALES),
+            state="readonly",
+            width=5,
+        )
+        self.locale_combobox.set(locales.DEFAULT_LOCALE)
+        self.locale_combobox.grid(column=1, row=3, sticky="w", **padding)
+
+        # Export to PDF after the build
+        self.pdf_export = tk.BooleanVar(value=False)
+        self.pdf_checkbutton = ttk.Checkbutton(
+            self.file_loading_frame,
+            text="Also export to PDF (requires LibreOffice)",
+            variable=self.pdf_export,
+        )
+        self.pdf_checkbutton.grid(column=0, row=4, columnspan=2, sticky="w", **padding)
 
     def __reset_project_frames(self) -> None:
         """Reset the frames."""
@@ -107,9 +128,12 @@ class LoadFilesFrame(ttk.Frame):
             title="Open JSON resume", filetypes=file_types
         )
 
+        import cv
+
         try:
-            self.container.employee = cv.Employee()
-            self.container.employee.load_from_json(self.json_path, "utf-8")
+            self.container.employee = cv.Employee().keep_sorted("desc")
+            with timing.span("load"):
+                self.container.employee.load_from_json(self.json_path, "utf-8")
             self.json_label["text"] = self.json_path
             self.container.control_frame.next_button.state(["!disabled"])
             self.__reset_project_frames()
@@ -125,7 +149,7 @@ class LoadFilesFrame(ttk.Frame):
         )
 
         try:
-            self.docx_tpl = DocxTemplate(self.docx_path)
+            builder.template_cache.get(self.docx_path)
             self.docx_label["text"] = self.docx_path
             self.container.control_frame.build_docx_button.state(["!disabled"])
         except Exception as err:
@@ -140,7 +164,7 @@ class LoadFilesFrame(ttk.Frame):
         )
 
         try:
-            # self.pptx_tpl = DocxTemplate(self.pptx_path)
+            builder.pptx_template_cache.get(self.pptx_path)
             self.pptx_label["text"] = self.pptx_path
             self.container.control_frame.build_pptx_button.state(["!disabled"])
         except Exception as err:
@@ -171,127 +195,116 @@ class LoadFilesFrame(ttk.Frame):
 
         return save_path
 
-    @staticmethod
-    def __format_date(date_int: int) -> str:
-        """Format a date under the YYYYMM format to one with an explicit month.
+    def build_docx_template(self) -> None:
+        """Build the DOCX template, on a worker thread."""
+        # Get save path
+        save_path = self.__ask_save_path("docx")
+        if not save_path:
+            return
+
+        # Snapshot the context on the main thread, the worker only reads it
+        try:
+            context = builder.build_context(self.container.employee)
+        except Exception as err:
+            showerror(
+                title="Error", message=f"Unable to build the DOCX template:\n{err}"
+            )
+            return
+
+        docx_path = self.docx_path
+        locale = self.locale_combobox.get()
+
+        def render(report: Callable[[int, int, str], None]) -> str:
+            return builder.render_context(context, docx_path, save_path, report, locale)
+
+        # Export
+        self.container.control_frame.run_build(
+            self.__with_pdf_export(render),
+            on_done=lambda path: showinfo(
+                title="Generated resume",
+                message=f"Resume saved under\n{path}{self.__timings_report()}",
+            ),
+            on_error=lambda err: showerror(
+                title="Error",
+                message=f"Unable to build the DOCX template:\n{err}"
+                f"{self.__timings_report()}",
+            ),
+        )
+
+    def __with_pdf_export(
+        self, render: Callable[[Callable[[int, int, str], None]], str]
+    ) -> Callable[[Callable[[int, int, str], None]], str]:
+        """Return a build task, followed by an export to PDF if checked.
 
         Args:
-            date_int (int): the date under the YYYYMM format.
+            render (Callable): the build, returning the file path of the rendered resume.
 
         Returns:
-            str: the under the 'Month YYYY' format.
+            Callable: the task, returning the file path of the rendered resume or its PDF.
         """
-        months_dic = {
-            "01": "January",
-            "02": "February",
-            "03": "March",
-            "04": "April",
-            "05": "May",
-            "06": "June",
-            "07": "July",
-            "08": "August",
-            "09": "September",
-            "10": "October",
-            "11": "November",
-            "12": "December",
-        }
-        if date_int is None:
-            return "Ongoing"
-        else:
-            date_str = str(date_int)
-            year = date_str[0:4]
-            month = months_dic[date_str[-2:]]
-            return f"{month} {year}"
+        if not self.pdf_export.get():
+            return render
 
-    def build_docx_template(self) -> None:
-        """Build the DOCX template."""
-        # Get save path
-        save_path = self.__ask_save_path("docx")
+        app = self.container
 
-        # Sort by descending
-        self.container.employee.sort_works("desc")
-        self.container.employee.sort_projects("desc")
-        self.container.employee.sort_educations("desc")
+        def task(report: Callable[[int, int, str], None]) -> str:
+            step_count = len(builder.RENDER_STEPS) + 1
+            path = render(
+                lambda step, _, description: report(step, step_count, description)
+            )
+            report(step_count - 1, step_count, "Exporting to PDF")
+            return app.office_pool().convert(path)
 
-        # Load Jinja env
-        jinja_env = jinja2.Environment()
-        jinja_env.filters["format_date"] = self.__format_date
+        return task
 
-        # Set context
-        context = self.container.employee.to_dict(keep_none=False)
+    def __timings_report(self) -> str:
+        """Return the duration of each stage since the last build, if displayed.
 
-        # Export
-        try:
-            self.docx_tpl.render(context, jinja_env=jinja_env, autoescape=True)
-            self.docx_tpl.save(save_path)
+        Returns:
+            str: the breakdown to append to a message, empty if not displayed.
+        """
+        collector = self.container.timings
+        if collector is None:
+            return ""
 
-            # Confirmation message
-            showinfo(
-                title="Generated resume", message=f"Resume saved under\n{save_path}"
-            )
-        except Exception as err:
-            showerror(
-                title="Error", message=f"Unable to build the DOCX template:\n{err}"
-            )
+        totals = collector.totals()
+        collector.clear()
+        return "\n\n" + timing.format_breakdown(totals, separator="\n")
 
     def build_pptx_template(self) -> None:
-        """Build the PPTX template."""
-        # FIXME:
-        # * template_pptx_jinja not working: error
-        # * pptx_template not working: no error but just a copy of the template
-        # * pptx_templater not working: should convert string to json?
-
+        """Build the PPTX template, on a worker thread."""
         # Get save path
         save_path = self.__ask_save_path("pptx")
+        if not save_path:
+            return
 
-        # Sort by descending
-        self.container.employee.sort_works("desc")
-        self.container.employee.sort_projects("desc")
-        self.container.employee.sort_educations("desc")
-
-        # Load Jinja env
-        jinja_env = jinja2.Environment()
-
-        # Set context
-        # model = self.container.employee.to_dict(keep_none=False)
-        model = {"lastname": "Doe", "firstname": "John", "position": "Consultant"}
-
-        data = {"model": model}
-
-        j = {
-            "slides": [
-                {
-                    "layoutSlideNum": 0,
-                    "text": {
-                        "lastname": "Doe",
-                        "firstname": "John",
-                        "position": "Consultant",
-                    },
-                }
-            ]
-        }
-
-        # data = {
-        #     'slides': [
-        #         {
-        #             'layoutSlideNum': 0,
-        #             'text': model
-        #         }
-        #     ]
-        # }
+        # Snapshot the context on the main thread, the worker only reads it
+        try:
+            context = builder.build_context(self.container.employee)
+        except Exception as err:
+            showerror(
+                title="Error", message=f"Unable to build the PPTX template:\n{err}"
+            )
+            return
+
+        pptx_path = self.pptx_path
+        locale = self.locale_combobox.get()
+
+        def render(report: Callable[[int, int, str], None]) -> str:
+            return builder.render_slides(
+                [context], pptx_path, save_path, report, locale
+            )
 
         # Export
-        # try:
-        # rendering = PPTXRendering(self.pptx_path, data, save_path, jinja_env)
-        # message = rendering.process()
-        # showinfo(
-        #     title='Generated resume',
-        #     message=message
-        # )
-        # render.render_pptx(self.pptx_path, model, save_path)
-        # convert(self.pptx_path, j, save_path)
-        # except Exception as err:
-        #     showerror(
-        #         title='Error',
-        #         message=f'Unable to build PPTX template:\n{err}'
-        #     )
+        self.container.control_frame.run_build(
+            self.__with_pdf_export(render),
+            on_done=lambda path: showinfo(
+                title="Generated resume",
+                message=f"Resume saved under\n{path}{self.__timings_report()}",
+            ),
+            on_error=lambda err: showerror(
+                title="Error",
+                message=f"Unable to build the PPTX template:\n{err}"
+                f"{self.__timings_report()}",
+            ),
+        )
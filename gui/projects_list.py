@@ -54,9 +54,8 @@ class ProjectsListFrame(ttk.LabelFrame):
 
     def __update_confidential_status(self) -> None:
         """Update the confidential status of the projects for the given WorkExperience."""
-        # FIXME: Doesn't update if trying to build a second time
-        #        Probably due to the re-ordering
-        #        Need to use different indexes?
+        # The employee is kept sorted from its loading: builds never reorder
+        # the projects, so the indexes stay valid
         for project_index in self.check_vars:
             self.container.employee.works[self.work_index].projects[
                 project_index
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+worker.py
+Author: Gilson, K
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+
+class BuildCancelled(Exception):
+    """Raised in the worker thread when the build is cancelled."""
+
+
+class BuildWorker:
+    """BuildWorker: run a build on a background thread.
+
+    The task runs on its own thread, and must not touch any widget. It receives
+    a 'report(step, step_count, description)' callback to call between its
+    steps, which raises BuildCancelled once the build is cancelled.
+
+    The progress and the outcome are passed back through a queue, polled from
+    the Tk event loop: the callbacks are all called on the main thread.
+    """
+
+    # Delay between two polls of the queue, in ms
+    POLL_INTERVAL = 50
+
+    def __init__(
+        self,
+        widget: Any,
+        task: Callable[[Callable[[int, int, str], None]], Any],
+        on_progress: Callable[[int, int, str], None],
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None],
+        on_cancel: Callable[[], None],
+    ) -> None:
+        """Initialize the BuildWorker class instance.
+
+        Args:
+            widget (Any): the widget to schedule the polls on.
+            task (Callable): the build, called with the report callback.
+            on_progress (Callable[[int, int, str], None]): called with each reported step.
+            on_done (Callable[[Any], None]): called with the result of the task.
+            on_error (Callable[[Exception], None]): called with the error raised by the task.
+            on_cancel (Callable[[], None]): called once the task stopped after a cancel.
+        """
+        self.widget = widget
+        self.task = task
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+        self.__events = queue.Queue()
+        self.__cancelled = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """bool: whether the task is still running or not."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def start(self) -> None:
+        """Start the task and the polling of its events."""
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        self.widget.after(self.POLL_INTERVAL, self.__poll)
+
+    def cancel(self) -> None:
+        """Ask the task to stop at its next step."""
+        self.__cancelled.set()
+
+    def __report(self, step: int, step_count: int, description: str) -> None:
+        """Queue a step of the task, unless it is cancelled (worker thread).
+
+        Raises:
+            BuildCancelled: if the build is cancelled.
+        """
+        if self.__cancelled.is_set():
+            raise BuildCancelled()
+        self.__events.put(("progress", (step, step_count, description)))
+
+    def __run(self) -> None:
+        """Run the task and queue its outcome (worker thread)."""
+        try:
+            result = self.task(self.__report)
+        except BuildCancelled:
+            self.__events.put(("cancel", ()))
+        except Exception as err:
+            self.__events.put(("error", (err,)))
+        else:
+            self.__events.put(("done", (result,)))
+
+    def __poll(self) -> None:
+        """Dispatch the queued events to the callbacks (main thread)."""
+        callbacks = {
+            "progress": self.on_progress,
+            "done": self.on_done,
+            "error": self.on_error,
+            "cancel": self.on_cancel,
+        }
+
+        while True:
+            try:
+                kind, args = self.__events.get_nowait()
+            except queue.Empty:
+                break
+
+            callbacks[kind](*args)
+            if kind != "progress":
+                return
+
+        self.widget.after(self.POLL_INTERVAL, self.__poll)